@@ -1,8 +1,10 @@
-import pyautogui
 import time
-import subprocess
 import json
 import os
+import threading
+from collections import deque
+from .command_runner import CommandRunner
+from .metrics import metrics
 
 try:
     from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
@@ -11,6 +13,12 @@ try:
 except ImportError:
     HAS_PYCAW = False
 
+def gui():
+    # pyautogui is imported on first use (or by the startup warmup): it probes the
+    # display server and pulls in Pillow, which would otherwise delay the server's import
+    import pyautogui
+    return pyautogui
+
 class ActionConfigManager:
     def __init__(self, config_path=os.path.join(os.path.dirname(__file__), "actions_config.json")):
         self.config_path = config_path
@@ -55,10 +63,11 @@ class ActionConfigManager:
             self.save_config()
 
 class ActionExecutor:
-    def __init__(self):
-        self.last_action_time = 0
-        self.last_gesture = None
-        self.last_gesture_time = 0 # Time when ANY gesture was last seen
+    # Decides in the frame loop (cooldown/debounce/one-shot), executes on a worker thread
+    def __init__(self, queue_size=8):
+        # Trigger state per source, i.e. (stream, hand) tag: two hands or two cameras
+        # debounce independently. Each entry: last_action_time, last_gesture, last_gesture_time
+        self.triggers = {}
         self.cooldown = 0.2
         self.discrete_cooldown = 0.5 # Minimum time between discrete actions
         self.debounce_time = 0.5    # Time required without the gesture to reset the trigger
@@ -80,14 +89,31 @@ class ActionExecutor:
         
         # List of actions that should repeat while gesture is held
         self.continuous_actions = ["volume_up", "volume_down"]
-    def execute(self, action_name):
+
+        # Custom shell commands: pre-spawned worker processes with per-command limits and timeouts.
+        # Started by warmup() if any gesture maps to a command, otherwise on the first custom trigger.
+        self.command_runner = CommandRunner()
+
+        # Dispatch queue: the frame loop only enqueues intents; keypresses, screenshots,
+        # COM calls and command hand-off run here so they never stall video/recognition
+        self.queue_size = queue_size
+        self.pending = deque()
+        self.pending_cond = threading.Condition()
+        self.running = True
+        self.worker = threading.Thread(target=self._worker, daemon=True, name="action-worker")
+        self.worker.start()
+
+    def execute(self, action_name, captured_at=None, source=None):
+        # captured_at: perf_counter capture time of the triggering frame (gesture-to-action latency)
+        # source: (stream, hand) tag of the hand that made the gesture
         current_time = time.time()
+        trigger = self.triggers.setdefault(source, {"last_action_time": 0, "last_gesture": None, "last_gesture_time": 0})
         
         # Debounce Logic: 
         # If we haven't seen any gesture for debounce_time, reset the last_gesture state
         # This allows the next detection to trigger a 'One-Shot' action again.
-        if current_time - self.last_gesture_time > self.debounce_time:
-            self.last_gesture = None
+        if current_time - trigger["last_gesture_time"] > self.debounce_time:
+            trigger["last_gesture"] = None
 
         if action_name is None:
             return False
@@ -97,40 +123,93 @@ class ActionExecutor:
             return False
 
         # Update the time we last saw a valid gesture
-        self.last_gesture_time = current_time
+        trigger["last_gesture_time"] = current_time
 
         cmd = action_info['command']
         is_continuous = cmd in self.continuous_actions
         
         # Cooldown check
         needed_cooldown = self.cooldown if is_continuous else self.discrete_cooldown
-        if current_time - self.last_action_time < needed_cooldown:
+        if current_time - trigger["last_action_time"] < needed_cooldown:
             return False
             
         # One-shot check for discrete actions
-        if not is_continuous and action_name == self.last_gesture:
+        if not is_continuous and action_name == trigger["last_gesture"]:
             return False
 
-        print(f"Executing: {action_name} ({action_info['type']}) | Cmd: {cmd}")
+        if not self._enqueue(action_name, action_info, is_continuous, captured_at, source):
+            return False
+
+        trigger["last_action_time"] = current_time
+        trigger["last_gesture"] = action_name 
+        return True
+
+    def _enqueue(self, action_name, action_info, is_continuous, captured_at, source=None):
+        with self.pending_cond:
+            # Repeated continuous actions (volume_up...) piling up behind a slow one collapse into one
+            if is_continuous and any(item[1]['command'] == action_info['command'] for item in self.pending):
+                metrics.inc("actions_coalesced")
+                return True
+            if len(self.pending) >= self.queue_size:
+                metrics.inc("actions_dropped")
+                return False
+            self.pending.append((action_name, action_info, time.perf_counter(), captured_at, source))
+            metrics.set_gauge("action_queue_depth", len(self.pending))
+            self.pending_cond.notify()
+            return True
+
+    def _worker(self):
+        while True:
+            with self.pending_cond:
+                self.pending_cond.wait_for(lambda: self.pending or not self.running)
+                if not self.running:
+                    return
+                action_name, action_info, enqueued_at, captured_at, source = self.pending.popleft()
+                metrics.set_gauge("action_queue_depth", len(self.pending))
+
+            start = time.perf_counter()
+            metrics.observe("action_queue_wait", start - enqueued_at)
+            self._run(action_name, action_info, source, captured_at)
+            end = time.perf_counter()
+            metrics.observe(f"action:{action_info['command'] if action_info['type'] == 'predefined' else 'custom'}", end - start)
+            if captured_at is not None:
+                # Camera capture of the triggering frame -> action done
+                metrics.observe("gesture_to_action", end - captured_at)
+
+    def _run(self, action_name, action_info, source=None, captured_at=None):
+        cmd = action_info['command']
+        origin = f" | Stream {source[0]} / {source[1]}" if source else ""
+        print(f"Executing: {action_name} ({action_info['type']}) | Cmd: {cmd}{origin}")
         try:
             if action_info['type'] == 'predefined':
                 if cmd in self.predefined_map:
                     self.predefined_map[cmd]()
             elif action_info['type'] == 'custom':
-                subprocess.Popen(action_info['command'], shell=True)
-            
-            self.last_action_time = current_time
-            self.last_gesture = action_name 
-            return True
+                # Returns at once; the command's own latency/failures are tracked by the runner
+                if not self.command_runner.submit(cmd, action_name, captured_at):
+                    print(f"Skipped: {action_name} (still running or command queue full)")
         except Exception as e:
+            metrics.inc("action_errors")
             print(f"Error executing action: {e}")
-            return False
+
+    def stop(self):
+        with self.pending_cond:
+            self.running = False
+            self.pending_cond.notify_all()
+        self.command_runner.stop()
+
+    def warmup(self):
+        # Startup warmup, off the import path: the first gesture action then pays neither
+        # the pyautogui import nor the command workers' start-up
+        gui()
+        if any(info.get("type") == "custom" for info in self.config_manager.config.values()):
+            self.command_runner.start()
 
     def volume_up(self):
-        pyautogui.press("volumeup")
+        gui().press("volumeup")
 
     def volume_down(self):
-        pyautogui.press("volumedown")
+        gui().press("volumedown")
 
     def _set_mute(self, mute_state):
         if HAS_PYCAW:
@@ -158,7 +237,7 @@ class ActionExecutor:
                     pass
         
         # Fallback to toggle
-        pyautogui.press("volumemute")
+        gui().press("volumemute")
         return False
 
     def mute(self):
@@ -170,28 +249,28 @@ class ActionExecutor:
         self._set_mute(False)
 
     def next_track(self):
-        pyautogui.press("nexttrack")
+        gui().press("nexttrack")
 
     def previous_track(self):
-        pyautogui.press("prevtrack")
+        gui().press("prevtrack")
 
     def play_pause(self):
         # 'playpause' is the most robust key for Windows/Browser media control
-        pyautogui.press("playpause")
+        gui().press("playpause")
         
     def play(self):
         # Some systems need 'play' specifically
         try:
-            pyautogui.press("play")
+            gui().press("play")
         except:
-            pyautogui.press("playpause")
+            gui().press("playpause")
 
     def pause(self):
         # Some systems need 'pause' specifically
         try:
-            pyautogui.press("pause")
+            gui().press("pause")
         except:
-            pyautogui.press("playpause")
+            gui().press("playpause")
         
     def screenshot(self):
         try:
@@ -206,10 +285,10 @@ class ActionExecutor:
             filename = f"screenshot_{int(time.time())}.png"
             path = os.path.join(folder, filename)
             
-            pyautogui.screenshot(path)
+            gui().screenshot(path)
             print(f"Screenshot successfully saved to: {path}")
         except Exception as e:
             print(f"FATAL ERROR in screenshot action: {e}")
         
     def tab_switch(self):
-        pyautogui.hotkey('alt', 'tab')
+        gui().hotkey('alt', 'tab')
@@ -0,0 +1,87 @@
+"""Training-time augmentation of landmark features.
+
+Every augmentation maps a (N, 63) batch of normalized features to one extra
+(N, 63) view, vectorized over the batch. Random augmentations draw from a
+fixed table indexed by a hash of each sample's bytes, so a sample always gets
+the same view: the SampleStore can cache views once and extend the cache as
+samples arrive, and a rebuild produces exactly the same matrix.
+
+Scale augmentation is deliberately absent: normalize_landmarks() divides out
+the hand size, so scaled copies would be identical to the original.
+"""
+import numpy as np
+
+from .features import FEATURE_SIZE, MIRROR_SIGN, NUM_LANDMARKS
+
+TABLE_SIZE = 4096
+
+
+def sample_keys(X):
+    # Content hash per row (FNV-style over the float bits), stable across processes and rewrites
+    bits = np.ascontiguousarray(X, dtype=np.float32).view(np.uint32).astype(np.uint64)
+    weights = np.uint64(1099511628211) ** np.arange(FEATURE_SIZE, dtype=np.uint64)
+    return ((bits * weights).sum(axis=1) >> np.uint64(17)) % np.uint64(TABLE_SIZE)
+
+
+class Mirror:
+    # Left/right hand swap (flip X)
+    version = "mirror"
+
+    def apply(self, X):
+        return X * MIRROR_SIGN
+
+
+class Jitter:
+    # Gaussian landmark noise, sigma in normalized hand units
+    def __init__(self, sigma=0.01, seed=0):
+        self.sigma = sigma
+        self.version = f"jitter({sigma},{seed})"
+        self.table = np.random.default_rng(seed).normal(scale=sigma, size=(TABLE_SIZE, FEATURE_SIZE)).astype(np.float32)
+
+    def apply(self, X):
+        return X + self.table[sample_keys(X)]
+
+
+class Rotate:
+    # In-plane (X/Y) rotation about the wrist, up to +-max_degrees
+    def __init__(self, max_degrees=15.0, seed=1):
+        self.version = f"rotate({max_degrees},{seed})"
+        self.angles = np.radians(np.random.default_rng(seed).uniform(-max_degrees, max_degrees, TABLE_SIZE)).astype(np.float32)
+
+    def apply(self, X):
+        angles = self.angles[sample_keys(X)]
+        cos, sin = np.cos(angles)[:, None], np.sin(angles)[:, None]
+        pts = X.reshape(-1, NUM_LANDMARKS, 3)
+        out = pts.copy()
+        out[:, :, 0] = cos * pts[:, :, 0] - sin * pts[:, :, 1]
+        out[:, :, 1] = sin * pts[:, :, 0] + cos * pts[:, :, 1]
+        return out.reshape(-1, FEATURE_SIZE)
+
+
+class AugmentationPipeline:
+    """Original samples plus one view per augmentation (views are not chained)."""
+
+    def __init__(self, augmentations):
+        self.augmentations = list(augmentations)
+        self.views = len(self.augmentations)
+        # Cache key: changes whenever an augmentation or its parameters change
+        self.version = "+".join(a.version for a in self.augmentations) or "none"
+
+    def apply(self, X):
+        # (N, 63) -> (N, views, 63)
+        X = np.asarray(X, dtype=np.float32).reshape(-1, FEATURE_SIZE)
+        out = np.empty((len(X), self.views, FEATURE_SIZE), dtype=np.float32)
+        for v, augmentation in enumerate(self.augmentations):
+            out[:, v] = augmentation.apply(X)
+        return out
+
+    @staticmethod
+    def expand(X, views, labels):
+        """Training matrix from samples and their cached views: originals first,
+        then each view as a block; labels repeated to match."""
+        blocks = [X] + [views[:, v] for v in range(views.shape[1])]
+        return np.concatenate(blocks), np.tile(labels, len(blocks))
+
+
+# What the model is trained with. Bump AUGMENTATION_VERSION (trainer) when this changes.
+DEFAULT_AUGMENTATIONS = (Mirror(),)
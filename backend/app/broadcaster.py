@@ -0,0 +1,58 @@
+import asyncio
+import json
+import threading
+
+from .metrics import metrics
+
+
+class Broadcaster:
+    """Change-driven fan-out of JSON state messages to websocket clients.
+
+    publish() may be called from any thread (pipeline, trainer). A message is
+    only serialized when it differs from the previous one, and the resulting
+    text is shared by every client. Each client has a small bounded queue; if
+    a slow client falls behind, its oldest pending messages are dropped
+    instead of stalling the others. Nothing is sent while nothing changes.
+    """
+
+    def __init__(self, queue_size=4):
+        self.queue_size = queue_size
+        self.loop = None
+        self.clients = set()
+        self.last_message = None
+        self.last_text = None
+        self.lock = threading.Lock()
+
+    def bind(self, loop):
+        # Called from the app lifespan with the server's event loop
+        self.loop = loop
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.clients.add(queue)
+        # New clients start from the current state
+        if self.last_text is not None:
+            queue.put_nowait(self.last_text)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.clients.discard(queue)
+
+    def publish(self, message):
+        with self.lock:
+            if message == self.last_message:
+                return False
+            self.last_message = message
+            self.last_text = text = json.dumps(message)
+        metrics.inc("ws_messages")
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._fan_out, text)
+        return True
+
+    def _fan_out(self, text):
+        for queue in list(self.clients):
+            if queue.full():
+                # Drop the stale message; the newest state is what matters
+                queue.get_nowait()
+                metrics.inc("ws_dropped_messages")
+            queue.put_nowait(text)
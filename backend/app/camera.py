@@ -0,0 +1,236 @@
+import threading
+import time
+import cv2
+import numpy as np
+
+
+class FrameSource:
+    """Background capture thread writing into a small ring of preallocated frames.
+
+    Every captured frame gets a monotonically increasing frame id and a capture
+    timestamp (time.perf_counter). Consumers block on wait_for_frame() for the
+    next id instead of polling, and receive read-only views of the ring slots,
+    so no per-read copy happens. A view stays valid for (buffer_count - 1)
+    further captures; consumers that keep a frame longer must copy it.
+
+    Subclasses only implement open() / grab(target) / close(); grab should
+    decode into `target` when it can. Nothing is opened until start(), so
+    creating a source never touches the device.
+    """
+
+    # True for sources that replay precomputed hand landmarks instead of images
+    provides_landmarks = False
+
+    def __init__(self, buffer_count=4, loop=False):
+        self.buffer_count = buffer_count
+        self.loop = loop            # Restart file-backed sources when they run out
+        self.buffers = None
+        self.frame_ids = [0] * buffer_count
+        self.timestamps = [0.0] * buffer_count
+        self.landmarks = [None] * buffer_count
+        self.frame_id = 0   # Id of the newest published frame (0 = nothing captured yet)
+        self.grabbed = False
+        self.connected = False
+        self.exhausted = False  # Set by grab() at end of stream
+        self.retry_interval = 5.0
+        self.frame_cond = threading.Condition()
+        self.running = False
+        self.thread = None
+
+    # --- Subclass interface ---
+    def open(self):
+        return True
+
+    def grab(self, target):
+        # Returns (grabbed, frame); frame may be `target` itself when decoded in place
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def pace(self):
+        # Sleep between frames for sources that are not naturally rate limited
+        pass
+
+    def describe(self):
+        return type(self).__name__
+
+    # --- Capture thread ---
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.update, args=())
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _allocate(self, shape, dtype):
+        self.buffers = [np.empty(shape, dtype=dtype) for _ in range(self.buffer_count)]
+
+    def _publish(self, frame, timestamp, landmarks=None):
+        # Copy into the next slot (only used when the backend refused to decode in place)
+        slot = (self.frame_id + 1) % self.buffer_count
+        np.copyto(self.buffers[slot], frame)
+        self._commit(slot, timestamp, landmarks)
+
+    def _commit(self, slot, timestamp, landmarks=None):
+        with self.frame_cond:
+            self.frame_id += 1
+            self.frame_ids[slot] = self.frame_id
+            self.timestamps[slot] = timestamp
+            self.landmarks[slot] = landmarks
+            self.grabbed = True
+            self.frame_cond.notify_all()
+
+    def _reopen(self):
+        self.close()
+        self.exhausted = False
+        self.connected = self.open()
+        return self.connected
+
+    def update(self):
+        if not self._reopen():
+            print(f"{self.describe()}: not available, retrying in the background")
+        while self.running:
+            if not self.connected:
+                # Device missing (unplugged, headless box): retry slowly, wake up early on stop()
+                with self.frame_cond:
+                    self.frame_cond.wait_for(lambda: not self.running, timeout=self.retry_interval)
+                if self.running:
+                    self._reopen()
+                continue
+            if self.exhausted:
+                if self.loop:
+                    self._reopen()
+                else:
+                    time.sleep(0.1)
+                continue
+
+            self.pace()
+            # Decode straight into the slot after the newest frame; readers only ever
+            # look at published slots, so this one is free to overwrite.
+            slot = (self.frame_id + 1) % self.buffer_count
+            target = self.buffers[slot] if self.buffers is not None else None
+            grabbed, frame = self.grab(target)
+            timestamp = time.perf_counter()
+            if not grabbed or frame is None:
+                with self.frame_cond:
+                    self.grabbed = False
+                if not self.exhausted:
+                    time.sleep(0.01)
+                continue
+
+            if frame is target:
+                self._commit(slot, timestamp, self.current_landmarks())
+            elif target is not None and frame.shape == target.shape:
+                self._publish(frame, timestamp, self.current_landmarks())
+            else:
+                # First frame, or resolution changed underneath us (e.g. driver renegotiation)
+                self._allocate(frame.shape, frame.dtype)
+                self._publish(frame, timestamp, self.current_landmarks())
+
+    def current_landmarks(self):
+        # Landmarks that belong to the frame grab() just returned (replay sources only)
+        return None
+
+    def frames(self):
+        """Synchronous iteration for offline replay: yields (timestamp, frame, landmarks)
+        as fast as the consumer pulls, with timestamps in media time (seconds)."""
+        if not self._reopen():
+            raise IOError(f"{self.describe()}: cannot open")
+        try:
+            index = 0
+            while not self.exhausted:
+                grabbed, frame = self.grab(None)
+                if not grabbed or frame is None:
+                    if not self.exhausted:
+                        time.sleep(0.01)
+                    continue
+                yield self.media_time(index), frame, self.current_landmarks()
+                index += 1
+        finally:
+            self.close()
+
+    def media_time(self, index):
+        return index / 30.0
+
+    # --- Consumers ---
+    def _view(self, slot):
+        view = self.buffers[slot].view()
+        view.flags.writeable = False
+        return view
+
+    def wait_for_frame(self, last_frame_id, timeout=1.0):
+        # Blocks until a frame newer than last_frame_id is captured (or timeout)
+        with self.frame_cond:
+            if not self.frame_cond.wait_for(lambda: self.frame_id > last_frame_id or not self.running, timeout=timeout):
+                return None
+            if self.frame_id <= last_frame_id:
+                return None
+            slot = self.frame_id % self.buffer_count
+            return self.frame_id, self.timestamps[slot], self._view(slot)
+
+    def landmarks_for(self, frame_id):
+        # Replayed landmarks published with frame_id (None if recycled or not a replay source)
+        with self.frame_cond:
+            slot = frame_id % self.buffer_count
+            if self.frame_ids[slot] != frame_id:
+                return None
+            return self.landmarks[slot]
+
+    def is_current(self, frame_id):
+        # True while the ring slot holding frame_id has not been recycled
+        return self.frame_id - frame_id < self.buffer_count - 1
+
+    def stop(self):
+        self.running = False
+        with self.frame_cond:
+            self.frame_cond.notify_all()
+        # Let the capture thread finish its current read before releasing the device
+        if self.thread is not None and self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1.0)
+        self.close()
+
+
+class ThreadedCamera(FrameSource):
+    # Live webcam; opened lazily by start() so the app can boot without one
+    def __init__(self, src=0, width=320, height=240, fps=30, buffer_count=4):
+        super().__init__(buffer_count)
+        self.src = src
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.cap = None
+        self.started_at = 0.0 # perf_counter when the capture was opened (media time zero)
+
+    def describe(self):
+        return f"camera {self.src}"
+
+    def open(self):
+        self.started_at = time.perf_counter()
+        self.cap = cv2.VideoCapture(self.src)
+        if not self.cap.isOpened():
+            self.cap.release()
+            self.cap = None
+            return False
+        # Hardware Optimization: Set buffer size to 1 to ensure we always get the latest frame
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        # Capture at native low resolution to save USB bandwidth and CPU
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        return True
+
+    def grab(self, target):
+        if target is None:
+            return self.cap.read()
+        return self.cap.read(target)
+
+    def close(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def media_time(self, index):
+        # Seconds since the capture started, like trace timestamps
+        return time.perf_counter() - self.started_at
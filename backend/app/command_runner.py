@@ -0,0 +1,228 @@
+"""Custom shell-command actions on a pool of pre-spawned worker processes.
+
+Launching a shell from the server process means forking a large, threaded
+interpreter (camera, MediaPipe, sklearn) on every trigger, and Popen objects
+nobody waits on leave zombies behind. Instead a few small worker processes
+(python -m app.command_runner) are started once; each runs one command at a
+time with subprocess, waits for it (reaping it), enforces the timeout by
+killing the command's whole process group, and returns the exit code and the
+tail of its output over a JSON-lines pipe.
+
+CommandRunner.submit() never blocks the caller: a command runs on an idle
+worker, waits in a short queue, or is rejected when that command already has
+max_per_command runs in flight (rapid-fire gestures) or the queue is full.
+"""
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+
+from .metrics import metrics
+
+
+class _Worker:
+    def __init__(self, runner, index):
+        self.runner = runner
+        self.index = index
+        self.process = None
+        self.job = None  # (command, label, submitted_at, captured_at) while busy
+
+    def spawn(self):
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [backend_dir, env.get("PYTHONPATH")]))
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "app.command_runner"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=backend_dir, env=env,
+            text=True, bufsize=1
+        )
+        threading.Thread(target=self._read, args=(self.process,), daemon=True,
+                         name=f"command-worker-{self.index}").start()
+
+    def send(self, job):
+        self.job = job
+        try:
+            self.process.stdin.write(json.dumps({"command": job[0], "timeout": self.runner.timeout,
+                                                 "output_limit": self.runner.output_limit}) + "\n")
+        except OSError:
+            pass # Worker is gone; its reader thread fails the job and respawns it
+
+    def _read(self, process):
+        for line in process.stdout:
+            self.runner._finished(self, json.loads(line))
+        # EOF: the worker exited (killed, crashed or stopped)
+        process.wait()
+        self.runner._worker_exited(self, process)
+
+
+class CommandRunner:
+    def __init__(self, workers=2, timeout=10.0, max_per_command=1, queue_size=8, output_limit=2048):
+        self.size = workers
+        self.timeout = timeout                  # Seconds before a command is killed
+        self.max_per_command = max_per_command  # Concurrent runs (running + queued) of the same command
+        self.queue_size = queue_size
+        self.output_limit = output_limit        # Characters of output kept per run
+        self.lock = threading.Lock()
+        self.workers = []
+        self.queue = deque()
+        self.in_flight = {}  # command -> running + queued count
+        self.commands = {}   # command -> stats
+        self.running = False
+
+    def start(self):
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+            self.workers = [_Worker(self, i) for i in range(self.size)]
+            for worker in self.workers:
+                worker.spawn()
+
+    def stop(self):
+        with self.lock:
+            self.running = False
+            workers, self.workers = self.workers, []
+            self.queue.clear()
+            self.in_flight.clear()
+        for worker in workers:
+            try:
+                worker.process.stdin.close() # Worker exits after its current command...
+                worker.process.wait(timeout=2)    # ...which shutdown only waits for briefly
+            except (OSError, subprocess.TimeoutExpired):
+                worker.process.kill()
+
+    def submit(self, command, label=None, captured_at=None):
+        """Queues a shell command; returns False if it was rejected."""
+        self.start()
+        with self.lock:
+            stats = self._stats(command, label)
+            if self.in_flight.get(command, 0) >= self.max_per_command:
+                stats["rejected"] += 1
+                metrics.inc("command_rejected")
+                return False
+            job = (command, label, time.perf_counter(), captured_at)
+            idle = next((w for w in self.workers if w.job is None and w.process.poll() is None), None)
+            if idle is None:
+                if len(self.queue) >= self.queue_size:
+                    stats["rejected"] += 1
+                    metrics.inc("command_rejected")
+                    return False
+                self.queue.append(job)
+            else:
+                idle.send(job)
+            self.in_flight[command] = self.in_flight.get(command, 0) + 1
+            return True
+
+    def _stats(self, command, label):
+        stats = self.commands.get(command)
+        if stats is None:
+            stats = self.commands[command] = {
+                "label": label, "runs": 0, "failures": 0, "timeouts": 0, "rejected": 0,
+                "last_returncode": None, "last_output": "", "last_seconds": None, "max_seconds": 0.0,
+            }
+        return stats
+
+    def _finished(self, worker, result):
+        now = time.perf_counter()
+        with self.lock:
+            command, label, submitted_at, captured_at = worker.job
+            worker.job = None
+            self._complete(command, label, result)
+            latency = now - submitted_at
+            stats = self.commands[command]
+            stats["last_seconds"] = latency
+            stats["max_seconds"] = max(stats["max_seconds"], latency)
+            if self.queue and self.running:
+                worker.send(self.queue.popleft())
+        metrics.observe("custom_command", latency)
+        metrics.observe("command_queue_wait", latency - result.get("seconds", 0.0))
+        if captured_at is not None:
+            metrics.observe("gesture_to_command", now - captured_at)
+        if result.get("returncode") != 0:
+            print(f"Command failed ({result.get('error') or 'exit ' + str(result.get('returncode'))}): {command}")
+
+    def _complete(self, command, label, result):
+        stats = self._stats(command, label)
+        stats["runs"] += 1
+        stats["last_returncode"] = result.get("returncode")
+        stats["last_output"] = result.get("output", "")
+        if result.get("timed_out"):
+            stats["timeouts"] += 1
+            metrics.inc("command_timeouts")
+        if result.get("returncode") != 0:
+            stats["failures"] += 1
+            metrics.inc("command_failures")
+        remaining = self.in_flight.pop(command, 0) - 1
+        if remaining > 0:
+            self.in_flight[command] = remaining
+
+    def _worker_exited(self, worker, process):
+        with self.lock:
+            if worker.process is not process:
+                return
+            if worker.job is not None:
+                command, label, _, _ = worker.job
+                worker.job = None
+                self._complete(command, label, {"returncode": None, "error": "worker died"})
+            if not self.running:
+                return
+            print(f"Command worker {worker.index} exited, respawning")
+            metrics.inc("command_worker_restarts")
+            worker.spawn()
+            if self.queue:
+                worker.send(self.queue.popleft())
+
+    def stats(self):
+        with self.lock:
+            return {
+                "workers": len(self.workers),
+                "busy": sum(w.job is not None for w in self.workers),
+                "queued": len(self.queue),
+                "commands": {command: dict(stats) for command, stats in self.commands.items()},
+            }
+
+
+def run_command(command, timeout, output_limit):
+    # One command in its own process group, so a timeout also kills whatever the shell started
+    start = time.perf_counter()
+    posix = os.name != "nt"
+    process = subprocess.Popen(
+        command, shell=True, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        start_new_session=posix,
+        creationflags=0 if posix else subprocess.CREATE_NEW_PROCESS_GROUP
+    )
+    timed_out = False
+    try:
+        output, _ = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        if posix:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        else:
+            process.kill()
+        output, _ = process.communicate() # Reaps the shell
+    text = output.decode("utf-8", errors="replace")[-output_limit:] if output else ""
+    return {"returncode": process.returncode, "output": text, "timed_out": timed_out,
+            "seconds": time.perf_counter() - start}
+
+
+def worker_main():
+    for line in sys.stdin:
+        request = json.loads(line)
+        try:
+            result = run_command(request["command"], request["timeout"], request["output_limit"])
+        except Exception as e:
+            result = {"returncode": None, "output": "", "timed_out": False, "seconds": 0.0, "error": str(e)}
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    worker_main()
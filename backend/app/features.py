@@ -0,0 +1,68 @@
+import functools
+import itertools
+import math
+import operator
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+FEATURE_SIZE = NUM_LANDMARKS * 3
+
+# Multiplying a (63,) / (N, 63) feature array by this flips the X axis (index 0, 3, ..., 60)
+MIRROR_SIGN = np.tile(np.array([-1.0, 1.0, 1.0], dtype=np.float32), NUM_LANDMARKS)
+
+_XYZ = operator.attrgetter("x", "y", "z")
+
+
+def landmarks_to_array(hand_landmarks, out=None):
+    # MediaPipe NormalizedLandmarkList -> (21, 3) float32, read in one pass (no per-coordinate setitem)
+    values = np.fromiter(itertools.chain.from_iterable(map(_XYZ, hand_landmarks.landmark)),
+                         dtype=np.float32, count=FEATURE_SIZE).reshape(NUM_LANDMARKS, 3)
+    if out is None:
+        return values
+    out[...] = values
+    return out
+
+
+@functools.lru_cache(maxsize=16)
+def _aspect_scale(aspect):
+    # X and Z are in width units, Y in height units: (scale, scale**2) bring them to the same scale
+    scale = np.array((aspect, 1.0, aspect), dtype=np.float32)
+    squared = scale * scale
+    scale.flags.writeable = squared.flags.writeable = False
+    return scale, squared
+
+
+def normalize_landmarks(points, aspect=1.0):
+    """Wrist-relative, aspect-corrected, scale-invariant hand features.
+
+    points holds raw MediaPipe coordinates for one hand ((21, 3) or (63,)) or
+    a batch of hands ((N, 21, 3) or (N, 63)); aspect is frame width / height.
+    Returns a contiguous float32 (63,) array, or (N, 63) for a batch.
+    """
+    pts = np.asarray(points, dtype=np.float32)
+    scale, squared = _aspect_scale(float(aspect))
+    if pts.size == FEATURE_SIZE:
+        # One hand, the per-frame case. At 21 points numpy's per-call overhead is the cost, so
+        # the aspect scale and the division by the hand size are folded into one multiply
+        pts = pts.reshape(NUM_LANDMARKS, 3)
+        rel = pts - pts[0]
+        sq_dist = np.dot(rel * rel, squared)
+        max_dist = math.sqrt(sq_dist[sq_dist.argmax()])
+        rel *= scale / max_dist if max_dist > 0 else scale
+        return rel.reshape(FEATURE_SIZE)
+
+    pts = pts.reshape(-1, NUM_LANDMARKS, 3)
+    rel = pts - pts[:, :1]
+    rel *= scale
+
+    max_dist = np.sqrt(np.einsum('nij,nij->ni', rel, rel).max(axis=1))
+    max_dist[max_dist == 0] = 1.0
+    rel /= max_dist[:, None, None]
+
+    return rel.reshape(-1, FEATURE_SIZE)
+
+
+def mirror_landmarks(features):
+    # Left/right hand swap of one (63,) vector or a (N, 63) batch
+    return np.asarray(features, dtype=np.float32) * MIRROR_SIGN
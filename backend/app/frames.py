@@ -0,0 +1,68 @@
+"""Reusable image buffers for the per-frame path.
+
+Every OpenCV call on the hot path writes into a buffer owned by a
+FrameBuffers instance (the `dst=` output) instead of returning a freshly
+allocated array, and resizes to the size a frame already has are skipped.
+Buffers are keyed by stage name and reallocated only when the frame shape
+changes, so a steady stream allocates nothing per frame.
+
+An instance is not thread safe: give each consumer (gesture engine, JPEG
+rendition) its own.
+"""
+import cv2
+import numpy as np
+
+# MediaPipe hand skeleton (same pairs as mp.solutions.hands.HAND_CONNECTIONS)
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4), (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12), (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+
+class FrameBuffers:
+    def __init__(self):
+        self.buffers = {}  # stage name -> ndarray
+
+    def get(self, name, shape, dtype=np.uint8):
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = self.buffers[name] = np.empty(shape, dtype=dtype)
+        return buffer
+
+    def resize(self, frame, size, name="resized", interpolation=cv2.INTER_LINEAR):
+        # size is (width, height) like cv2.resize; a frame of that size is returned as is
+        h, w = frame.shape[:2]
+        if (w, h) == tuple(size):
+            return frame
+        dst = self.get(name, (size[1], size[0]) + frame.shape[2:], frame.dtype)
+        cv2.resize(frame, tuple(size), dst=dst, interpolation=interpolation)
+        return dst
+
+    def convert(self, frame, code, name="converted"):
+        # Same-shape colour conversions only (BGR <-> RGB)
+        dst = self.get(name, frame.shape, frame.dtype)
+        cv2.cvtColor(frame, code, dst=dst)
+        return dst
+
+    def canvas(self, frame, size, name="canvas"):
+        # Private, writable copy of frame at `size` to draw on (camera frames are read-only views)
+        h, w = frame.shape[:2]
+        dst = self.get(name, (size[1], size[0]) + frame.shape[2:], frame.dtype)
+        if (w, h) == tuple(size):
+            np.copyto(dst, frame)
+        else:
+            cv2.resize(frame, tuple(size), dst=dst)
+        return dst
+
+
+def draw_hands(frame, hands_points, thickness=2):
+    # Skeleton overlay for (21, 3) point arrays in normalized image coordinates; draws in place
+    h, w = frame.shape[:2]
+    for points in hands_points:
+        pixels = [(int(x * w), int(y * h)) for x, y, _ in points]
+        for a, b in HAND_CONNECTIONS:
+            cv2.line(frame, pixels[a], pixels[b], (224, 224, 224), thickness)
+        for p in pixels:
+            cv2.circle(frame, p, thickness + 1, (0, 0, 255), -1)
+    return frame
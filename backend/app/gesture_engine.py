@@ -1,61 +1,84 @@
-import mediapipe as mp
 import cv2
 import numpy as np
+from .features import landmarks_to_array, normalize_landmarks
+from .frames import FrameBuffers
+from .metrics import metrics
+
+# MediaPipe input size; ThreadedCamera already captures at this size, so no resize happens
+DETECT_SIZE = (320, 240)
 
 class GestureEngine:
-    def __init__(self):
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            model_complexity=0,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
-        self.mp_draw = mp.solutions.drawing_utils
+    def __init__(self, max_num_hands=1):
+        self.max_num_hands = max_num_hands
+        self.hands = None # MediaPipe graph, built on the first frame or by warmup()
+        self.buffers = FrameBuffers() # Resize / RGB buffers reused across frames
+        self.last_results = None # process_frame's results and their points, reused by hand_points()
+        self.last_points = []
 
-    def process_frame(self, frame):
+    def _ensure_hands(self):
+        if self.hands is None:
+            import mediapipe as mp # Slow import + graph setup: kept out of module import time
+            self.hands = mp.solutions.hands.Hands(
+                static_image_mode=False,
+                max_num_hands=self.max_num_hands,
+                model_complexity=0,
+                min_detection_confidence=0.7,
+                min_tracking_confidence=0.5
+            )
+        return self.hands
+
+    def warmup(self):
+        # Builds the graph and runs one blank frame through it (MediaPipe's first call is the slowest)
+        self.detect(np.zeros((DETECT_SIZE[1], DETECT_SIZE[0], 3), dtype=np.uint8))
+
+    def detect(self, frame):
+        """MediaPipe only, no drawing: (results, [(21, 3) points], [(63,) features])
+        with points in normalized image coordinates. Used by the hand workers."""
         h, w, _ = frame.shape
-        # Resize for faster processing
-        small_frame = cv2.resize(frame, (320, 240))
-        img_rgb = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(img_rgb)
-        
-        all_landmarks_normalized = []
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                # Get the wrist landmark as reference (usually index 0)
-                wrist = hand_landmarks.landmark[0]
-                
-                # First pass: Get pixel-consistent relative coordinates
-                temp_coords = []
-                max_dist = 0
-                for lm in hand_landmarks.landmark:
-                    dx = (lm.x - wrist.x) * (w / h)
-                    dy = (lm.y - wrist.y)
-                    dz = (lm.z - wrist.z) * (w / h)
-                    
-                    temp_coords.append((dx, dy, dz))
-                    dist = (dx**2 + dy**2 + dz**2)**0.5
-                    if dist > max_dist:
-                        max_dist = dist
-                
-                # Second pass: Scale Invariance
-                current_hand_landmarks = []
-                if max_dist > 0:
-                    for dx, dy, dz in temp_coords:
-                        current_hand_landmarks.extend([dx/max_dist, dy/max_dist, dz/max_dist])
-                else:
-                    for dx, dy, dz in temp_coords:
-                        current_hand_landmarks.extend([dx, dy, dz])
-                
-                all_landmarks_normalized.append(current_hand_landmarks)
-                
-                # Draw landmarks
-                self.mp_draw.draw_landmarks(
-                    frame, 
-                    hand_landmarks, 
-                    self.mp_hands.HAND_CONNECTIONS
-                )
-                
+        # Resize for faster processing (skipped when the camera already delivers DETECT_SIZE)
+        with metrics.timer("preprocess"):
+            small_frame = self.buffers.resize(frame, DETECT_SIZE, "small")
+            img_rgb = self.buffers.convert(small_frame, cv2.COLOR_BGR2RGB, "rgb")
+        with metrics.timer("hands_process"):
+            results = self._ensure_hands().process(img_rgb)
+
+        all_points, all_landmarks_normalized = [], []
+        for hand_landmarks in results.multi_hand_landmarks or []:
+            # Wrist-relative, aspect-corrected, scale-invariant float32 (63,) features
+            with metrics.timer("normalize"):
+                points = landmarks_to_array(hand_landmarks)
+                all_points.append(points)
+                all_landmarks_normalized.append(normalize_landmarks(points, w / h))
+        return results, all_points, all_landmarks_normalized
+
+    def process_frame(self, frame):
+        # The frame is returned unannotated: landmarks are drawn only when a viewer encodes it
+        results, self.last_points, all_landmarks_normalized = self.detect(frame)
+        self.last_results = results
         return frame, results, all_landmarks_normalized
+
+    def close(self):
+        if self.hands is not None:
+            self.hands.close()
+
+    @staticmethod
+    def hand_tags(results, count):
+        # MediaPipe handedness per hand, numbered on duplicates (a hint for HandTrackers.assign)
+        tags = []
+        handedness = getattr(results, "multi_handedness", None) or []
+        for i in range(count):
+            tag = handedness[i].classification[0].label if i < len(handedness) else str(i)
+            tags.append(tag if tag not in tags else f"{tag}{i}")
+        return tags
+
+    @staticmethod
+    def hand_scores(results, count):
+        # MediaPipe handedness confidence per hand (low on blurred / partly hidden hands)
+        handedness = getattr(results, "multi_handedness", None) or []
+        return [handedness[i].classification[0].score if i < len(handedness) else None for i in range(count)]
+
+    def hand_points(self, results, count):
+        # (21, 3) points per hand in normalized image coordinates, for the overlay and hand matching
+        if results is self.last_results:
+            return self.last_points[:count] # Already read by detect() for this frame
+        return [landmarks_to_array(hand) for hand in (results.multi_hand_landmarks or [])[:count]]
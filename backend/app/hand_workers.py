@@ -0,0 +1,302 @@
+"""MediaPipe hand tracking in a worker process, fed through shared memory.
+
+ProcessGestureEngine is a drop-in for GestureEngine in InferencePipeline.
+Each engine owns one worker process (python -m app.hand_workers) and a
+shared-memory ring of frame slots. Per frame the parent copies the image
+into a slot and sends a few bytes (seq, slot); the worker runs MediaPipe
+and returns only the hand landmarks (21x3 points + 63 normalized features
+per hand), handedness tags and scores. The frame itself is returned
+unannotated; the skeleton is drawn only when a viewer encodes it.
+
+Guarantees:
+- Ordering: one frame in flight per engine (per stream). process_frame()
+  returns the result for exactly the frame it was given, so results are in
+  capture order. MediaPipe's tracking state is per stream, so frames of one
+  stream are never spread across workers; streams scale across cores.
+- Latency: roundtrip = slot copy + two small messages + MediaPipe. The
+  overhead is reported as the "hand_worker_transport" stage (roundtrip minus
+  the worker's own time). A frame that takes longer than `timeout` counts as
+  "no hands"; its late result is discarded by seq, and a dead worker is
+  restarted on the next frame.
+- The pipeline thread waits on a socket while the worker computes, so the
+  GIL stays free for the event loop, JPEG encoding and sklearn.
+
+Run this module directly only as a worker (started by the engine).
+"""
+import os
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+
+from .metrics import metrics
+
+AUTHKEY_ENV = "AIGCS_WORKER_AUTHKEY"
+
+
+class HandResults:
+    # Stand-in for MediaPipe's results object on the parent side
+    def __init__(self, tags, points, scores=None):
+        self.tags = tags
+        self.points = points
+        self.scores = scores or [None] * len(tags)
+
+
+class ProcessGestureEngine:
+    def __init__(self, max_num_hands=1, slots=2, timeout=2.0, start_timeout=30.0, detector="mediapipe"):
+        self.max_num_hands = max_num_hands
+        self.slots = slots
+        self.timeout = timeout
+        self.start_timeout = start_timeout
+        self.detector = detector  # "mediapipe"; "null" / "busy:<ms>" for transport benchmarks
+        self.lock = threading.Lock()
+        self.process = None
+        self.conn = None
+        self.shm = None
+        self.frames = None
+        self.seq = 0
+        self.next_slot = 0
+        self.restarts = 0
+        self.retry_delay = 0.5      # Seconds before retrying a failed worker start; doubles per failure
+        self.max_retry_delay = 30.0
+        self.next_retry = 0.0       # perf_counter time of the next start attempt
+
+    # --- Worker lifecycle ---
+    def start(self):
+        authkey = os.urandom(16)
+        listener = Listener(("127.0.0.1", 0), authkey=authkey)
+        env = dict(os.environ, **{AUTHKEY_ENV: authkey.hex()})
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [backend_dir, env.get("PYTHONPATH")]))
+        host, port = listener.address
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "app.hand_workers", host, str(port), str(self.max_num_hands), self.detector],
+            cwd=backend_dir, env=env
+        )
+        # accept() has no timeout of its own: wait for it on a helper thread
+        accepted = []
+        acceptor = threading.Thread(target=lambda: accepted.append(listener.accept()), daemon=True)
+        acceptor.start()
+        acceptor.join(self.start_timeout)
+        listener.close()
+        if not accepted:
+            exit_note = self._exit_note()
+            self._kill()
+            raise RuntimeError(f"Hand worker did not start{exit_note}")
+        self.conn = accepted[0]
+        if not self.conn.poll(self.start_timeout) or self.conn.recv() != ("ready",):
+            exit_note = self._exit_note(wait=1.0)
+            self._kill()
+            raise RuntimeError(f"Hand worker failed to initialize{exit_note}")
+        self.shm = None
+        self.frames = None
+
+    def _ensure_buffers(self, frame):
+        shape = (self.slots,) + frame.shape
+        if self.frames is not None and self.frames.shape == shape:
+            return
+        self._release_shm()
+        self.shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+        self.frames = np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf)
+        self.conn.send(("open", self.shm.name, shape))
+
+    def _release_shm(self):
+        if self.shm is not None:
+            self.frames = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def _exit_note(self, wait=0.0):
+        # " (exit code N)" if the worker process has exited (waiting up to `wait` s for it), else ""
+        if self.process is None:
+            return ""
+        try:
+            code = self.process.wait(timeout=wait) if wait else self.process.poll()
+        except subprocess.TimeoutExpired:
+            code = None
+        return "" if code is None else f" (exit code {code})"
+
+    def _kill(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+        self._release_shm()
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                try:
+                    self.conn.send(("stop",))
+                    self.process.wait(timeout=2)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+            self._kill()
+
+    def warmup(self, size=(320, 240)):
+        # Starts the worker (which warms up MediaPipe before reporting ready) and sends one
+        # blank frame through, so shared memory is set up before the first camera frame
+        self.process_frame(np.zeros((size[1], size[0], 3), dtype=np.uint8))
+        if self.process is None:
+            raise RuntimeError("Hand worker did not start")
+
+    def _ensure_worker(self):
+        # (Re)starts a missing or dead worker; failed starts back off instead of retrying every frame
+        if self.process is not None and self.process.poll() is None:
+            return True
+        if time.perf_counter() < self.next_retry:
+            return False
+        if self.process is not None:
+            self.restarts += 1
+            metrics.inc("hand_worker_restarts")
+            print(f"Hand worker exited{self._exit_note()}, restarting")
+            self._kill()
+        try:
+            self.start()
+        except (RuntimeError, OSError, EOFError) as e:
+            # repr: exceptions like the EOFError of a worker dying mid-handshake carry no message
+            reason = f"{e!r}{self._exit_note(wait=1.0)}"
+            self._kill()
+            metrics.inc("hand_worker_start_failures")
+            print(f"Hand worker failed to start: {reason}, retrying in {self.retry_delay:.1f}s")
+            self.next_retry = time.perf_counter() + self.retry_delay
+            self.retry_delay = min(self.retry_delay * 2, self.max_retry_delay)
+            return False
+        self.retry_delay = 0.5
+        return True
+
+    # --- Per frame ---
+    def process_frame(self, frame):
+        with self.lock:
+            if not self._ensure_worker():
+                metrics.inc("hand_worker_unavailable")
+                return frame, HandResults([], []), []
+
+            start = time.perf_counter()
+            self.seq += 1
+            seq = self.seq
+            try:
+                self._ensure_buffers(frame)
+                slot = self.next_slot
+                self.next_slot = (slot + 1) % self.slots
+                np.copyto(self.frames[slot], frame)
+                self.conn.send(("frame", seq, slot))
+                reply = self._receive(seq, start + self.timeout)
+            except (OSError, EOFError):
+                reply = None
+                self._kill()
+            roundtrip = time.perf_counter() - start
+
+        if reply is None:
+            metrics.inc("hand_worker_timeouts")
+            return frame, HandResults([], []), []
+        _, _, points, features, tags, scores, busy = reply
+        metrics.observe("hands_process", busy)
+        metrics.observe("hand_worker_roundtrip", roundtrip)
+        metrics.observe("hand_worker_transport", max(roundtrip - busy, 0.0))
+        return frame, HandResults(tags, points, scores), features
+
+    def _receive(self, seq, deadline):
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not self.conn.poll(remaining):
+                return None
+            reply = self.conn.recv()
+            # Late answers to frames that already timed out are dropped
+            if reply[0] == "result" and reply[1] == seq:
+                return reply
+
+    @staticmethod
+    def hand_tags(results, count):
+        return results.tags[:count]
+
+    @staticmethod
+    def hand_scores(results, count):
+        return results.scores[:count]
+
+    @staticmethod
+    def hand_points(results, count):
+        return results.points[:count]
+
+
+class _BusyDetector:
+    # Stand-in for MediaPipe in benchmarks: burns `ms` of CPU holding the GIL, finds no hands
+    def __init__(self, ms):
+        self.seconds = ms / 1000.0
+
+    def detect(self, frame):
+        end = time.perf_counter() + self.seconds
+        while time.perf_counter() < end:
+            pass
+        return None, [], []
+
+    @staticmethod
+    def hand_tags(results, count):
+        return [str(i) for i in range(count)]
+
+    @staticmethod
+    def hand_scores(results, count):
+        return [None] * count
+
+
+def _make_detector(kind, max_num_hands):
+    if kind == "null":
+        return _BusyDetector(0)
+    if kind.startswith("busy:"):
+        return _BusyDetector(float(kind.split(":", 1)[1]))
+    from .gesture_engine import GestureEngine
+    engine = GestureEngine(max_num_hands=max_num_hands)
+    engine.warmup() # Before "ready": the parent's first frame must not wait for the graph
+    return engine
+
+
+def _attach(name):
+    shm = shared_memory.SharedMemory(name=name)
+    # The parent owns (and unlinks) the segment; don't let this process's tracker remove it
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+def worker_main(host, port, max_num_hands, kind):
+    conn = Client((host, port), authkey=bytes.fromhex(os.environ[AUTHKEY_ENV]))
+    detector = _make_detector(kind, max_num_hands)
+    conn.send(("ready",))
+    shm = frames = None
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message[0] == "stop":
+            break
+        if message[0] == "open":
+            if shm is not None:
+                frames = None
+                shm.close()
+            shm = _attach(message[1])
+            frames = np.ndarray(message[2], dtype=np.uint8, buffer=shm.buf)
+        elif message[0] == "frame":
+            _, seq, slot = message
+            start = time.perf_counter()
+            results, points, features = detector.detect(frames[slot])
+            tags = detector.hand_tags(results, len(features))
+            scores = detector.hand_scores(results, len(features))
+            conn.send(("result", seq, points, features, tags, scores, time.perf_counter() - start))
+    if shm is not None:
+        frames = None
+        shm.close()
+
+
+if __name__ == "__main__":
+    worker_main(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), sys.argv[4])
@@ -0,0 +1,119 @@
+import numpy as np
+
+
+class MLPForward:
+    """Lean forward pass for a fitted sklearn MLPClassifier.
+
+    predict_proba() in sklearn re-validates its input on every call, which
+    costs far more than the math for a 63-feature vector. This copies the
+    trained weights into float32 arrays once and evaluates small batches
+    (typically original + mirrored hand, shape (2, 63)) into preallocated
+    activation buffers. Output matches MLPClassifier.predict_proba, including
+    the two-column layout sklearn uses for single-output (binary) models.
+    """
+
+    def __init__(self, model, max_batch=2):
+        self.classes_ = model.classes_
+        self.coefs = [np.ascontiguousarray(w, dtype=np.float32) for w in model.coefs_]
+        self.intercepts = [np.ascontiguousarray(b, dtype=np.float32) for b in model.intercepts_]
+        self.activation = model.activation
+        self.out_activation = model.out_activation_
+        self.binary_output = model.n_outputs_ == 1
+        self._allocate(max_batch)
+
+    def _allocate(self, batch_size):
+        self.batch_size = batch_size
+        self.buffers = [np.empty((batch_size, w.shape[1]), dtype=np.float32) for w in self.coefs]
+        self.proba_buffer = np.empty((batch_size, 2), dtype=np.float32) if self.binary_output else None
+
+    @staticmethod
+    def _activate(name, x):
+        if name == 'relu':
+            np.maximum(x, 0, out=x)
+        elif name == 'tanh':
+            np.tanh(x, out=x)
+        elif name == 'logistic':
+            np.negative(x, out=x)
+            np.exp(x, out=x)
+            x += 1
+            np.reciprocal(x, out=x)
+        elif name == 'softmax':
+            x -= x.max(axis=1, keepdims=True)
+            np.exp(x, out=x)
+            x /= x.sum(axis=1, keepdims=True)
+        # 'identity' needs no work
+
+    def predict_proba(self, X):
+        """X: (n, 63) float32 with n <= max_batch. Returns a view into an internal
+        buffer that is overwritten by the next call; copy it to keep it."""
+        n = X.shape[0]
+        if n > self.batch_size:
+            self._allocate(n)
+
+        activations = X
+        last = len(self.coefs) - 1
+        for i, (w, b) in enumerate(zip(self.coefs, self.intercepts)):
+            out = self.buffers[i][:n]
+            np.dot(activations, w, out=out)
+            out += b
+            self._activate(self.out_activation if i == last else self.activation, out)
+            activations = out
+
+        if self.binary_output:
+            proba = self.proba_buffer[:n]
+            proba[:, 1] = activations[:, 0]
+            np.subtract(1, activations[:, 0], out=proba[:, 0])
+            return proba
+        return activations
+
+
+class LinearForward:
+    """Same contract as MLPForward for a fitted LogisticRegression (softmax or
+    binary logistic), in float32 without sklearn's input validation."""
+
+    def __init__(self, model, max_batch=2):
+        self.classes_ = model.classes_
+        self.coef = np.ascontiguousarray(model.coef_.T, dtype=np.float32)
+        self.intercept = np.ascontiguousarray(model.intercept_, dtype=np.float32)
+        self.binary_output = self.coef.shape[1] == 1
+        self._allocate(max_batch)
+
+    def _allocate(self, batch_size):
+        self.batch_size = batch_size
+        self.buffer = np.empty((batch_size, self.coef.shape[1]), dtype=np.float32)
+        self.proba_buffer = np.empty((batch_size, 2), dtype=np.float32)
+
+    def predict_proba(self, X):
+        n = X.shape[0]
+        if n > self.batch_size:
+            self._allocate(n)
+        out = self.buffer[:n]
+        np.dot(X, self.coef, out=out)
+        out += self.intercept
+        if self.binary_output:
+            MLPForward._activate('logistic', out)
+            proba = self.proba_buffer[:n]
+            proba[:, 1] = out[:, 0]
+            np.subtract(1, out[:, 0], out=proba[:, 0])
+            return proba
+        MLPForward._activate('softmax', out)
+        return out
+
+
+class EstimatorForward:
+    # Fallback for any other classifier (e.g. k-NN): plain sklearn predict_proba
+    def __init__(self, model, max_batch=2):
+        self.model = model
+        self.classes_ = model.classes_
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(X).astype(np.float32)
+
+
+def make_forward(model, max_batch=2):
+    """Fast predict_proba for whichever classifier type the trainer holds."""
+    if hasattr(model, "coefs_"):
+        return MLPForward(model, max_batch)
+    if hasattr(model, "coef_") and hasattr(model, "predict_proba"):
+        return LinearForward(model, max_batch)
+    return EstimatorForward(model, max_batch)
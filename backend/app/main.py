@@ -1,67 +1,43 @@
-from fastapi import FastAPI, WebSocket, BackgroundTasks, HTTPException
+import io
+import os
+import time
+# Reference point for cold-start measurements (uvicorn imports this module right after launch)
+LAUNCH_TIME = time.perf_counter()
+
+from fastapi import FastAPI, WebSocket, BackgroundTasks, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, PlainTextResponse, JSONResponse
 from pydantic import BaseModel
 import uvicorn
-import cv2
 import asyncio
+import numpy as np
+from contextlib import asynccontextmanager
 from typing import List, Optional
-from .gesture_engine import GestureEngine
 from .trainer import ModelTrainer
 from .actions import ActionExecutor
-
-app = FastAPI()
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-import threading
+from .pipeline import InferencePipeline
+from .hand_workers import ProcessGestureEngine
+from .sources import open_source
+from .scheduler import InferenceScheduler, render_prometheus as render_scheduler_metrics
+from .temporal import HandTrackers
+from .metrics import metrics
+from .features import FEATURE_SIZE, normalize_landmarks
+from .recording import filter_samples
+from .broadcaster import Broadcaster
+from .streaming import FramePublisher, StreamProfile, DEFAULT_PROFILE
+from .readiness import Readiness
 
 # --- Global State & Initialization ---
-class ThreadedCamera:
-    def __init__(self, src=0):
-        self.cap = cv2.VideoCapture(src)
-        # Hardware Optimization: Set buffer size to 1 to ensure we always get the latest frame
-        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        # Capture at native low resolution to save USB bandwidth and CPU
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 320)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 240)
-        self.cap.set(cv2.CAP_PROP_FPS, 30)
-        
-        self.grabbed, self.frame = self.cap.read()
-        self.read_lock = threading.Lock()
-        self.running = True
-        self.thread = threading.Thread(target=self.update, args=())
-        self.thread.daemon = True
-        self.thread.start()
-
-    def update(self):
-        while self.running:
-            grabbed, frame = self.cap.read()
-            with self.read_lock:
-                self.grabbed = grabbed
-                self.frame = frame
-
-    def read(self):
-        with self.read_lock:
-            return self.grabbed, self.frame.copy() if self.frame is not None else None
-
-    def stop(self):
-        self.running = False
-        self.cap.release()
-
-gesture_engine = GestureEngine()
-model_trainer = ModelTrainer()
+# Only cheap objects are built at import time: the model, MediaPipe and pyautogui are loaded
+# and warmed up by the lifespan on background threads (see /ready)
+readiness = Readiness(LAUNCH_TIME,
+                      import_budget=float(os.environ.get("AIGCS_IMPORT_BUDGET", "1.0")),
+                      ready_budget=float(os.environ.get("AIGCS_READY_BUDGET", "10.0")))
+model_trainer = ModelTrainer(load=False)
+model_load_seconds = None
 action_executor = ActionExecutor()
-camera = ThreadedCamera(0)
 
 class SystemState:
-    current_prediction: str = "Initializing..."
     is_recording: bool = False
     recording_label: str = ""
     recording_frames_left: int = 0
@@ -70,6 +46,125 @@ class SystemState:
 state = SystemState()
 connected_websockets: List[WebSocket] = []
 
+# Frame sources: comma-separated camera indexes ("0,1"), video files, image directories or
+# .trace recordings. Opened by the lifespan, so the server also boots without a camera.
+SOURCE_SPECS = [spec.strip() for spec in os.environ.get("AIGCS_SOURCE", "0").split(",") if spec.strip()]
+# Hands tracked per stream (2 for two-handed gestures / two users; 1 is cheaper for MediaPipe)
+MAX_HANDS = int(os.environ.get("AIGCS_MAX_HANDS", "1"))
+# Where MediaPipe runs: "process" (one worker process per stream, frames over shared memory,
+# keeps the GIL free for the server) or "thread" (in the pipeline thread, as before)
+HAND_WORKERS = os.environ.get("AIGCS_HAND_WORKERS", "process")
+
+def make_gesture_engine():
+    if HAND_WORKERS == "thread":
+        from .gesture_engine import GestureEngine
+        return GestureEngine(max_num_hands=MAX_HANDS)
+    return ProcessGestureEngine(max_num_hands=MAX_HANDS)
+
+# One background inference loop per stream (own source, MediaPipe instance, scheduler and
+# per-hand trackers), shared by all clients; the model and action executor are shared.
+# Stream 0 feeds gesture recording.
+pipelines = [
+    InferencePipeline(open_source(spec), make_gesture_engine(), model_trainer, action_executor,
+                      state, InferenceScheduler(), HandTrackers(model_trainer.classify_batch),
+                      stream_id=stream_id, records=stream_id == 0, launch_time=LAUNCH_TIME)
+    for stream_id, spec in enumerate(SOURCE_SPECS)
+]
+pipeline = pipelines[0]
+broadcaster = Broadcaster()
+frame_publisher = FramePublisher()
+
+def current_prediction():
+    # Confirmed gestures of every hand on every stream, e.g. "Fist" or "Fist + Palm"
+    if all(p.latest is None for p in pipelines):
+        return "Initializing..."
+    labels = [str(label) for p in pipelines for label in p.predictions.values() if label]
+    return " + ".join(labels) if labels else "None"
+
+def build_state_message():
+    training = model_trainer.get_training_status()
+    # Coarse progress so an estimate ticking every frame doesn't flood the sockets
+    training["progress"] = round(training["progress"], 2)
+    return {
+        "prediction": current_prediction(),
+        "is_recording": state.is_recording,
+        "recording_progress": 0 if state.recording_total_frames == 0 else 1 - (state.recording_frames_left / state.recording_total_frames),
+        "training": training
+    }
+
+def publish_state(*_):
+    broadcaster.publish(build_state_message())
+
+# Every processed frame and training status change is a potential state change
+for p in pipelines:
+    p.subscribe(publish_state)
+    p.subscribe(frame_publisher.publish) # Wakes that stream's /video_feed viewers
+model_trainer.status_listeners.append(publish_state)
+
+def load_model():
+    global model_load_seconds
+    start = time.perf_counter()
+    model_trainer.load_model() # Index build, plus a retrain if the saved model is outdated
+    model_load_seconds = time.perf_counter() - start
+    print(f"Model loaded in {model_load_seconds * 1000:.0f} ms")
+    publish_state()
+
+def warm_stream(p):
+    # MediaPipe's first (slowest) call on a blank frame; the running pipeline skips detection
+    # until then, so only one thread ever uses the engine
+    try:
+        p.gesture_engine.warmup()
+    finally:
+        # Even after a failed warmup: the engine then retries (with backoff) on live frames
+        p.engine_ready = True
+
+def require_model():
+    # Recording, ingest and training need the stored samples and index loaded first
+    if not model_trainer.loaded:
+        raise HTTPException(status_code=503, detail="Model is still loading, see /ready")
+
+readiness.add("model")
+readiness.add("actions")
+for p in pipelines:
+    if not p.camera.provides_landmarks: # .trace replays never run MediaPipe
+        readiness.add(f"hands:{p.stream_id}")
+readiness.imported()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    broadcaster.bind(asyncio.get_running_loop())
+    frame_publisher.bind(asyncio.get_running_loop())
+    publish_state()
+    # Cameras open on their own threads; everything slow warms up in the background
+    # while the server already accepts connections
+    for p in pipelines:
+        if not p.camera.provides_landmarks:
+            p.engine_ready = False
+        p.camera.start()
+        p.start()
+    readiness.start("model", load_model, model_trainer.warmup)
+    readiness.start("actions", action_executor.warmup)
+    for p in pipelines:
+        if not p.camera.provides_landmarks:
+            readiness.start(f"hands:{p.stream_id}", lambda p=p: warm_stream(p))
+    yield
+    for p in pipelines:
+        p.stop()
+    action_executor.stop()
+    for p in pipelines:
+        p.camera.stop()
+        p.gesture_engine.close()
+
+app = FastAPI(lifespan=lifespan)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
 # --- Pydantic Models ---
 class RecordRequest(BaseModel):
     label: str
@@ -80,92 +175,84 @@ class ActionUpdateRequest(BaseModel):
     action_type: str # 'predefined' or 'custom'
     command: str
 
-# --- Video Processing Loop ---
-async def generate_frames():
-    frame_count = 0
-    last_results = None
-    last_hand_landmarks = None
-    
-    while True:
-        success, frame = camera.read()
-        if not success or frame is None:
-            await asyncio.sleep(0.01)
-            continue
-        
-        frame_count += 1
-        # AI Throttle: Process landmarks every 2nd frame to keep video at 30fps
-        should_process = frame_count % 2 == 0
-        
-        if should_process:
-            annotated_frame, results, hand_landmarks_list = gesture_engine.process_frame(frame)
-            last_results = results
-            last_hand_landmarks = hand_landmarks_list[0] if hand_landmarks_list else None
-        else:
-            # For non-AI frames, just mirror (if it's not done in engine) or use the raw frame
-            # The engine already annotates, so on skipped frames we might not see skeletons
-            # but the video will be twice as fast.
-            annotated_frame = frame
-            
-        landmarks = last_hand_landmarks
-
-        # Logic: Recording or Prediction
-        status_text = "System: Active"
-        
-        if landmarks:
-            # 1. Recording Mode
-            if state.is_recording and state.recording_frames_left > 0:
-                # We record every frame if a hand is present, regardless of processing throttle
-                model_trainer.add_sample(landmarks, state.recording_label)
-                state.recording_frames_left -= 1
-                status_text = f"Recording: {state.recording_label} ({state.recording_frames_left})"
-                
-                if state.recording_frames_left == 0:
-                    state.is_recording = False
-                    model_trainer.train() # Auto-train after recording
-                    status_text = "Training Complete"
-            
-            # 2. Prediction Mode (only if not recording and model is trained)
-            elif model_trainer.is_trained:
-                pred = model_trainer.predict(landmarks)
-                if pred:
-                    state.current_prediction = pred
-                    status_text = f"Detected: {pred}"
-                    
-                    # Execute Action
-                    executed = action_executor.execute(pred)
-                    if executed:
-                        status_text = f"Action: {pred}"
-                else:
-                    state.current_prediction = "None"
-                    status_text = "Unknown Gesture"
-                    action_executor.execute(None) # Heartbeat for debouncer
-            else:
-                status_text = "Model Untrained"
-        else:
-            state.current_prediction = "None"
-            status_text = "No Hand"
-            action_executor.execute(None) # Heartbeat for debouncer
-
-        # Encode (resize and lower quality for faster streaming)
-        display_frame = cv2.resize(annotated_frame, (480, 360))
-        cv2.putText(display_frame, status_text, (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-        
-        ret, buffer = cv2.imencode('.jpg', display_frame, [int(cv2.IMWRITE_JPEG_QUALITY), 60])
-        frame_bytes = buffer.tobytes()
-        
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-        
-        await asyncio.sleep(0.001) # Ultra-short sleep to yield control
+class ModelSelectionRequest(BaseModel):
+    budget_ms: Optional[float] = None # Per-frame latency the promoted model must fit (default 1 ms)
+    folds: int = 5
+
+class SchedulerUpdateRequest(BaseModel):
+    budget: Optional[float] = None        # Max fraction of wall time spent in MediaPipe while a hand is present
+    idle_interval: Optional[float] = None # Seconds between probes while no hand is seen
+    motion_threshold: Optional[float] = None
+
+# --- Video Streaming ---
+async def generate_frames(profile=DEFAULT_PROFILE, fps=None, stream=0):
+    # Viewers only consume the shared pipeline output; JPEGs are encoded once per profile
+    pipeline = pipelines[stream]
+    min_interval = 1.0 / fps if fps else 0.0
+    last_seq, sent_at = 0, float('-inf')
+    frame_publisher.add_viewer(profile, stream)
+    try:
+        while True:
+            result = pipeline.latest
+            if result is None or result.seq <= last_seq:
+                # Woken on the event loop when the pipeline publishes: no thread parked per viewer
+                await frame_publisher.next_frame(stream)
+                continue
+            last_seq = result.seq
+            now = time.perf_counter()
+            if now - sent_at < min_interval:
+                continue # Honour the client FPS: skip to the next frame
+            sent_at = now
+            part = frame_publisher.cached_part(result, profile)
+            if part is None:
+                # First viewer of this frame + profile encodes it, off the event loop
+                part = await asyncio.to_thread(frame_publisher.get_part, result, profile)
+            if part is None:
+                continue
+            yield part
+    finally:
+        frame_publisher.remove_viewer(profile, stream)
 
 # --- API Endpoints ---
 @app.get("/")
 def read_root():
-    return {"status": "GestureFlow Backend Running"}
+    return {
+        "status": "GestureFlow Backend Running",
+        "startup": {
+            "model_load_seconds": model_load_seconds,
+            "first_prediction_seconds": pipeline.first_prediction_seconds
+        },
+        "source": {"name": pipeline.camera.describe(), "connected": pipeline.camera.connected},
+        "streams": [
+            {"stream": p.stream_id, "source": p.camera.describe(), "connected": p.camera.connected}
+            for p in pipelines
+        ]
+    }
+
+@app.get("/ready")
+def get_ready():
+    # Readiness probe: 200 once the model, actions and every stream's hand engine are warm, else 503
+    report = readiness.report()
+    report["streams"] = [
+        {"stream": p.stream_id, "source": p.camera.describe(), "connected": p.camera.connected,
+         "running": p.running and p.thread is not None and p.thread.is_alive(), "errors": p.errors}
+        for p in pipelines
+    ]
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
 
 @app.get("/video_feed")
-def video_feed():
-    return StreamingResponse(generate_frames(), media_type="multipart/x-mixed-replace; boundary=frame")
+def video_feed(
+    fps: Optional[float] = Query(None, gt=0, le=60),
+    width: int = Query(DEFAULT_PROFILE.width, ge=80, le=1920),
+    height: Optional[int] = Query(None, ge=60, le=1080),
+    quality: int = Query(DEFAULT_PROFILE.quality, ge=10, le=95),
+    stream: int = Query(0, ge=0)
+):
+    # e.g. /video_feed?fps=10&width=320&quality=40 for a low-bandwidth thumbnail
+    if stream >= len(pipelines):
+        raise HTTPException(status_code=404, detail=f"No stream {stream}")
+    profile = StreamProfile(width, height or width * 3 // 4, quality)
+    return StreamingResponse(generate_frames(profile, fps, stream), media_type="multipart/x-mixed-replace; boundary=frame")
 
 @app.get("/gestures")
 def get_gestures():
@@ -180,46 +267,199 @@ def update_action(req: ActionUpdateRequest):
     action_executor.config_manager.set_action(req.label, req.action_type, req.command)
     return {"status": "success"}
 
+@app.get("/actions/commands")
+def get_command_stats():
+    # Custom command pool: per-command runs, failures, timeouts, rejections, latency, last output
+    return action_executor.command_runner.stats()
+
 @app.post("/gestures/record")
 def start_recording(req: RecordRequest):
+    require_model()
     if state.is_recording:
         raise HTTPException(status_code=400, detail="Already recording")
     
+    pipeline.recorder.reset()
     state.recording_label = req.label
     state.recording_frames_left = req.num_frames
     state.recording_total_frames = req.num_frames
     state.is_recording = True
+    publish_state()
     return {"status": "started", "label": req.label}
 
+# 64 MB = ~260k float32 feature vectors per request
+MAX_INGEST_BYTES = 64 * 1024 * 1024
+
+def parse_samples(body, raw=False, aspect=4 / 3):
+    # .npy payload (np.save) or bare little-endian float32; (n, 63) features or (n, 21, 3) points
+    if body[:6] == b"\x93NUMPY":
+        X = np.load(io.BytesIO(body), allow_pickle=False)
+    elif len(body) % (FEATURE_SIZE * 4) == 0:
+        X = np.frombuffer(body, dtype="<f4")
+    else:
+        raise ValueError("Body must be a .npy array or float32 rows of 63 values")
+    if X.dtype.kind != "f" or X.size % FEATURE_SIZE:
+        raise ValueError(f"Expected float rows of {FEATURE_SIZE} values, got {X.dtype} {X.shape}")
+    X = X.astype(np.float32).reshape(-1, FEATURE_SIZE)
+    # raw=True: unnormalized MediaPipe coordinates, normalized here like live frames
+    return normalize_landmarks(X, aspect) if raw else X
+
+async def read_body_capped(request, limit):
+    # Rejects oversized uploads before buffering them: declared length first, then a running count
+    too_large = HTTPException(status_code=413, detail=f"Payload over {limit} bytes")
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > limit:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise too_large
+    return bytes(body)
+
+@app.post("/gestures/ingest")
+async def ingest_samples(
+    request: Request,
+    label: str = Query(..., min_length=1),
+    raw: bool = False,
+    aspect: float = Query(4 / 3, gt=0),
+    min_distance: float = Query(0.01, ge=0),
+    train: bool = True
+):
+    # Bulk-load a library without a camera, e.g. curl --data-binary @fist.npy "/gestures/ingest?label=Fist"
+    require_model()
+    body = await read_body_capped(request, MAX_INGEST_BYTES)
+    if not body:
+        raise HTTPException(status_code=400, detail="Empty body")
+    try:
+        received = parse_samples(body, raw, aspect)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Same quality gate as recording: invalid and repeated rows are dropped
+    samples = filter_samples(received, min_distance)
+    if len(samples) == 0:
+        return {"status": "ingested", "label": label, "received": len(received), "accepted": 0,
+                "rejected": len(received), "training": False}
+    await asyncio.to_thread(model_trainer.add_samples, samples, label)
+    if train and len(samples):
+        model_trainer.train_async()
+    return {"status": "ingested", "label": label, "received": len(received), "accepted": len(samples),
+            "rejected": len(received) - len(samples), "training": train and len(samples) > 0}
+
 @app.delete("/gestures/{label:path}")
 def delete_gesture(label: str):
+    require_model()
     model_trainer.remove_gesture(label)
     action_executor.config_manager.remove_action(label)
     return {"status": "deleted", "gestures": model_trainer.get_gestures()}
 
 @app.post("/train")
-def train_model():
-    success = model_trainer.train()
+async def train_model():
+    require_model()
+    # Fit runs on the trainer's worker thread; the pipeline keeps predicting with the old model
+    future = model_trainer.train_async()
+    success = await asyncio.wrap_future(future) if future is not None else False
     if success:
         return {"status": "success", "message": "Model trained successfully"}
     else:
         raise HTTPException(status_code=400, detail="Training failed (no data?)")
 
+@app.post("/train/select")
+async def select_model(req: ModelSelectionRequest):
+    require_model()
+    # k-fold CV of MLP sizes / k-NN / linear models; the best one under the budget replaces the model
+    if req.budget_ms is not None and req.budget_ms <= 0:
+        raise HTTPException(status_code=400, detail="budget_ms must be positive")
+    if req.folds < 2:
+        raise HTTPException(status_code=400, detail="folds must be at least 2")
+    future = model_trainer.select_model_async(None if req.budget_ms is None else req.budget_ms / 1000, req.folds)
+    if future is None:
+        raise HTTPException(status_code=400, detail="No samples recorded")
+    try:
+        return await asyncio.wrap_future(future)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/train/selection")
+def get_model_selection():
+    return model_trainer.selection or {}
+
+@app.get("/train/status")
+def train_status():
+    return model_trainer.get_training_status()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    # Prometheus text exposition format
+    metrics.set_gauge("stream_viewers", frame_publisher.viewer_count)
+    metrics.set_gauge("websocket_clients", len(connected_websockets))
+    schedulers = {p.stream_id: p.scheduler for p in pipelines if p.scheduler is not None}
+    return metrics.render_prometheus() + render_scheduler_metrics(schedulers, metrics.prefix)
+
+@app.get("/metrics/summary")
+def get_metrics_summary():
+    # JSON view for the Dashboard: per-stage p50/p95/p99, FPS, counters, scheduler state
+    summary = metrics.summary()
+    summary["scheduler"] = pipeline.scheduler.stats()
+    summary["streams"] = [
+        {
+            "stream": p.stream_id,
+            "source": p.camera.describe(),
+            "scheduler": p.scheduler.stats(),
+            "classifier": dict(p.trackers.stats),
+            "predictions": {tag: None if label is None else str(label) for tag, label in p.predictions.items()},
+        }
+        for p in pipelines
+    ]
+    summary["recording"] = dict(pipeline.recorder.stats)
+    summary["stream_viewers"] = frame_publisher.viewer_count
+    summary["websocket_clients"] = len(connected_websockets)
+    return summary
+
+@app.get("/scheduler")
+def get_scheduler():
+    return pipeline.scheduler.stats()
+
+@app.post("/scheduler")
+def update_scheduler(req: SchedulerUpdateRequest):
+    if req.budget is not None and not 0 < req.budget <= 1:
+        raise HTTPException(status_code=400, detail="budget must be in (0, 1]")
+    # Applies to every stream
+    for p in pipelines:
+        scheduler = p.scheduler
+        if req.budget is not None:
+            scheduler.budget = req.budget
+        if req.idle_interval is not None:
+            scheduler.idle_interval = req.idle_interval
+        if req.motion_threshold is not None:
+            scheduler.motion_threshold = req.motion_threshold
+    return pipeline.scheduler.stats()
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
     connected_websockets.append(websocket)
+    queue = broadcaster.subscribe()
+
+    async def pump():
+        # Pushed as soon as the state changes; idle clients get no traffic
+        while True:
+            text = await queue.get()
+            push_start = time.perf_counter()
+            await websocket.send_text(text)
+            metrics.observe("ws_push", time.perf_counter() - push_start)
 
+    sender = asyncio.create_task(pump())
     try:
+        # Only reads to notice the disconnect; clients don't send anything
         while True:
-            # Push state updates every 100ms
-            await websocket.send_json({
-                "prediction": state.current_prediction,
-                "is_recording": state.is_recording,
-                "recording_progress": 0 if state.recording_total_frames == 0 else 1 - (state.recording_frames_left / state.recording_total_frames)
-            })
-            await asyncio.sleep(0.1)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
     except Exception:
+        pass
+    finally:
+        sender.cancel()
+        broadcaster.unsubscribe(queue)
         connected_websockets.remove(websocket)
 
 if __name__ == "__main__":
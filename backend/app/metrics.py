@@ -0,0 +1,169 @@
+import bisect
+import threading
+import time
+
+# Latency bucket upper bounds in seconds (Prometheus-style, +Inf implied)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class LatencyHistogram:
+    # Fixed-bucket histogram: O(log buckets) per observation, no per-sample storage
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        # Linear interpolation inside the bucket holding the q-th observation
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c and seen + c >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+                return lower + (upper - lower) * (rank - seen) / c
+            seen += c
+        return self.max
+
+
+class RateMeter:
+    # Events per second over a sliding window of recent timestamps
+    def __init__(self, window=2.0):
+        self.window = window
+        self.times = []
+
+    def tick(self, now):
+        self.times.append(now)
+        cutoff = now - self.window
+        if self.times[0] < cutoff:
+            self.times = self.times[bisect.bisect_left(self.times, cutoff):]
+
+    def rate(self, now=None):
+        now = now if now is not None else time.perf_counter()
+        recent = [t for t in self.times if t >= now - self.window]
+        return len(recent) / self.window
+
+
+class Metrics:
+    """Process-wide registry for hot-path instrumentation.
+
+    Stages report wall time with observe(); counters, gauges and rate meters
+    cover frame/action throughput. Everything is plain Python arithmetic
+    under one lock (about a microsecond per call), so it stays on in
+    production. Rendered as Prometheus text or a JSON summary.
+    """
+
+    def __init__(self, prefix="aigcs"):
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self.rates = {}
+
+    def observe(self, name, seconds):
+        with self.lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = LatencyHistogram()
+            hist.observe(seconds)
+
+    def inc(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name, value):
+        self.gauges[name] = value
+
+    def tick(self, name, now=None):
+        now = now if now is not None else time.perf_counter()
+        with self.lock:
+            meter = self.rates.get(name)
+            if meter is None:
+                meter = self.rates[name] = RateMeter()
+            meter.tick(now)
+
+    def timer(self, name):
+        return _StageTimer(self, name)
+
+    def summary(self):
+        with self.lock:
+            now = time.perf_counter()
+            return {
+                "stages": {
+                    name: {
+                        "count": h.count,
+                        "mean_ms": h.sum / h.count * 1000 if h.count else None,
+                        "p50_ms": _ms(h.quantile(0.5)),
+                        "p95_ms": _ms(h.quantile(0.95)),
+                        "p99_ms": _ms(h.quantile(0.99)),
+                        "max_ms": h.max * 1000,
+                    }
+                    for name, h in self.histograms.items()
+                },
+                "rates": {name: meter.rate(now) for name, meter in self.rates.items()},
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+            }
+
+    def render_prometheus(self):
+        p = self.prefix
+        lines = []
+        with self.lock:
+            now = time.perf_counter()
+            lines.append(f"# TYPE {p}_stage_latency_seconds histogram")
+            for name, h in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, c in zip(h.buckets, h.counts):
+                    cumulative += c
+                    lines.append(f'{p}_stage_latency_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{p}_stage_latency_seconds_bucket{{stage="{name}",le="+Inf"}} {h.count}')
+                lines.append(f'{p}_stage_latency_seconds_sum{{stage="{name}"}} {h.sum}')
+                lines.append(f'{p}_stage_latency_seconds_count{{stage="{name}"}} {h.count}')
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE {p}_{name}_total counter")
+                lines.append(f"{p}_{name}_total {value}")
+            for name, meter in sorted(self.rates.items()):
+                lines.append(f"# TYPE {p}_{name}_per_second gauge")
+                lines.append(f"{p}_{name}_per_second {meter.rate(now)}")
+            for name, value in sorted(self.gauges.items()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    lines.append(f"# TYPE {p}_{name} gauge")
+                    lines.append(f"{p}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "name", "start")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def _ms(seconds):
+    return None if seconds is None else seconds * 1000
+
+
+# Shared registry used by the pipeline, engine, trainer and action executor
+metrics = Metrics()
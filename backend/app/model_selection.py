@@ -0,0 +1,127 @@
+"""Model selection: k-fold cross-validation of candidate classifiers on the
+stored samples, scored on accuracy, per-frame latency and size.
+
+Folds split the original samples; each training fold is expanded with its
+cached augmented views exactly like a real fit, and only originals are
+scored. The (candidate, fold) fits run in parallel through joblib (already
+an sklearn dependency), whose worker processes do not re-import the server.
+Latency is measured afterwards in this process, one candidate at a time,
+on the forward pass the pipeline would actually use for a (2, 63) batch.
+"""
+import pickle
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.neural_network import MLPClassifier
+
+from .augmentation import AugmentationPipeline
+from .inference import make_forward
+
+
+def _mlp(*hidden):
+    return MLPClassifier(hidden_layer_sizes=hidden, activation='relu', solver='adam', max_iter=2000,
+                         random_state=42, learning_rate_init=0.001)
+
+
+# name -> unfitted estimator; "mlp-64-32" is the trainer's default model
+CANDIDATES = {
+    "mlp-64-32": _mlp(64, 32),
+    "mlp-128-64": _mlp(128, 64),
+    "mlp-32": _mlp(32),
+    "mlp-16": _mlp(16),
+    "knn-5": KNeighborsClassifier(n_neighbors=5, weights="distance"),
+    "logreg": LogisticRegression(max_iter=1000),
+}
+
+
+def _fit_fold(name, estimator, gestures, labels, views, train_rows, test_rows):
+    # Runs in a joblib worker
+    X, y = AugmentationPipeline.expand(gestures[train_rows], views[train_rows], labels[train_rows])
+    start = time.perf_counter()
+    model = clone(estimator).fit(X, y)
+    fit_seconds = time.perf_counter() - start
+    accuracy = float(np.mean(model.predict(gestures[test_rows]) == labels[test_rows]))
+    return name, accuracy, fit_seconds
+
+
+def _fit_full(name, estimator, gestures, labels, views):
+    X, y = AugmentationPipeline.expand(gestures, views, labels)
+    return name, clone(estimator).fit(X, y)
+
+
+def measure_latency(model, repeat=300):
+    # Median seconds per frame for the pipeline's batch: one hand + its mirror
+    forward = make_forward(model)
+    batch = np.random.default_rng(0).normal(scale=0.3, size=(2, 63)).astype(np.float32)
+    for _ in range(20):
+        forward.predict_proba(batch)
+    times = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        forward.predict_proba(batch)
+        times[i] = time.perf_counter() - start
+    return float(np.median(times))
+
+
+def select_model(gestures, labels, views, latency_budget=0.001, folds=5, n_jobs=-1, candidates=None,
+                 tolerance=0.005):
+    """Cross-validates every candidate and returns (best fitted model, report).
+
+    The best model is the most accurate one whose per-frame latency fits
+    latency_budget (seconds); among candidates within `tolerance` of that
+    accuracy the fastest wins. If none fits the budget, the fastest overall.
+    """
+    candidates = candidates or CANDIDATES
+    smallest_class = int(np.unique(labels, return_counts=True)[1].min())
+    folds = min(folds, smallest_class)
+    if folds < 2:
+        raise ValueError("Every gesture needs at least 2 samples for cross-validation")
+
+    splits = list(StratifiedKFold(n_splits=folds, shuffle=True, random_state=42).split(gestures, labels))
+    start = time.perf_counter()
+    parallel = Parallel(n_jobs=n_jobs)
+    fold_results = parallel(
+        delayed(_fit_fold)(name, estimator, gestures, labels, views, train_rows, test_rows)
+        for name, estimator in candidates.items() for train_rows, test_rows in splits
+    )
+    fitted = dict(parallel(
+        delayed(_fit_full)(name, estimator, gestures, labels, views) for name, estimator in candidates.items()
+    ))
+    cv_seconds = time.perf_counter() - start
+
+    rows = []
+    for name in candidates:
+        scores = [accuracy for n, accuracy, _ in fold_results if n == name]
+        fit_times = [seconds for n, _, seconds in fold_results if n == name]
+        model = fitted[name]
+        rows.append({
+            "name": name,
+            "accuracy": float(np.mean(scores)),
+            "accuracy_std": float(np.std(scores)),
+            "latency_ms": measure_latency(model) * 1e3,
+            "size_bytes": len(pickle.dumps(model)),
+            "fit_seconds": float(np.mean(fit_times)),
+        })
+
+    within = [r for r in rows if r["latency_ms"] <= latency_budget * 1e3]
+    if within:
+        top = max(r["accuracy"] for r in within)
+        best = min((r for r in within if r["accuracy"] >= top - tolerance), key=lambda r: r["latency_ms"])
+    else:
+        best = min(rows, key=lambda r: r["latency_ms"])
+
+    report = {
+        "selected": best["name"],
+        "within_budget": bool(within),
+        "latency_budget_ms": latency_budget * 1e3,
+        "folds": folds,
+        "samples": len(gestures),
+        "seconds": cv_seconds,
+        "candidates": sorted(rows, key=lambda r: -r["accuracy"]),
+    }
+    return fitted[best["name"]], report
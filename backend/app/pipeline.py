@@ -0,0 +1,223 @@
+import threading
+import time
+from .metrics import metrics
+from .recording import SampleRecorder
+
+
+class FrameResult:
+    # One processed camera frame, shared by every subscriber (MJPEG viewers, /ws, actions)
+    def __init__(self, seq, timestamp, frame, landmarks, prediction, status_text, stream=0, hands=None,
+                 predictions=None, points=None, source=None):
+        self.seq = seq              # Camera frame id
+        self.timestamp = timestamp  # Capture time (perf_counter)
+        self.frame = frame          # Raw camera frame (read-only ring view); annotated only when encoded
+        self.landmarks = landmarks  # First detected hand (None = no hand)
+        self.prediction = prediction
+        self.status_text = status_text
+        self.stream = stream
+        self.hands = hands or []              # [(tag, landmarks), ...] for every detected hand
+        self.predictions = predictions or {}  # {tag: confirmed label or None}
+        self.points = points or []            # (21, 3) image-space points per hand detected on this frame
+        self.source = source                  # FrameSource owning `frame`'s ring slot (None: frame is not recycled)
+
+
+class InferencePipeline:
+    """Single background loop that runs recognition once per camera frame.
+
+    The loop owns the MediaPipe/MLP/action work; clients only subscribe to
+    the published results, so CPU cost does not grow with the viewer count.
+    """
+
+    def __init__(self, camera, gesture_engine, model_trainer, action_executor, state, scheduler, trackers,
+                 stream_id=0, records=True, launch_time=None):
+        self.camera = camera
+        self.gesture_engine = gesture_engine
+        self.model_trainer = model_trainer
+        self.action_executor = action_executor
+        self.state = state
+        self.scheduler = scheduler  # None = run MediaPipe on every frame
+        self.trackers = trackers    # HandTrackers: per-hand smoothing + batched classification
+        self.stream_id = stream_id
+        self.records = records      # Whether this stream feeds /gestures/record sessions
+        self.recorder = SampleRecorder() # Drops repeated, near-duplicate and low-confidence samples
+        # Cold start: seconds from process launch to the first model prediction
+        self.launch_time = launch_time if launch_time is not None else time.perf_counter()
+        self.first_prediction_seconds = None
+
+        self.latest = None
+        self.last_hands = []       # [(tag, landmarks)], reused on frames the scheduler skips
+        self.last_scores = []      # MediaPipe handedness score per hand (None when unknown)
+        self.predictions = {}      # Confirmed label per hand tag of the latest frame
+        self.result_cond = threading.Condition()
+        self.subscribers = []     # Callbacks invoked with every FrameResult
+
+        self.engine_ready = True # False while the lifespan warms up the hand engine: frames skip detection
+        self.running = False
+        self.thread = None
+        self.errors = 0 # Frames whose step() raised
+        self.last_error = None
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True, name=f"pipeline-{self.stream_id}")
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def run(self):
+        last_frame_id = 0
+
+        while self.running:
+            # Block until the camera publishes a new frame; each frame id is processed once
+            captured = self.camera.wait_for_frame(last_frame_id, timeout=1.0)
+            if captured is None:
+                continue
+            frame_id, timestamp, frame = captured
+            loop_start = time.perf_counter()
+            # Frames the camera produced while we were busy never reach the pipeline
+            if last_frame_id and frame_id - last_frame_id > 1:
+                metrics.inc("dropped_frames", frame_id - last_frame_id - 1)
+            last_frame_id = frame_id
+            metrics.observe("capture_to_pipeline", loop_start - timestamp)
+            metrics.tick("frames", loop_start)
+
+            try:
+                if self.camera.provides_landmarks:
+                    self.step(frame_id, timestamp, frame, replayed=True, landmarks=self.camera.landmarks_for(frame_id))
+                else:
+                    self.step(frame_id, timestamp, frame)
+            except Exception as e:
+                # One bad frame (engine, trackers, executor) must not end the stream's thread
+                self.errors += 1
+                metrics.inc("pipeline_errors")
+                # Log new errors, and a repeating one only every 100 frames instead of at camera rate
+                if repr(e) != self.last_error or self.errors % 100 == 0:
+                    print(f"Pipeline {self.stream_id} error on frame {frame_id} ({self.errors} so far): {e!r}")
+                self.last_error = repr(e)
+                continue
+            metrics.observe("frame_total", time.perf_counter() - timestamp)
+
+    def step(self, frame_id, timestamp, frame, replayed=False, landmarks=None):
+        """Processes one frame and publishes its FrameResult. With replayed=True the
+        landmarks come from a recording and MediaPipe is skipped entirely."""
+        points = None
+        if replayed:
+            self.last_hands = [] if landmarks is None else [("0", landmarks)]
+            self.last_scores = [None] * len(self.last_hands)
+            fresh = True
+        elif not self.engine_ready:
+            fresh = False # Frames still flow to viewers; detection starts once the engine is warm
+        # AI Throttle: the scheduler picks the inference rate from the latency budget and scene state
+        elif self.scheduler is None or self.scheduler.should_process(frame, timestamp):
+            start = time.perf_counter()
+            _, results, hand_landmarks_list = self.gesture_engine.process_frame(frame)
+            if self.scheduler is not None:
+                self.scheduler.record(time.perf_counter() - start, bool(hand_landmarks_list))
+            metrics.tick("inferences")
+            count = len(hand_landmarks_list)
+            if count:
+                points = self.gesture_engine.hand_points(results, count)
+            # Hands are told apart by position: MediaPipe's handedness label alone flips on held hands
+            positions = [hand[:, :2].mean(axis=0) for hand in points or []]
+            positions += [None] * (count - len(positions))
+            tags = self.trackers.assign(positions, self.gesture_engine.hand_tags(results, count))
+            self.last_hands = list(zip(tags, hand_landmarks_list))
+            self.last_scores = self.gesture_engine.hand_scores(results, count)
+            fresh = True
+        else:
+            fresh = False
+
+        predictions, status_text = self.handle_hands(self.last_hands, timestamp, fresh)
+        if not replayed and not self.engine_ready:
+            status_text = "Starting Hand Tracking"
+        primary = self.last_hands[0] if self.last_hands else None
+        result = FrameResult(frame_id, timestamp, frame,
+                             primary[1] if primary else None,
+                             predictions.get(primary[0]) if primary else None,
+                             status_text, stream=self.stream_id, hands=self.last_hands, predictions=predictions,
+                             points=points, source=self.camera)
+        self.publish(result)
+        return result
+
+    def handle_hands(self, hands, timestamp=None, fresh=True):
+        """hands: [(tag, landmarks), ...] for every detected hand. Returns
+        ({tag: confirmed label or None}, status text).
+        fresh=False: the scheduler skipped MediaPipe and hands are the previous frame's."""
+        state = self.state
+        predictions = {}
+        status_text = "System: Active"
+
+        if hands:
+            # 1. Recording Mode (first hand of the recording stream only)
+            if self.records and state.is_recording and state.recording_frames_left > 0:
+                landmarks = hands[0][1]
+                # Only distinct, freshly detected hands count towards the requested frames
+                score = self.last_scores[0] if fresh and self.last_scores else None
+                if self.recorder.offer(landmarks, fresh, score):
+                    self.model_trainer.add_sample(landmarks, state.recording_label)
+                    state.recording_frames_left -= 1
+                status_text = f"Recording: {state.recording_label} ({state.recording_frames_left})"
+
+                if state.recording_frames_left == 0:
+                    state.is_recording = False
+                    self.model_trainer.train_async() # Auto-train after recording, off the frame loop
+                    status_text = "Training Started"
+
+            # 2. Prediction Mode (only if not recording and model is trained)
+            elif self.model_trainer.is_trained:
+                # Only fresh landmarks advance the smoothers; repeats reuse their confirmed gestures.
+                # All hands that moved are classified in one batched call.
+                if fresh:
+                    with metrics.timer("predict"):
+                        predictions = self.trackers.update(hands)
+                    metrics.set_gauge("prediction_confidence", self.trackers.confidence(hands[0][0]))
+                else:
+                    predictions = self.trackers.confirmed()
+                if self.first_prediction_seconds is None:
+                    self.first_prediction_seconds = time.perf_counter() - self.launch_time
+                    print(f"Cold start: first prediction {self.first_prediction_seconds:.2f}s after launch")
+
+                parts = []
+                for tag, prediction in predictions.items():
+                    # Debounce/cooldown state is kept per (stream, hand)
+                    source = (self.stream_id, tag)
+                    if not prediction:
+                        self.action_executor.execute(None, source=source) # Heartbeat for debouncer
+                        continue
+                    # Execute Action (once per frame, regardless of how many clients are connected)
+                    # Only enqueues; the executor's worker thread runs the command
+                    with metrics.timer("action_dispatch"):
+                        executed = self.action_executor.execute(prediction, timestamp, source=source)
+                    if executed:
+                        metrics.inc("actions")
+                    parts.append(f"{'Action' if executed else 'Detected'}: {prediction}")
+                status_text = " | ".join(parts) if parts else "Unknown Gesture"
+            else:
+                status_text = "Model Untrained" if self.model_trainer.loaded else "Loading Model"
+        else:
+            self.trackers.reset()
+            status_text = "No Hand"
+
+        self.predictions = predictions
+        return predictions, status_text
+
+    def publish(self, result):
+        # latest first: subscribers (e.g. the viewers' wake-up) may read it right away
+        self.latest = result
+        for callback in list(self.subscribers):
+            try:
+                callback(result)
+            except Exception as e:
+                print(f"Pipeline subscriber error: {e}")
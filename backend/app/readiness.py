@@ -0,0 +1,87 @@
+"""Startup readiness: which subsystems are warmed up and how long startup took.
+
+app.main only builds cheap objects at import time, so uvicorn accepts
+connections right away. The slow parts (loading the model and building its
+similarity index, the first MLP and MediaPipe calls, importing pyautogui)
+run as named components on background threads started by the lifespan.
+Each goes pending -> starting -> ready | failed; the server is ready once
+every required component is. Import and ready times are measured from
+process launch and checked against a budget.
+"""
+import threading
+import time
+
+
+class Readiness:
+    def __init__(self, launch_time, import_budget=1.0, ready_budget=10.0):
+        self.launch_time = launch_time
+        self.import_budget = import_budget  # Seconds from launch until app.main is imported
+        self.ready_budget = ready_budget    # Seconds from launch until every required component is ready
+        self.import_seconds = None
+        self.ready_seconds = None
+        self.lock = threading.Lock()
+        self.components = {}   # name -> {"state", "required", "seconds", "error"}
+
+    def imported(self):
+        self.import_seconds = time.perf_counter() - self.launch_time
+        budget_note = "" if self.import_seconds <= self.import_budget else f" (over the {self.import_budget:.1f}s budget)"
+        print(f"Server imported in {self.import_seconds * 1000:.0f} ms{budget_note}")
+
+    def add(self, name, required=True):
+        with self.lock:
+            self.components[name] = {"state": "pending", "required": required, "seconds": None, "error": None}
+
+    def start(self, name, *steps):
+        # Runs the steps in order on a background thread, timed as one component
+        thread = threading.Thread(target=self._run, args=(name, steps), daemon=True, name=f"warmup-{name}")
+        thread.start()
+        return thread
+
+    def _run(self, name, steps):
+        self._update(name, state="starting")
+        start = time.perf_counter()
+        try:
+            for step in steps:
+                step()
+        except Exception as e:
+            print(f"Warmup of {name} failed: {e}")
+            self._update(name, state="failed", error=str(e), seconds=time.perf_counter() - start)
+            return
+        self._update(name, state="ready", seconds=time.perf_counter() - start)
+
+    def _update(self, name, **changes):
+        with self.lock:
+            self.components[name].update(changes)
+            if self.ready_seconds is not None or not self._ready():
+                return
+            self.ready_seconds = time.perf_counter() - self.launch_time
+        budget_note = "" if self.ready_seconds <= self.ready_budget else f" (over the {self.ready_budget:.1f}s budget)"
+        print(f"Ready {self.ready_seconds:.2f}s after launch{budget_note}")
+
+    def _ready(self):
+        return all(c["state"] == "ready" for c in self.components.values() if c["required"])
+
+    @property
+    def ready(self):
+        with self.lock:
+            return self._ready()
+
+    def state(self, name):
+        with self.lock:
+            return self.components[name]["state"]
+
+    def report(self):
+        with self.lock:
+            ready = self._ready()
+            components = {name: dict(c) for name, c in self.components.items()}
+        within = None
+        if self.import_seconds is not None and self.ready_seconds is not None:
+            within = self.import_seconds <= self.import_budget and self.ready_seconds <= self.ready_budget
+        return {
+            "ready": ready,
+            "import_seconds": self.import_seconds,
+            "ready_seconds": self.ready_seconds,
+            "budget": {"import_seconds": self.import_budget, "ready_seconds": self.ready_budget},
+            "within_budget": within,
+            "components": components,
+        }
@@ -0,0 +1,65 @@
+import numpy as np
+
+from .features import FEATURE_SIZE
+from .metrics import metrics
+
+
+def valid_rows(X):
+    # Finite, non-degenerate feature rows (normalize_landmarks maps a collapsed hand to all zeros)
+    return np.isfinite(X).all(axis=1) & (np.abs(X).max(axis=1) > 0)
+
+
+class SampleRecorder:
+    """Gatekeeper between the pipeline and the sample store during recording.
+
+    Accepts a hand only when its landmarks come from a fresh MediaPipe run
+    (not repeated on a frame the scheduler skipped), MediaPipe's handedness
+    score is at least min_score, and it differs from the previously accepted
+    sample by at least min_distance in some coordinate. Rejections are
+    counted per reason.
+    """
+
+    def __init__(self, min_distance=0.01, min_score=0.8):
+        self.min_distance = min_distance
+        self.min_score = min_score
+        self.last = None
+        self.stats = {"accepted": 0, "stale": 0, "duplicate": 0, "low_confidence": 0, "invalid": 0}
+
+    def reset(self):
+        # New recording session
+        self.last = None
+        for reason in self.stats:
+            self.stats[reason] = 0
+
+    def offer(self, landmarks, fresh=True, score=None):
+        if not fresh:
+            return self._reject("stale")
+        if score is not None and score < self.min_score:
+            return self._reject("low_confidence")
+        sample = np.asarray(landmarks, dtype=np.float32).reshape(1, FEATURE_SIZE)
+        if not valid_rows(sample)[0]:
+            return self._reject("invalid")
+        if self.last is not None and np.abs(sample[0] - self.last).max() < self.min_distance:
+            return self._reject("duplicate")
+        self.last = sample[0].copy()
+        self.stats["accepted"] += 1
+        return True
+
+    def _reject(self, reason):
+        self.stats[reason] += 1
+        metrics.inc(f"recording_rejected_{reason}")
+        return False
+
+
+def filter_samples(X, min_distance=0.01):
+    """Bulk version for ingested batches: drops invalid rows and rows within
+    min_distance of the row before them (e.g. repeated frames of a capture).
+    Returns the kept rows as float32 (n, 63)."""
+    X = np.asarray(X, dtype=np.float32).reshape(-1, FEATURE_SIZE)
+    X = X[valid_rows(X)]
+    if len(X) > 1 and min_distance > 0:
+        # Vectorized: a run of identical rows keeps only its first
+        keep = np.ones(len(X), dtype=bool)
+        keep[1:] = np.abs(np.diff(X, axis=0)).max(axis=1) >= min_distance
+        X = X[keep]
+    return X
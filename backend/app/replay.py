@@ -0,0 +1,213 @@
+"""Offline replay harness: drives the full recognition pipeline from a recorded
+source as fast as the machine allows, without a webcam or a display.
+
+    # Record a labeled landmark trace (camera index, video file or image directory)
+    python -m app.replay record 0 fist.trace --label Fist --limit 300
+
+    # Replay through MediaPipe (video/images) or straight from landmarks (.trace)
+    python -m app.replay run fist.trace --train training.trace --json results.json
+
+Reports throughput, per-stage latency and, when the source carries labels
+(trace records or --label), prediction accuracy. Actions are never executed;
+dispatches are only counted.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from .metrics import metrics
+from .pipeline import InferencePipeline
+from .scheduler import InferenceScheduler
+from .sources import open_source
+from .temporal import HandTrackers
+from .trace import TraceWriter, read_trace
+from .trainer import DEFAULT_MODEL_PATH, ModelTrainer
+
+
+class ReplayState:
+    # Stand-in for main.SystemState (no recording during replay)
+    is_recording = False
+    recording_label = ""
+    recording_frames_left = 0
+    recording_total_frames = 0
+
+
+class DryRunExecutor:
+    # Counts what ActionExecutor would have been asked to run
+    def __init__(self):
+        self.dispatches = {}
+
+    def execute(self, action_name, captured_at=None, source=None):
+        if action_name is None:
+            return False
+        action_name = str(action_name)
+        self.dispatches[action_name] = self.dispatches.get(action_name, 0) + 1
+        return True
+
+    def stop(self):
+        pass
+
+
+def _engine_for(source, workers="thread"):
+    if source.provides_landmarks:
+        return None
+    # MediaPipe is only needed when replaying images
+    if workers == "process":
+        from .hand_workers import ProcessGestureEngine
+        return ProcessGestureEngine()
+    from .gesture_engine import GestureEngine
+    return GestureEngine()
+
+
+def train_from_trace(path, work_dir):
+    trainer = ModelTrainer(os.path.join(work_dir, "replay_model.pkl"))
+    trace = read_trace(path)
+    for features, hand, label in zip(trace.features, trace.hand, trace.labels):
+        if hand and label is not None:
+            trainer.add_sample(features, label)
+    if not trainer.train():
+        raise SystemExit(f"Could not train a model from {path}")
+    return trainer
+
+
+def copy_model(model_path, work_dir):
+    # Replays load a copy of the model, its seed and its sample store: loading an outdated
+    # model retrains and saves it, which must never touch the app's (or --model's) files
+    stem = os.path.splitext(model_path)[0]
+    copy_stem = os.path.join(work_dir, os.path.basename(stem))
+    for suffix in (os.path.splitext(model_path)[1], ".seed.pkl"):
+        if os.path.exists(stem + suffix):
+            shutil.copy2(stem + suffix, copy_stem + suffix)
+    if os.path.isdir(stem + "_samples"):
+        shutil.copytree(stem + "_samples", copy_stem + "_samples")
+    return copy_stem + os.path.splitext(model_path)[1]
+
+
+def record(args):
+    source = open_source(args.source, loop=False)
+    if source.provides_landmarks:
+        raise SystemExit("Source is already a landmark trace")
+    engine = _engine_for(source)
+    frames = hands = 0
+    with TraceWriter(args.output) as writer:
+        for timestamp, frame, _ in source.frames():
+            _, _, hand_landmarks_list = engine.process_frame(frame)
+            landmarks = hand_landmarks_list[0] if hand_landmarks_list else None
+            writer.write(timestamp, landmarks, args.label)
+            frames += 1
+            hands += landmarks is not None
+            if args.limit and frames >= args.limit:
+                break
+    print(f"Wrote {frames} frames ({hands} with a hand) to {args.output}")
+
+
+def replay(source, trainer, label=None, limit=None, use_scheduler=False, workers="thread"):
+    """Runs every frame of `source` through a fresh pipeline; returns a results dict."""
+    executor = DryRunExecutor()
+    trackers = HandTrackers(trainer.classify_batch)
+    scheduler = InferenceScheduler() if use_scheduler else None
+    engine = _engine_for(source, workers)
+    pipeline = InferencePipeline(source, engine, trainer, executor, ReplayState(), scheduler, trackers)
+
+    frames = labeled = correct = 0
+    media_start = media_end = None
+    start = time.perf_counter()
+    for timestamp, frame, landmarks in source.frames():
+        frames += 1
+        if source.provides_landmarks:
+            result = pipeline.step(frames, timestamp, frame, replayed=True, landmarks=landmarks)
+            expected = source.current_label()
+        else:
+            result = pipeline.step(frames, timestamp, frame)
+            expected = label
+        if expected is not None and result.landmarks is not None:
+            labeled += 1
+            correct += result.prediction == expected
+        media_start = timestamp if media_start is None else media_start
+        media_end = timestamp
+        if limit and frames >= limit:
+            break
+    wall = time.perf_counter() - start
+    if engine is not None:
+        engine.close()
+
+    media = (media_end - media_start) if frames > 1 else 0.0
+    return {
+        "source": source.describe(),
+        "frames": frames,
+        "wall_seconds": wall,
+        "fps": frames / wall if wall > 0 else None,
+        "realtime_factor": media / wall if wall > 0 and media > 0 else None,
+        "accuracy": correct / labeled if labeled else None,
+        "labeled_frames": labeled,
+        "dispatches": executor.dispatches,
+        "classifier": dict(trackers.stats),
+        "stages": metrics.summary()["stages"],
+    }
+
+
+def print_report(results):
+    print(f"Source          {results['source']}")
+    print(f"Frames          {results['frames']} in {results['wall_seconds']:.2f}s "
+          f"({results['fps'] or 0:.0f} fps" +
+          (f", {results['realtime_factor']:.1f}x real time)" if results["realtime_factor"] else ")"))
+    if results["accuracy"] is not None:
+        print(f"Accuracy        {results['accuracy']:.1%} over {results['labeled_frames']} labeled hand frames")
+    print(f"Classifier      {results['classifier']['classified']} runs, {results['classifier']['reused']} reused")
+    print(f"Dispatches      {results['dispatches']}")
+    print(f"{'stage':20s} {'count':>7s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}")
+    for name, stage in sorted(results["stages"].items()):
+        print(f"{name:20s} {stage['count']:7d} {stage['p50_ms']:8.3f} {stage['p95_ms']:8.3f} {stage['p99_ms']:8.3f}")
+
+
+def run(args):
+    source = open_source(args.source, loop=False)
+    with tempfile.TemporaryDirectory() as work_dir:
+        if args.train:
+            trainer = train_from_trace(args.train, work_dir)
+        else:
+            trainer = ModelTrainer(copy_model(args.model or DEFAULT_MODEL_PATH, work_dir))
+        if not trainer.is_trained:
+            raise SystemExit("Model is untrained; pass --train TRACE or a trained --model")
+        results = replay(source, trainer, args.label, args.limit, args.scheduler, args.workers)
+        trainer.train_executor.shutdown(wait=True)
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.replay", description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rec = commands.add_parser("record", help="Run MediaPipe over a source and write a landmark trace")
+    rec.add_argument("source", help="Camera index, video file or image directory")
+    rec.add_argument("output", help="Trace file to write (.trace)")
+    rec.add_argument("--label", help="Ground-truth gesture label stored with every frame")
+    rec.add_argument("--limit", type=int, help="Stop after this many frames")
+    rec.set_defaults(func=record)
+
+    rep = commands.add_parser("run", help="Replay a source through the pipeline and report")
+    rep.add_argument("source", help="Camera index, video file, image directory or .trace file")
+    rep.add_argument("--model", help="Model pickle to use, copied first (default: the app's model)")
+    rep.add_argument("--train", help="Train a throwaway model from this labeled trace instead")
+    rep.add_argument("--label", help="Ground-truth label for unlabeled sources")
+    rep.add_argument("--limit", type=int, help="Stop after this many frames")
+    rep.add_argument("--scheduler", action="store_true",
+                     help="Throttle MediaPipe like the live app (default: every frame)")
+    rep.add_argument("--workers", choices=("thread", "process"), default="thread",
+                     help="Run MediaPipe in the replay thread or in a worker process like the app")
+    rep.add_argument("--json", help="Also write the results to this JSON file")
+    rep.set_defaults(func=run)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+import json
+import os
+import threading
+import numpy as np
+
+from .features import FEATURE_SIZE
+
+
+class SampleStore:
+    """Columnar on-disk store for recorded landmark samples.
+
+    Samples live in a memory-mapped float32 (capacity, 63) matrix next to an
+    int32 label-code column; a small JSON file holds the label table, the row
+    count and the current file generation. Appends write straight into the
+    memmap, deletes are tombstones (code -1) and the files are rewritten
+    (compacted) only when they run out of capacity or when tombstones pass
+    compact_ratio of the rows. Rewrites go to a new generation of files so
+    the old mapping never has to be replaced in place (not possible on Windows
+    while it is mapped).
+
+    With an augmenter (AugmentationPipeline), augmented views of every row
+    are cached in a third (capacity, views, 63) memmap of the same generation.
+    Views are computed only for rows appended since the last training
+    snapshot; rewrites carry the computed ones over.
+    """
+
+    META_FILE = "store.json"
+
+    def __init__(self, directory, initial_capacity=1024, compact_ratio=0.25, augmenter=None):
+        self.directory = directory
+        self.initial_capacity = initial_capacity
+        self.compact_ratio = compact_ratio
+        self.augmenter = augmenter
+        self.lock = threading.RLock()
+
+        self.label_table = []  # code -> label (None once the label has been removed)
+        self.label_codes = {}  # label -> code
+        self.count = 0         # Rows in use, tombstones included
+        self.tombstones = 0
+        self.generation = 0
+        self.features = None
+        self.codes = None
+        self.augmented = None
+        self.augmented_rows = 0  # Leading rows whose views are in self.augmented
+
+        os.makedirs(directory, exist_ok=True)
+        if not self._load():
+            self._open(0, initial_capacity, create=True)
+            self._write_meta()
+
+    # --- Files ---
+    def _paths(self, generation):
+        return (os.path.join(self.directory, f"features-{generation}.npy"),
+                os.path.join(self.directory, f"codes-{generation}.npy"),
+                os.path.join(self.directory, f"augmented-{generation}.npy"))
+
+    def _open(self, generation, capacity, create=False, augmented_rows=0):
+        features_path, codes_path, _ = self._paths(generation)
+        mode = 'w+' if create else 'r+'
+        self.features = np.lib.format.open_memmap(features_path, mode=mode, dtype=np.float32, shape=(capacity, FEATURE_SIZE) if create else None)
+        self.codes = np.lib.format.open_memmap(codes_path, mode=mode, dtype=np.int32, shape=(capacity,) if create else None)
+        self.generation = generation
+        self._open_augmented(create, augmented_rows)
+
+    def _open_augmented(self, create, rows):
+        self.augmented = None
+        self.augmented_rows = rows
+        if self.augmenter is None or not self.augmenter.views:
+            self.augmented_rows = 0
+            return
+        path = self._paths(self.generation)[2]
+        shape = (self.capacity, self.augmenter.views, FEATURE_SIZE)
+        if not create and os.path.exists(path):
+            try:
+                self.augmented = np.lib.format.open_memmap(path, mode='r+')
+            except (OSError, ValueError):
+                self.augmented = None
+        if self.augmented is None or self.augmented.shape != shape:
+            self.augmented = None
+            self.augmented = np.lib.format.open_memmap(path, mode='w+', dtype=np.float32, shape=shape)
+            self.augmented_rows = 0
+
+    def _load(self):
+        meta_path = os.path.join(self.directory, self.META_FILE)
+        if not os.path.exists(meta_path):
+            return False
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            # Cached views are only trusted if they were made by the same augmentations
+            same = self.augmenter is not None and meta.get("augmentation") == self.augmenter.version
+            self._open(meta["generation"], None, augmented_rows=meta.get("augmented_rows", 0) if same else 0)
+            self.label_table = meta["labels"]
+            self.label_codes = {l: i for i, l in enumerate(self.label_table) if l is not None}
+            self.count = meta["count"]
+            self.tombstones = int(np.count_nonzero(self.codes[:self.count] < 0))
+            self.augmented_rows = min(self.augmented_rows, self.count)
+            return True
+        except Exception as e:
+            print(f"Error loading sample store: {e}")
+            return False
+
+    def _write_meta(self):
+        meta_path = os.path.join(self.directory, self.META_FILE)
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"generation": self.generation, "count": self.count, "labels": self.label_table,
+                       "augmentation": self.augmenter.version if self.augmented is not None else None,
+                       "augmented_rows": self.augmented_rows}, f)
+        os.replace(tmp_path, meta_path)
+
+    def flush(self):
+        with self.lock:
+            self.features.flush()
+            self.codes.flush()
+            if self.augmented is not None:
+                self.augmented.flush()
+            self._write_meta()
+
+    @property
+    def capacity(self):
+        return self.features.shape[0]
+
+    # --- Mutations ---
+    def _code_for(self, label):
+        code = self.label_codes.get(label)
+        if code is None:
+            code = len(self.label_table)
+            self.label_table.append(label)
+            self.label_codes[label] = code
+        return code
+
+    def append(self, sample, label):
+        with self.lock:
+            self._ensure_capacity(self.count + 1)
+            self.features[self.count] = sample
+            self.codes[self.count] = self._code_for(label)
+            self.count += 1
+
+    def append_many(self, samples, labels):
+        # samples: (n, 63); labels: a single label or one per row
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1, FEATURE_SIZE)
+        n = len(samples)
+        with self.lock:
+            if isinstance(labels, str):
+                codes = np.full(n, self._code_for(labels), dtype=np.int32)
+            else:
+                codes = np.fromiter((self._code_for(l) for l in labels), dtype=np.int32, count=n)
+            self._ensure_capacity(self.count + n)
+            self.features[self.count:self.count + n] = samples
+            self.codes[self.count:self.count + n] = codes
+            self.count += n
+        return n
+
+    def remove_label(self, label):
+        # Tombstones every row of a label in one vectorized pass; returns rows removed
+        with self.lock:
+            code = self.label_codes.pop(label, None)
+            if code is None:
+                return 0
+            self.label_table[code] = None
+            codes = self.codes[:self.count]
+            hits = codes == code
+            removed = int(np.count_nonzero(hits))
+            codes[hits] = -1
+            self.tombstones += removed
+            if self.tombstones > self.compact_ratio * self.count:
+                self.compact()
+            else:
+                self._write_meta()
+            return removed
+
+    def _ensure_capacity(self, needed):
+        if needed > self.capacity:
+            self._rewrite(max(needed, self.capacity * 2))
+
+    def compact(self):
+        with self.lock:
+            self._rewrite(max(self.initial_capacity, len(self) * 2))
+
+    def _rewrite(self, capacity):
+        # Copy live rows into a fresh generation, dropping tombstones and removed labels
+        live = self.codes[:self.count] >= 0
+        features = self.features[:self.count][live]
+        old_codes = self.codes[:self.count][live]
+        # Rows keep their order, so the augmented prefix stays a prefix
+        augmented = None
+        if self.augmented is not None:
+            augmented = np.array(self.augmented[:self.augmented_rows][live[:self.augmented_rows]])
+
+        kept = [c for c, l in enumerate(self.label_table) if l is not None]
+        remap = np.full(len(self.label_table), -1, dtype=np.int32)
+        remap[kept] = np.arange(len(kept), dtype=np.int32)
+        label_table = [self.label_table[c] for c in kept]
+
+        self.features.flush()
+        self._open(self.generation + 1, capacity, create=True)
+        n = len(features)
+        self.features[:n] = features
+        self.codes[:n] = remap[old_codes] if n else old_codes
+        self.label_table = label_table
+        self.label_codes = {l: i for i, l in enumerate(label_table)}
+        self.count = n
+        self.tombstones = 0
+        if augmented is not None and self.augmented is not None:
+            self.augmented[:len(augmented)] = augmented
+            self.augmented_rows = len(augmented)
+        self.flush()
+
+        self._remove_stale_files()
+
+    def _remove_stale_files(self):
+        current = {os.path.basename(p) for p in self._paths(self.generation)}
+        for name in os.listdir(self.directory):
+            if name.endswith(".npy") and name not in current:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass # Still mapped somewhere (Windows); retried after the next rewrite
+
+    # --- Reads ---
+    def __len__(self):
+        return self.count - self.tombstones
+
+    def snapshot(self):
+        """Returns (X, labels): a float32 (n, 63) copy of the live samples and a
+        matching array of label strings."""
+        with self.lock:
+            codes = np.array(self.codes[:self.count])
+            X = np.array(self.features[:self.count])
+            if self.tombstones:
+                live = codes >= 0
+                X, codes = X[live], codes[live]
+            table = np.array([l if l is not None else "" for l in self.label_table] or [""])
+            return X, table[codes]
+
+    def training_snapshot(self):
+        """Like snapshot(), plus the augmented views of the live samples as a
+        (n, views, 63) array. Views are computed only for rows that have none yet."""
+        if self.augmenter is None:
+            X, labels = self.snapshot()
+            return X, labels, np.empty((len(X), 0, FEATURE_SIZE), dtype=np.float32)
+        with self.lock:
+            if self.augmented is None:
+                X, labels = self.snapshot()
+                return X, labels, self.augmenter.apply(X)
+            if self.augmented_rows < self.count:
+                start = self.augmented_rows
+                self.augmented[start:self.count] = self.augmenter.apply(self.features[start:self.count])
+                self.augmented_rows = self.count
+                self.augmented.flush()
+                self._write_meta()
+            codes = np.array(self.codes[:self.count])
+            X = np.array(self.features[:self.count])
+            views = np.array(self.augmented[:self.count])
+            if self.tombstones:
+                live = codes >= 0
+                X, codes, views = X[live], codes[live], views[live]
+            table = np.array([l if l is not None else "" for l in self.label_table] or [""])
+            return X, table[codes], views
+
+    def get_labels(self):
+        with self.lock:
+            codes = self.codes[:self.count]
+            used = np.unique(codes[codes >= 0])
+            return [self.label_table[c] for c in used]
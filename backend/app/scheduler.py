@@ -0,0 +1,144 @@
+import threading
+import time
+import cv2
+import numpy as np
+
+
+class InferenceScheduler:
+    """Decides per camera frame whether to run the MediaPipe stage.
+
+    Active (a hand was seen within hand_timeout seconds): run as often as the
+    latency budget allows, i.e. keep MediaPipe below `budget` of wall time
+    given its measured (EMA) cost. Fast machines end up processing every
+    frame, slow ones back off instead of starving the video loop.
+
+    Idle (no hand recently): run only when a cheap motion check on a tiny
+    downscaled frame sees skin-coloured pixels moving, plus a slow periodic
+    probe every idle_interval seconds in case a hand appears without motion.
+    """
+
+    COUNTERS = ("processed", "skipped_budget", "skipped_idle", "motion_wakeups", "idle_probes")
+
+    def __init__(self, budget=0.5, idle_interval=0.5, hand_timeout=1.0,
+                 motion_threshold=0.02, probe_size=(40, 30), ema_alpha=0.1):
+        self.budget = budget
+        self.idle_interval = idle_interval
+        self.hand_timeout = hand_timeout
+        self.motion_threshold = motion_threshold
+        self.probe_size = probe_size
+        self.ema_alpha = ema_alpha
+
+        self.inference_ema = None  # Seconds per MediaPipe call
+        self.last_inference = float('-inf')
+        self.last_hand_seen = float('-inf')
+        self.prev_probe = None
+        self.motion_score = 0.0
+        self.mode = "idle"
+        self.lock = threading.Lock()
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+
+        # Preallocated probe buffers (BGR tiny frame, YCrCb, grayscale, masks)
+        w, h = probe_size
+        self._small = np.empty((h, w, 3), dtype=np.uint8)
+        self._ycrcb = np.empty((h, w, 3), dtype=np.uint8)
+        self._gray = np.empty((h, w), dtype=np.uint8)
+        self._diff = np.empty((h, w), dtype=np.uint8)
+        self._skin = np.empty((h, w), dtype=np.uint8)
+
+    @property
+    def min_interval(self):
+        if self.inference_ema is None:
+            return 0.0
+        return self.inference_ema / self.budget
+
+    def _motion(self, frame):
+        # Fraction of tiny-frame pixels that are skin coloured and changed since the last probe
+        cv2.resize(frame, self.probe_size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2YCrCb, dst=self._ycrcb)
+        cv2.inRange(self._ycrcb, (0, 133, 77), (255, 173, 127), dst=self._skin)
+
+        if self.prev_probe is None:
+            self.prev_probe = self._gray.copy()
+            return 1.0
+        cv2.absdiff(self._gray, self.prev_probe, dst=self._diff)
+        self.prev_probe, self._gray = self._gray, self.prev_probe
+        cv2.threshold(self._diff, 25, 255, cv2.THRESH_BINARY, dst=self._diff)
+        cv2.bitwise_and(self._diff, self._skin, dst=self._diff)
+        return cv2.countNonZero(self._diff) / self._diff.size
+
+    def should_process(self, frame, timestamp=None):
+        now = timestamp if timestamp is not None else time.perf_counter()
+        with self.lock:
+            if now - self.last_hand_seen <= self.hand_timeout:
+                self.mode = "active"
+                if now - self.last_inference >= self.min_interval:
+                    return self._accept(now)
+                self.counters["skipped_budget"] += 1
+                return False
+
+            self.mode = "idle"
+            self.motion_score = self._motion(frame)
+            if self.motion_score >= self.motion_threshold:
+                self.counters["motion_wakeups"] += 1
+                return self._accept(now)
+            if now - self.last_inference >= self.idle_interval:
+                self.counters["idle_probes"] += 1
+                return self._accept(now)
+            self.counters["skipped_idle"] += 1
+            return False
+
+    def _accept(self, now):
+        self.last_inference = now
+        self.counters["processed"] += 1
+        return True
+
+    def record(self, duration, hand_present, timestamp=None):
+        # Feed back the measured MediaPipe time and whether a hand was found
+        now = timestamp if timestamp is not None else time.perf_counter()
+        with self.lock:
+            if self.inference_ema is None:
+                self.inference_ema = duration
+            else:
+                self.inference_ema += self.ema_alpha * (duration - self.inference_ema)
+            if hand_present:
+                self.last_hand_seen = now
+
+    def stats(self):
+        with self.lock:
+            interval = self.min_interval
+            return {
+                "mode": self.mode,
+                "budget": self.budget,
+                "inference_ms": None if self.inference_ema is None else self.inference_ema * 1000,
+                "active_max_fps": None if interval <= 0 else 1.0 / interval,
+                "idle_interval": self.idle_interval,
+                "motion_score": self.motion_score,
+                **self.counters,
+            }
+
+
+def render_prometheus(schedulers, prefix="aigcs"):
+    """Prometheus text for {stream id: InferenceScheduler}: the decision counters
+    plus the current state, one series per stream."""
+    stats = {stream: scheduler.stats() for stream, scheduler in sorted(schedulers.items())}
+    lines = []
+
+    def family(name, kind, values):
+        lines.append(f"# TYPE {prefix}_scheduler_{name} {kind}")
+        for stream, value in values.items():
+            if value is not None:
+                lines.append(f'{prefix}_scheduler_{name}{{stream="{stream}"}} {value}')
+
+    if not stats:
+        return ""
+    for name in InferenceScheduler.COUNTERS:
+        family(f"{name}_total", "counter", {stream: s[name] for stream, s in stats.items()})
+    family("active", "gauge", {stream: int(s["mode"] == "active") for stream, s in stats.items()})
+    family("budget", "gauge", {stream: s["budget"] for stream, s in stats.items()})
+    family("inference_seconds", "gauge",
+           {stream: None if s["inference_ms"] is None else s["inference_ms"] / 1000 for stream, s in stats.items()})
+    family("active_max_fps", "gauge", {stream: s["active_max_fps"] for stream, s in stats.items()})
+    family("idle_interval_seconds", "gauge", {stream: s["idle_interval"] for stream, s in stats.items()})
+    family("motion_score", "gauge", {stream: s["motion_score"] for stream, s in stats.items()})
+    return "\n".join(lines) + "\n"
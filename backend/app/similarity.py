@@ -0,0 +1,262 @@
+import threading
+import time
+
+import numpy as np
+
+from .features import FEATURE_SIZE, mirror_landmarks
+
+
+class SimilarityIndex:
+    """Nearest-sample index for the "reality check" in ModelTrainer.predict.
+
+    Every stored sample is indexed together with its mirrored copy, so one
+    query answers "how close is this hand to any recorded gesture, left or
+    right handed". Large libraries live in a KD-tree; samples added since the
+    last build sit in a small pending block that is scanned brute force and
+    folded into the tree once it grows past rebuild_ratio of the tree size.
+    Small libraries skip the tree entirely (a single mat-vec is faster).
+
+    Deleting a gesture only tombstones its rows (by label); queries skip them
+    and the next rebuild drops them. Rebuilds run on a background thread on a
+    snapshot taken under the lock, so queries keep using the old base while
+    the new tree is built and only the swap holds the lock.
+    """
+
+    def __init__(self, brute_force_max=8192, rebuild_ratio=0.1, leaf_size=40, tombstone_k=16):
+        self.brute_force_max = brute_force_max
+        self.rebuild_ratio = rebuild_ratio
+        self.leaf_size = leaf_size
+        self.tombstone_k = tombstone_k  # Neighbours tried past a tombstoned nearest row before brute force
+        self.lock = threading.Lock()
+        self.generation = 0     # Bumped by reset(): a rebuild started before it is discarded
+        self.rebuilding = False
+        self.removals = []      # Labels removed while a rebuild was in flight, replayed onto its result
+        self.reset(None)
+
+    def reset(self, samples, labels=None):
+        # Full rebuild, e.g. when the library is (re)loaded; blocks only the caller
+        if samples is not None and len(samples):
+            X = np.asarray(samples, dtype=np.float32).reshape(-1, FEATURE_SIZE)
+            labels = np.full(len(X), None, dtype=object) if labels is None else np.asarray(labels, dtype=object)
+            prepared = self._prepare(np.vstack([X, mirror_landmarks(X)]), np.repeat([False, True], len(X)),
+                                     np.concatenate([labels, labels]))
+        else:
+            prepared = self._prepare(np.empty((0, FEATURE_SIZE), dtype=np.float32), np.empty(0, dtype=bool),
+                                     np.empty(0, dtype=object))
+        with self.lock:
+            self.generation += 1
+            self.removals = []
+            self.pending = []       # [(interleaved original/mirrored rows, label)]
+            self.pending_rows = 0
+            self._install(prepared)
+
+    def __len__(self):
+        # Number of live original (non-mirrored) samples
+        return (len(self.base) - self.dead + self.pending_rows) // 2
+
+    def _prepare(self, rows, mirrored_flags, labels):
+        # The expensive part of a new base (norms, KD-tree); runs without the lock
+        rows = np.ascontiguousarray(rows, dtype=np.float32)
+        tree = None
+        if len(rows) > self.brute_force_max:
+            # scipy's tree builds without holding the GIL, so the pipeline thread keeps running
+            # (sklearn's KDTree held it for the whole multi-second build). Imported lazily: slow import.
+            from scipy.spatial import cKDTree
+            tree = cKDTree(rows, leafsize=self.leaf_size)
+        return rows, np.einsum('ij,ij->i', rows, rows), mirrored_flags, labels, tree
+
+    def _install(self, prepared):
+        self.base, self.base_sq, self.base_mirrored, self.base_labels, self.tree = prepared
+        self.base_alive = np.ones(len(self.base), dtype=bool)
+        self.dead = 0
+        self.pending_block = None
+
+    def add(self, sample, label=None):
+        sample = np.asarray(sample, dtype=np.float32).reshape(FEATURE_SIZE)
+        rows = np.stack([sample, mirror_landmarks(sample)])
+        with self.lock:
+            self.pending.append((rows, label))
+            self.pending_rows += 2
+            self._maybe_rebuild()
+
+    def add_many(self, samples, label=None):
+        # Bulk ingest: same as add() per row, with one rebuild check at the end
+        X = np.asarray(samples, dtype=np.float32).reshape(-1, FEATURE_SIZE)
+        if not len(X):
+            return # An empty pending block would break the argmin in query()
+        interleaved = np.empty((2 * len(X), FEATURE_SIZE), dtype=np.float32)
+        interleaved[0::2] = X
+        interleaved[1::2] = mirror_landmarks(X)
+        with self.lock:
+            self.pending.append((interleaved, label))
+            self.pending_rows += len(interleaved)
+            self._maybe_rebuild()
+
+    def remove_label(self, label):
+        # Tombstones every row of a gesture; returns the number of samples removed
+        with self.lock:
+            removed = self._tombstone(label)
+            kept = [entry for entry in self.pending if entry[1] != label]
+            if len(kept) != len(self.pending):
+                removed += (self.pending_rows - sum(len(rows) for rows, _ in kept)) // 2
+                self.pending = kept
+                self.pending_rows = sum(len(rows) for rows, _ in kept)
+            if self.rebuilding:
+                self.removals.append(label)
+            self._maybe_rebuild()
+            return removed
+
+    def _tombstone(self, label):
+        hits = self.base_alive & (self.base_labels == label)
+        count = int(np.count_nonzero(hits))
+        if count:
+            self.base_alive[hits] = False
+            self.base_sq[hits] = np.inf # Brute-force distances to dead rows become inf
+            self.dead += count
+        return count // 2
+
+    def _maybe_rebuild(self):
+        self.pending_block = None
+        pending_full = self.pending_rows > max(self.brute_force_max // 8, self.rebuild_ratio * len(self.base))
+        # Dead rows cost nothing in the brute-force scan, but make tree queries search deeper
+        compact = self.dead > self.rebuild_ratio * len(self.base) or (self.dead and self.tree is not None)
+        if (pending_full or compact) and not self.rebuilding:
+            self.rebuilding = True
+            threading.Thread(target=self._rebuild, daemon=True, name="similarity-rebuild").start()
+
+    def _rebuild(self):
+        # Folds pending rows into the base and drops tombstones; built outside the lock
+        generation = None
+        try:
+            with self.lock:
+                # Base arrays are only ever replaced, never written, except the alive mask: copy that
+                generation = self.generation
+                taken = list(self.pending)
+                base, mirrored, base_labels = self.base, self.base_mirrored, self.base_labels
+                alive = self.base_alive.copy()
+                self.removals = []
+            rows = np.vstack([base[alive]] + [r for r, _ in taken])
+            flags = np.concatenate([mirrored[alive]] + [np.tile([False, True], len(r) // 2) for r, _ in taken])
+            labels = np.concatenate([base_labels[alive]] +
+                                    [np.full(len(r), label, dtype=object) for r, label in taken])
+            prepared = self._prepare(rows, flags, labels)
+            with self.lock:
+                if generation != self.generation:
+                    return # reset() replaced the library meanwhile
+                taken_ids = {id(entry) for entry in taken}
+                self.pending = [entry for entry in self.pending if id(entry) not in taken_ids]
+                self.pending_rows = sum(len(r) for r, _ in self.pending)
+                self._install(prepared)
+                for label in self.removals:
+                    self._tombstone(label)
+                self.removals = []
+        finally:
+            with self.lock:
+                self.rebuilding = False
+                # Work that piled up during the build (more adds, a deletion) starts the next one
+                if self.generation == generation:
+                    self._maybe_rebuild()
+
+    def wait_for_rebuild(self, timeout=10.0):
+        # For benchmarks: blocks until no background rebuild is in flight
+        deadline = time.perf_counter() + timeout
+        while self.rebuilding and time.perf_counter() < deadline:
+            time.sleep(0.005)
+        return not self.rebuilding
+
+    def _tree_query(self, queries):
+        # Nearest live row per query; tombstoned rows stay in the tree until the next rebuild
+        dist, idx = self.tree.query(queries, k=1)
+        if self.dead:
+            stale = np.flatnonzero(~self.base_alive[idx])
+            if len(stale):
+                # A few more neighbours usually reach a live row; capped so the cost doesn't grow
+                # with the number of tombstones while the compacting rebuild is in flight
+                d, i = self.tree.query(queries[stale], k=min(self.tombstone_k, len(self.base)))
+                live = self.base_alive[i]
+                first = np.argmax(live, axis=1)
+                rows = np.arange(len(stale))
+                found = live[rows, first]
+                dist[stale[found]] = d[rows, first][found]
+                idx[stale[found]] = i[rows, first][found]
+                missing = stale[~found]
+                if len(missing):
+                    # All of them tombstoned (e.g. right after deleting a large gesture): scan the
+                    # base instead, where dead rows have |r|^2 = inf
+                    q = queries[missing]
+                    dist[missing], idx[missing] = self._brute_min_batch(self.base, self.base_sq, q,
+                                                                        np.einsum('ij,ij->i', q, q))
+        return dist, idx
+
+    def _brute_min(self, rows, rows_sq, query, query_sq):
+        # |r - q|^2 = |r|^2 - 2 r.q + |q|^2 with |r|^2 precomputed
+        d2 = rows_sq - 2.0 * (rows @ query)
+        i = int(np.argmin(d2))
+        return float(max(d2[i] + query_sq, 0.0)) ** 0.5, i
+
+    def _brute_min_batch(self, rows, rows_sq, queries, queries_sq):
+        # Same for (n, 63) queries with one mat-mat product
+        d2 = rows_sq[:, None] - 2.0 * (rows @ queries.T)
+        idx = np.argmin(d2, axis=0)
+        best = d2[idx, np.arange(len(queries))] + queries_sq
+        return np.sqrt(np.maximum(best, 0.0)), idx
+
+    def _pending_block(self):
+        if self.pending_block is None:
+            block = np.vstack([rows for rows, _ in self.pending])
+            self.pending_block = (block, np.einsum('ij,ij->i', block, block))
+        return self.pending_block
+
+    def query(self, landmarks):
+        """Returns (min_distance, is_mirrored_match); (inf, False) when empty."""
+        query = np.asarray(landmarks, dtype=np.float32).reshape(FEATURE_SIZE)
+        query_sq = float(query @ query)
+        with self.lock:
+            best, best_mirrored = float('inf'), False
+
+            if self.tree is not None:
+                dist, idx = self._tree_query(query.reshape(1, -1))
+                best = float(dist[0])
+                best_mirrored = bool(self.base_mirrored[idx[0]])
+            elif len(self.base):
+                best, i = self._brute_min(self.base, self.base_sq, query, query_sq)
+                best_mirrored = bool(self.base_mirrored[i])
+
+            if self.pending:
+                block, block_sq = self._pending_block()
+                dist, i = self._brute_min(block, block_sq, query, query_sq)
+                if dist < best:
+                    # Pending rows alternate original / mirrored
+                    best, best_mirrored = dist, i % 2 == 1
+
+            return best, best_mirrored
+
+    def query_batch(self, queries):
+        """query() for (n, 63) rows (several hands) at once; returns (distances, is_mirrored) arrays."""
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, FEATURE_SIZE)
+        if len(queries) == 1:
+            # A single mat-vec beats the batched path for one hand
+            best, mirrored = self.query(queries[0])
+            return np.array([best]), np.array([mirrored])
+        queries_sq = np.einsum('ij,ij->i', queries, queries)
+        n = len(queries)
+        with self.lock:
+            best = np.full(n, np.inf)
+            best_mirrored = np.zeros(n, dtype=bool)
+
+            if self.tree is not None:
+                best, idx = self._tree_query(queries)
+                best_mirrored = self.base_mirrored[idx]
+            elif len(self.base):
+                best, idx = self._brute_min_batch(self.base, self.base_sq, queries, queries_sq)
+                best_mirrored = self.base_mirrored[idx]
+
+            if self.pending:
+                block, block_sq = self._pending_block()
+                dist, idx = self._brute_min_batch(block, block_sq, queries, queries_sq)
+                closer = dist < best
+                # Pending rows alternate original / mirrored
+                best = np.where(closer, dist, best)
+                best_mirrored = np.where(closer, idx % 2 == 1, best_mirrored)
+
+            return best, best_mirrored
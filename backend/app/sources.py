@@ -0,0 +1,164 @@
+import os
+import time
+import cv2
+import numpy as np
+
+from .camera import FrameSource, ThreadedCamera
+from .trace import read_trace
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+TRACE_EXTENSION = ".trace"
+
+
+class _PacedSource(FrameSource):
+    # File-backed sources have no natural frame clock; the capture thread paces them at `fps`
+    def __init__(self, fps=30, buffer_count=4, loop=True):
+        super().__init__(buffer_count, loop)
+        self.fps = fps
+        self.next_due = 0.0
+
+    def pace(self):
+        now = time.perf_counter()
+        if self.next_due > now:
+            time.sleep(self.next_due - now)
+        self.next_due = max(now, self.next_due) + 1.0 / self.fps
+
+    def media_time(self, index):
+        return index / self.fps
+
+
+class VideoFileSource(_PacedSource):
+    def __init__(self, path, fps=None, buffer_count=4, loop=True):
+        super().__init__(fps or 30, buffer_count, loop)
+        self.path = path
+        self.requested_fps = fps
+        self.cap = None
+
+    def describe(self):
+        return f"video {self.path}"
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            self.cap.release()
+            self.cap = None
+            return False
+        native_fps = self.cap.get(cv2.CAP_PROP_FPS)
+        if not self.requested_fps and native_fps and native_fps > 0:
+            self.fps = native_fps
+        return True
+
+    def grab(self, target):
+        grabbed, frame = self.cap.read() if target is None else self.cap.read(target)
+        if not grabbed:
+            self.exhausted = True
+        return grabbed, frame
+
+    def close(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class ImageDirectorySource(_PacedSource):
+    # Sorted still images from a directory, one per frame
+    def __init__(self, directory, fps=30, buffer_count=4, loop=True):
+        super().__init__(fps, buffer_count, loop)
+        self.directory = directory
+        self.paths = []
+        self.position = 0
+
+    def describe(self):
+        return f"images {self.directory}"
+
+    def open(self):
+        if not os.path.isdir(self.directory):
+            return False
+        self.paths = sorted(
+            os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.position = 0
+        return bool(self.paths)
+
+    def grab(self, target):
+        while self.position < len(self.paths):
+            frame = cv2.imread(self.paths[self.position])
+            self.position += 1
+            if frame is not None:
+                return True, frame
+            print(f"Skipping unreadable image {self.paths[self.position - 1]}")
+        self.exhausted = True
+        return False, None
+
+
+class LandmarkTraceSource(_PacedSource):
+    """Replays a recorded landmark trace (see trace.py) in place of camera + MediaPipe.
+
+    Frames are a blank canvas; the pipeline takes each frame's landmarks from
+    landmarks_for() instead of running the gesture engine. Playback follows
+    the recorded timestamps.
+    """
+
+    provides_landmarks = True
+
+    def __init__(self, path, canvas_size=(320, 240), buffer_count=4, loop=True):
+        super().__init__(30, buffer_count, loop)
+        self.path = path
+        self.trace = None
+        self.position = 0
+        self.started_at = 0.0
+        self.canvas = np.zeros((canvas_size[1], canvas_size[0], 3), dtype=np.uint8)
+        self.canvas.flags.writeable = False
+
+    def describe(self):
+        return f"trace {self.path}"
+
+    def open(self):
+        if not os.path.isfile(self.path):
+            return False
+        self.trace = read_trace(self.path)
+        self.position = 0
+        self.started_at = time.perf_counter()
+        return len(self.trace.timestamps) > 0
+
+    def pace(self):
+        # Sleep until the next record's recorded time
+        if self.trace is None or self.position >= len(self.trace.timestamps):
+            return
+        offset = float(self.trace.timestamps[self.position] - self.trace.timestamps[0])
+        delay = self.started_at + offset - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    def grab(self, target):
+        if self.position >= len(self.trace.timestamps):
+            self.exhausted = True
+            return False, None
+        self.position += 1
+        return True, self.canvas
+
+    def current_landmarks(self):
+        index = self.position - 1
+        if index < 0 or not self.trace.hand[index]:
+            return None
+        return self.trace.features[index]
+
+    def current_label(self):
+        return self.trace.labels[self.position - 1] if self.position else None
+
+    def media_time(self, index):
+        return float(self.trace.timestamps[index])
+
+
+def open_source(spec, loop=True):
+    """Builds a frame source from a spec string: a camera index ("0"), a video
+    file, a directory of images or a .trace landmark recording."""
+    spec = str(spec)
+    if spec.isdigit():
+        return ThreadedCamera(int(spec))
+    if spec.endswith(TRACE_EXTENSION):
+        return LandmarkTraceSource(spec, loop=loop)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, loop=loop)
+    return VideoFileSource(spec, loop=loop)
@@ -0,0 +1,138 @@
+import asyncio
+import threading
+from collections import namedtuple
+import cv2
+
+from .frames import FrameBuffers, draw_hands
+from .metrics import metrics
+
+# Output size and JPEG quality of one MJPEG rendition
+StreamProfile = namedtuple("StreamProfile", ["width", "height", "quality"])
+DEFAULT_PROFILE = StreamProfile(480, 360, 60)
+PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+
+
+class FramePublisher:
+    """Encode-once JPEG cache for /video_feed viewers.
+
+    Frames are encoded lazily by the first viewer that needs a given
+    (frame, profile) pair; every other viewer of that profile reuses the same
+    bytes. Nothing is resized, annotated or encoded when nobody is watching,
+    and viewers that asked for a lower FPS simply never request the frames
+    they skip. The cached bytes are the complete multipart part, so viewers
+    yield them without any per-viewer concatenation.
+
+    Viewers wait for new frames on the server's event loop: publish() (a
+    pipeline subscriber) wakes them through call_soon_threadsafe, so no
+    executor thread is parked per viewer. Only cache misses (the actual
+    encodes) run in a worker thread.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # All keyed by (stream, profile): frame seqs are per stream
+        self.viewers = {}        # key -> active viewer count
+        self.cache = {}          # key -> (frame seq, multipart part bytes)
+        self.profile_locks = {}  # key -> lock serializing its encodes
+        self.buffers = {}        # key -> FrameBuffers for its resize/draw canvas
+        self.loop = None
+        self.frame_events = {}   # stream -> asyncio.Event set on its next frame (event loop thread only)
+
+    def bind(self, loop):
+        # Called from the app lifespan with the server's event loop
+        self.loop = loop
+
+    def publish(self, result):
+        # Pipeline subscriber (pipeline thread): wakes that stream's waiting viewers, if any
+        if result.stream in self.frame_events and self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._wake, result.stream)
+
+    def _wake(self, stream):
+        event = self.frame_events.pop(stream, None)
+        if event is not None:
+            event.set()
+
+    async def next_frame(self, stream, timeout=1.0):
+        # Returns once the stream publishes its next frame (or after timeout)
+        event = self.frame_events.get(stream)
+        if event is None:
+            event = self.frame_events[stream] = asyncio.Event()
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    @property
+    def viewer_count(self):
+        with self.lock:
+            return sum(self.viewers.values())
+
+    def add_viewer(self, profile, stream=0):
+        key = (stream, profile)
+        with self.lock:
+            self.viewers[key] = self.viewers.get(key, 0) + 1
+            self.profile_locks.setdefault(key, threading.Lock())
+
+    def remove_viewer(self, profile, stream=0):
+        key = (stream, profile)
+        with self.lock:
+            remaining = self.viewers.get(key, 0) - 1
+            if remaining > 0:
+                self.viewers[key] = remaining
+            else:
+                # Last viewer of this rendition gone: drop its cached bytes too
+                self.viewers.pop(key, None)
+                self.cache.pop(key, None)
+                self.profile_locks.pop(key, None)
+                self.buffers.pop(key, None)
+
+    def cached_part(self, result, profile):
+        # The part if this frame is already encoded for the profile, else None; never blocks
+        cached = self.cache.get((result.stream, profile))
+        if cached is not None and cached[0] == result.seq:
+            metrics.inc("jpeg_cache_hits")
+            return cached[1]
+        return None
+
+    def get_part(self, result, profile):
+        # Multipart part (boundary + headers + JPEG) for one frame, encoded at most once per profile
+        key = (result.stream, profile)
+        with self.lock:
+            profile_lock = self.profile_locks.setdefault(key, threading.Lock())
+            buffers = self.buffers.setdefault(key, FrameBuffers())
+        with profile_lock:
+            cached = self.cache.get(key)
+            if cached is not None and cached[0] == result.seq:
+                metrics.inc("jpeg_cache_hits")
+                return cached[1]
+            with metrics.timer("encode"):
+                part = self.encode(result, profile, buffers)
+            if part is None:
+                return None # Frame already recycled by the camera: the viewer waits for the next one
+            metrics.inc("jpeg_encodes")
+            self.cache[key] = (result.seq, part)
+            return part
+
+    @staticmethod
+    def encode(result, profile, buffers=None):
+        # Resize (or copy) into the rendition's canvas, draw the overlays there, encode.
+        # result.frame is a view into the camera's ring: it is only read while its slot has not
+        # been recycled, checked before and after the copy so a torn frame is never encoded.
+        source = result.source
+        if source is not None and not source.is_current(result.seq):
+            metrics.inc("stale_frames_skipped")
+            return None
+        buffers = buffers or FrameBuffers()
+        canvas = buffers.canvas(result.frame, (profile.width, profile.height))
+        if source is not None and not source.is_current(result.seq):
+            metrics.inc("stale_frames_skipped")
+            return None
+        scale = profile.width / 480
+        if result.points:
+            # Same apparent line width as the old draw-at-320x240-then-upscale overlay
+            draw_hands(canvas, result.points, max(1, int(round(2 * profile.width / 320))))
+        cv2.putText(canvas, result.status_text, (int(10 * scale), int(25 * scale)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7 * scale, (0, 255, 0), max(1, int(round(2 * scale))))
+        ret, buffer = cv2.imencode('.jpg', canvas, [int(cv2.IMWRITE_JPEG_QUALITY), profile.quality])
+        # One copy from the encoder's array straight into the final part
+        return b"".join((PART_HEADER, buffer, b'\r\n')) if ret else None
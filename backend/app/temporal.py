@@ -0,0 +1,215 @@
+import itertools
+
+import numpy as np
+
+from .metrics import metrics
+
+# update() default: let the tracker call its own classifier
+_CLASSIFY = object()
+
+
+class GestureTracker:
+    """Temporal layer between the gesture engine and the action executor.
+
+    - Static skip: if the hand moved less than `still_threshold` (max per
+      coordinate, in normalized units) since the last classified frame, the
+      previous probability vector is reused and the MLP/index are not run.
+    - Smoothing: an EMA over the per-class probability vectors.
+    - Hysteresis + confirmation: a label becomes the confirmed gesture only
+      after its smoothed probability stays above enter_threshold for
+      confirm_frames consecutive updates, and is released once it drops
+      below exit_threshold. Single-frame flickers never reach the executor.
+    """
+
+    def __init__(self, classifier=None, alpha=0.5, enter_threshold=0.6, exit_threshold=0.4,
+                 confirm_frames=2, still_threshold=0.02):
+        self.classifier = classifier  # Callable: landmarks -> (classes, probs) or None (optional when batching)
+        self.alpha = alpha
+        self.enter_threshold = enter_threshold
+        self.exit_threshold = exit_threshold
+        self.confirm_frames = confirm_frames
+        self.still_threshold = still_threshold
+
+        self.classes = None
+        self.smoothed = None
+        self.last_landmarks = None
+        self.last_classified = None
+        self.candidate = None
+        self.candidate_frames = 0
+        self.confirmed = None
+        self.confidence = 0.0
+        self.stats = {"classified": 0, "reused": 0}
+
+    def reset(self):
+        # Hand lost: forget history so the next hand starts fresh
+        self.smoothed = None
+        self.last_landmarks = None
+        self.last_classified = None
+        self.candidate = None
+        self.candidate_frames = 0
+        self.confirmed = None
+        self.confidence = 0.0
+
+    def needs_classification(self, landmarks):
+        # False while the hand has not moved since the last accepted classification
+        if self.last_landmarks is None or self.last_classified is None:
+            return True
+        return np.max(np.abs(landmarks - self.last_landmarks)) >= self.still_threshold
+
+    def _record(self, landmarks, classified):
+        self.stats["classified"] += 1
+        metrics.inc("classifications_run")
+        self.last_landmarks = np.array(landmarks, dtype=np.float32)
+        self.last_classified = classified
+        return classified
+
+    def _classify(self, landmarks):
+        if not self.needs_classification(landmarks):
+            self.stats["reused"] += 1
+            metrics.inc("classifications_reused")
+            return self.last_classified
+        return self._record(landmarks, self.classifier(landmarks))
+
+    def update(self, landmarks, classified=_CLASSIFY):
+        """Feeds one freshly inferred hand; returns the confirmed label or None.
+        Callers that classify several hands in one batch pass `classified` in."""
+        if classified is _CLASSIFY:
+            classified = self._classify(landmarks)
+        else:
+            self._record(landmarks, classified)
+
+        if classified is None:
+            # Reality check failed / untrained: decay toward "no gesture"
+            if self.smoothed is not None:
+                self.smoothed *= (1 - self.alpha)
+        else:
+            classes, probs = classified
+            if self.classes is not classes or self.smoothed is None or len(self.smoothed) != len(probs):
+                # New model (retrained) or first frame: restart the average
+                self.classes = classes
+                self.smoothed = np.array(probs, dtype=np.float32)
+                self.candidate = None
+                self.candidate_frames = 0
+                self.confirmed = None
+            else:
+                self.smoothed += self.alpha * (probs - self.smoothed)
+
+        if self.smoothed is None or self.classes is None:
+            return None
+
+        best = int(np.argmax(self.smoothed))
+        best_prob = float(self.smoothed[best])
+        label = self.classes[best]
+
+        # Release the confirmed gesture once its own smoothed probability falls off
+        if self.confirmed is not None:
+            confirmed_idx = self._index_of(self.confirmed)
+            if confirmed_idx is None or self.smoothed[confirmed_idx] < self.exit_threshold:
+                self.confirmed = None
+
+        if best_prob >= self.enter_threshold and label != self.confirmed:
+            if label == self.candidate:
+                self.candidate_frames += 1
+            else:
+                self.candidate, self.candidate_frames = label, 1
+            if self.candidate_frames >= self.confirm_frames:
+                self.confirmed = label
+                self.candidate, self.candidate_frames = None, 0
+        elif label != self.candidate:
+            self.candidate, self.candidate_frames = None, 0
+
+        if self.confirmed is not None:
+            self.confidence = float(self.smoothed[self._index_of(self.confirmed)])
+        else:
+            self.confidence = best_prob
+        return self.confirmed
+
+    def _index_of(self, label):
+        hits = np.flatnonzero(self.classes == label)
+        return int(hits[0]) if len(hits) else None
+
+
+class HandTrackers:
+    """One GestureTracker per hand tag ("0", "1", ...), classified together.
+
+    Hands whose landmarks changed are sent to `classify_batch` in a single call;
+    static hands reuse their last result. Trackers of hands that left the frame
+    are dropped so a returning hand starts fresh.
+
+    Tags come from assign(), not from MediaPipe's Left/Right label: that label
+    flips on a held hand now and then, which would restart its smoothing and
+    the executor's one-shot/cooldown state for the hand.
+    """
+
+    def __init__(self, classify_batch, match_distance=0.25, label_penalty=0.05, **tracker_options):
+        self.classify_batch = classify_batch  # Callable: [landmarks, ...] -> [(classes, probs) | None, ...]
+        self.match_distance = match_distance  # Max image-space move (normalized) to still be the same hand
+        self.label_penalty = label_penalty    # Added when the handedness label differs: a tie-breaker only
+        self.tracker_options = tracker_options
+        self.trackers = {}
+        self.positions = {}  # tag -> (image position, handedness label) on the last assigned frame
+        self.stats = {"classified": 0, "reused": 0}
+
+    def assign(self, positions, labels=None):
+        """Stable tags for this frame's hands, in input order. positions: (x, y) per
+        hand in normalized image coordinates (None if unknown); labels: MediaPipe
+        handedness per hand. Each hand takes the tag of the nearest hand of the
+        previous frame, closest pairs first; the rest get the lowest free number.
+        A lone hand always continues a lone hand, so one tracked hand keeps tag "0"."""
+        labels = labels or [None] * len(positions)
+        previous = self.positions
+        lone = len(positions) == 1 and len(previous) == 1
+        pairs = sorted((self._cost(position, label, *previous[tag]), i, tag)
+                       for i, (position, label) in enumerate(zip(positions, labels)) for tag in previous)
+        tags = [None] * len(positions)
+        for cost, i, tag in pairs:
+            if tags[i] is None and tag not in tags and (cost <= self.match_distance or lone):
+                tags[i] = tag
+        free = (str(n) for n in itertools.count() if str(n) not in tags)
+        tags = [tag if tag is not None else next(free) for tag in tags]
+        self.positions = {tag: (position, label) for tag, position, label in zip(tags, positions, labels)}
+        return tags
+
+    def _cost(self, position, label, last_position, last_label):
+        if position is None or last_position is None:
+            return float("inf")
+        cost = float(np.hypot(position[0] - last_position[0], position[1] - last_position[1]))
+        return cost + (self.label_penalty if label != last_label else 0.0)
+
+    def update(self, hands):
+        """hands: [(tag, landmarks), ...]; returns {tag: confirmed label or None}."""
+        for tag in list(self.trackers):
+            if all(tag != t for t, _ in hands):
+                del self.trackers[tag]
+
+        pending = []
+        for tag, landmarks in hands:
+            tracker = self.trackers.get(tag)
+            if tracker is None:
+                tracker = self.trackers[tag] = GestureTracker(**self.tracker_options)
+            if tracker.needs_classification(landmarks):
+                pending.append((tag, landmarks))
+
+        classified = dict(zip((tag for tag, _ in pending),
+                              self.classify_batch([landmarks for _, landmarks in pending]) if pending else []))
+        self.stats["classified"] += len(pending)
+        self.stats["reused"] += len(hands) - len(pending)
+
+        predictions = {}
+        for tag, landmarks in hands:
+            if tag in classified:
+                predictions[tag] = self.trackers[tag].update(landmarks, classified[tag])
+            else:
+                predictions[tag] = self.trackers[tag].update(landmarks)
+        return predictions
+
+    def confirmed(self):
+        return {tag: tracker.confirmed for tag, tracker in self.trackers.items()}
+
+    def confidence(self, tag):
+        tracker = self.trackers.get(tag)
+        return tracker.confidence if tracker is not None else 0.0
+
+    def reset(self):
+        self.trackers.clear()
+        self.positions.clear()
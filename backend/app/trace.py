@@ -0,0 +1,104 @@
+import json
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+from .features import FEATURE_SIZE
+
+# Landmark trace file layout (little endian):
+#   header   b"AGTR" | u16 version | u16 feature size
+#   records  RECORD_DTYPE * N, written as frames arrive
+#   trailer  JSON {"labels": [...]} | u32 JSON length | b"AGTE"
+# Records are fixed size, so a trace can be memory-mapped and sliced without
+# parsing; label strings are interned into the trailer table.
+TRACE_MAGIC = b"AGTR"
+TRACE_END = b"AGTE"
+TRACE_VERSION = 1
+HEADER = struct.Struct("<4sHH")
+TRAILER = struct.Struct("<I4s")
+
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),            # Seconds since the start of the trace
+    ("label", "<i2"),                # Index into the label table, -1 = unlabeled
+    ("hand", "u1"),                  # 0 = no hand in this frame
+    ("features", "<f4", (FEATURE_SIZE,)),
+], align=False)
+
+Trace = namedtuple("Trace", ["timestamps", "features", "hand", "labels"])
+
+
+class TraceWriter:
+    # Streams records to disk; the label table is written by close()
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION, FEATURE_SIZE))
+        self.labels = []
+        self.label_codes = {}
+        self.record = np.zeros(1, dtype=RECORD_DTYPE)
+        self.count = 0
+
+    def write(self, timestamp, landmarks, label=None):
+        record = self.record[0]
+        record["timestamp"] = timestamp
+        record["label"] = self._code_for(label)
+        if landmarks is None:
+            record["hand"] = 0
+            record["features"] = 0
+        else:
+            record["hand"] = 1
+            record["features"] = landmarks
+        self.file.write(self.record.tobytes())
+        self.count += 1
+
+    def _code_for(self, label):
+        if label is None:
+            return -1
+        code = self.label_codes.get(label)
+        if code is None:
+            code = self.label_codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def close(self):
+        if self.file.closed:
+            return
+        table = json.dumps({"labels": self.labels}).encode("utf-8")
+        self.file.write(table)
+        self.file.write(TRAILER.pack(len(table), TRACE_END))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def read_trace(path):
+    """Returns a Trace with (N,) timestamps, (N, 63) float32 features (memory-mapped),
+    (N,) bool hand mask and a per-record list of labels (None = unlabeled)."""
+    with open(path, "rb") as f:
+        magic, version, feature_size = HEADER.unpack(f.read(HEADER.size))
+        if magic != TRACE_MAGIC:
+            raise ValueError(f"{path} is not a landmark trace")
+        if version != TRACE_VERSION or feature_size != FEATURE_SIZE:
+            raise ValueError(f"Unsupported trace version {version} / feature size {feature_size}")
+        f.seek(-TRAILER.size, 2)
+        trailer_pos = f.tell()
+        table_len, end = TRAILER.unpack(f.read(TRAILER.size))
+        if end != TRACE_END:
+            raise ValueError(f"{path} is truncated (writer was not closed)")
+        f.seek(trailer_pos - table_len)
+        table = json.loads(f.read(table_len).decode("utf-8"))
+
+    count = (trailer_pos - table_len - HEADER.size) // RECORD_DTYPE.itemsize
+    if count:
+        records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(count,))
+    else:
+        records = np.zeros(0, dtype=RECORD_DTYPE)
+    names = table["labels"]
+    labels = [names[code] if code >= 0 else None for code in records["label"].tolist()]
+    return Trace(records["timestamp"], records["features"], records["hand"].astype(bool), labels)
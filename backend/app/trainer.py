@@ -1,164 +1,478 @@
-from sklearn.neural_network import MLPClassifier
+from concurrent.futures import ThreadPoolExecutor
+import copy
 import pickle
+import threading
+import time
+import hashlib
 import numpy as np
 import os
+from .features import MIRROR_SIGN
+from .augmentation import AugmentationPipeline, DEFAULT_AUGMENTATIONS
+from .similarity import SimilarityIndex
+from .inference import make_forward
+from .sample_store import SampleStore
+from .metrics import metrics
+
+# Bump when the on-disk layout changes or when the training-time augmentation changes;
+# a saved model is only reused when both match what this code would produce.
+MODEL_FORMAT_VERSION = 3 # 3: samples moved out of the pickle into SampleStore
+AUGMENTATION_VERSION = 1 # 1: X-axis mirroring (DEFAULT_AUGMENTATIONS)
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(__file__), "..", "models", "gesture_model.pkl")
+
+# Incremental training: fine-tune the live network on the new samples plus a replayed
+# slice of the old ones instead of refitting everything
+REPLAY_RATIO = 2        # Old samples replayed per new sample
+REPLAY_PER_CLASS = 20   # ...but at least this many per class, so no gesture is forgotten
+VALIDATION_FRACTION = 0.1
+MAX_EPOCHS = 200
+PATIENCE = 5            # Epochs without validation-loss improvement before stopping
+TOLERANCE = 1e-3        # ...by at least this much
+FULL_REFIT_EVERY = 10   # Incremental updates in a row before a full refit resets any drift
+
+def dataset_hash(gestures, labels):
+    # Stable fingerprint of the exact samples/labels a model was fitted on
+    h = hashlib.sha256()
+    if len(gestures):
+        h.update(np.ascontiguousarray(np.asarray(gestures, dtype=np.float32)).tobytes())
+    h.update("\x00".join(labels).encode("utf-8"))
+    return h.hexdigest()
+
+def default_model():
+    # sklearn takes ~1 s to import, so it is only loaded once a model is fitted or unpickled
+    from sklearn.neural_network import MLPClassifier
+    # Simplified MLP for better stability on small datasets
+    return MLPClassifier(
+        hidden_layer_sizes=(64, 32),
+        activation='relu',
+        solver='adam',
+        max_iter=2000, # Increased iterations for better convergence
+        random_state=42,
+        learning_rate_init=0.001
+    )
 
 class ModelTrainer:
-    def __init__(self, model_path=os.path.join(os.path.dirname(__file__), "..", "models", "gesture_model.pkl")):
+    def __init__(self, model_path=DEFAULT_MODEL_PATH, sample_dir=None, load=True):
         self.model_path = model_path
-        # Simplified MLP for better stability on small datasets
-        self.model = MLPClassifier(
-            hidden_layer_sizes=(64, 32),
-            activation='relu',
-            solver='adam',
-            max_iter=2000, # Increased iterations for better convergence
-            random_state=42,
-            learning_rate_init=0.001
-        )
-        self.gestures = [] # List of landmark arrays
-        self.labels = []   # List of string labels
-        self.X_train_cache = None # Cached numpy array for fast similarity checks
+        # Versioned starter library (legacy pickle with samples) used while model_path doesn't exist yet;
+        # the migrated store and retrained model are local state, saved to model_path
+        self.seed_path = os.path.splitext(model_path)[0] + ".seed.pkl"
+        self.model = None # Fitted model, or the estimator to clone for fits (default_model() when None)
+        # Data Augmentation: every sample also trains as its augmented views (mirrored hand),
+        # cached in the sample store and only computed for newly recorded samples
+        self.augmentation = AugmentationPipeline(DEFAULT_AUGMENTATIONS)
+        # Recorded samples: memory-mapped float32 matrix + label codes next to the model file
+        self.store = SampleStore(sample_dir or os.path.splitext(model_path)[0] + "_samples",
+                                 augmenter=self.augmentation)
+        self.index = SimilarityIndex() # Nearest-sample index (incl. mirrors) for the reality check
+        self.forward = None # Lean float32 forward pass built from the fitted model
+        self.predict_batch = np.empty((2, 63), dtype=np.float32) # Rows 0..n-1: hands, n..2n-1: their mirrors
+        self.predict_lock = threading.Lock() # Streams share predict_batch and the forward buffers
         self.is_trained = False
-        self.load_model()
+        self.trained_hash = None # dataset_hash of the samples the current model was fitted on
+        self.trained_rows = 0 # How many store rows that was (new recordings are appended after them)
+        self.incremental = True # Warm-start from the live model when possible
+        self.incremental_updates = 0
+        self.last_fit_mode = None # "full" / "incremental" / "selected", for status and benchmarks
+        self.latency_budget = 0.001 # Seconds per frame a model may take to be promoted by select_model
+        self.selection = None # Report of the last model selection run
+
+        # Background training: one worker, fits on a snapshot, swaps the model atomically
+        self.train_lock = threading.Lock()
+        self.train_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="trainer")
+        self.train_future = None
+        self.train_requested = False
+        self.last_fit_rate = None # Seconds per sample of the last fit, for progress estimates
+        self.status_listeners = [] # Callbacks run (on the trainer thread) after each status change
+        self.training_status = {
+            "state": "idle", "samples": 0, "started_at": None, "completed_at": None,
+            "duration": None, "error": None, "version": 0, "mode": None
+        }
+        # load=False: the owner calls load_model() later, e.g. from a background warmup
+        self.loaded = False
+        if load:
+            self.load_model()
 
     def add_sample(self, landmarks, label_name):
-        self.gestures.append(landmarks)
-        self.labels.append(label_name)
+        sample = np.asarray(landmarks, dtype=np.float32)
+        self.store.append(sample, label_name)
+        self.index.add(sample, label_name)
+
+    def add_samples(self, samples, label_name):
+        # Bulk ingest: one store write and one index update for the whole batch
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1, 63)
+        if not len(samples):
+            return 0
+        self.store.append_many(samples, label_name)
+        self.store.flush()
+        self.index.add_many(samples, label_name)
+        return len(samples)
 
     def remove_gesture(self, label_name):
-        # Remove all samples associated with this label
-        new_gestures = []
-        new_labels = []
-        for g, l in zip(self.gestures, self.labels):
-            if l != label_name:
-                new_gestures.append(g)
-                new_labels.append(l)
-        self.gestures = new_gestures
-        self.labels = new_labels
-        # Retrain if possible, otherwise mark as untrained
-        if self.gestures:
-            self.train()
+        # Remove all samples associated with this label (tombstoned in the store)
+        self.store.remove_label(label_name)
+        # Tombstoned in the index too; its background rebuild drops the rows later
+        self.index.remove_label(label_name)
+        # Retrain in the background if possible, otherwise mark as untrained
+        if len(self.store):
+            self.train_async()
         else:
             self.is_trained = False
+            self.forward = None
             self.save_model()
 
     def get_gestures(self):
-        return sorted(list(set(self.labels)))
+        return sorted(self.store.get_labels())
+
+    def _snapshot(self):
+        return self.store.snapshot()
+
+    def _fit(self, gestures, labels, views=None):
+        # Originals + every augmented view (e.g. the mirrored hand), labels duplicated to match.
+        # views come cached from the store; only ad-hoc callers get them computed here.
+        if views is None:
+            views = self.augmentation.apply(gestures)
+        X, y = AugmentationPipeline.expand(gestures, views, labels)
+
+        # Fit a fresh estimator so the live one keeps serving predictions meanwhile
+        from sklearn.base import clone
+        model = clone(self.model) if self.model is not None else default_model()
+        model.fit(X, y)
+        return model, dataset_hash(gestures, labels), len(gestures), "full"
+
+    def _fit_incremental(self, gestures, labels, views=None):
+        """Warm-starts a copy of the live model on the samples added since it was
+        fitted, replaying a random slice of the old ones. New gestures get fresh
+        output units, deleted ones lose theirs. Returns None when a full fit is
+        needed instead."""
+        old = self.model
+        if not self.is_trained or not hasattr(old, "coefs_") or self.incremental_updates >= FULL_REFIT_EVERY:
+            return None
+        classes = np.unique(labels)
+        # sklearn's binary layout is a single logistic output; only softmax outputs can be remapped
+        if len(old.classes_) < 3 or len(classes) < 3:
+            return None
+
+        k = self.trained_rows
+        if 0 < k <= len(gestures) and dataset_hash(gestures[:k], labels[:k]) == self.trained_hash:
+            new = np.arange(k, len(gestures)) # Only appends since the last fit
+        else:
+            # Deletions: the only unseen samples are those of gestures the model doesn't know
+            new = np.flatnonzero(~np.isin(labels, old.classes_))
+        if len(new) * 2 > len(gestures):
+            return None # Mostly new data: a fresh fit costs about the same
+
+        # Output layer: keep the units of known gestures, add small random ones for new gestures
+        model = copy.deepcopy(old)
+        rng = np.random.default_rng(len(gestures))
+        W, b = old.coefs_[-1], old.intercepts_[-1]
+        columns = {c: i for i, c in enumerate(old.classes_)}
+        bound = np.sqrt(6.0 / (W.shape[0] + len(classes)))
+        new_W = rng.uniform(-bound, bound, (W.shape[0], len(classes))).astype(W.dtype)
+        new_b = np.zeros(len(classes), dtype=b.dtype)
+        for j, c in enumerate(classes):
+            if c in columns:
+                new_W[:, j] = W[:, columns[c]]
+                new_b[j] = b[columns[c]]
+        model.coefs_[-1], model.intercepts_[-1] = new_W, new_b
+        model.classes_ = classes
+        from sklearn.preprocessing import LabelBinarizer
+        model._label_binarizer = LabelBinarizer().fit(classes)
+        model.n_outputs_ = len(classes)
+        if hasattr(model, "_optimizer"):
+            del model._optimizer # Adam moments are shaped like the old output layer
+
+        # Fine-tune set: every new sample + replayed old ones, with a held-out split for early stopping
+        old_rows = np.setdiff1d(np.arange(len(gestures)), new)
+        n_replay = min(len(old_rows), max(REPLAY_RATIO * len(new), REPLAY_PER_CLASS * len(classes)))
+        rows = rng.permutation(np.concatenate([new, rng.choice(old_rows, n_replay, replace=False)]))
+        n_val = max(int(len(rows) * VALIDATION_FRACTION), 1)
+        X_val, y_val = gestures[rows[:n_val]], labels[rows[:n_val]]
+        fit_rows = rows[n_val:]
+        fit_views = self.augmentation.apply(gestures[fit_rows]) if views is None else views[fit_rows]
+        X_fit, y_fit = AugmentationPipeline.expand(gestures[fit_rows], fit_views, labels[fit_rows])
+        val_codes = np.searchsorted(classes, y_val)
+
+        best_loss, best, stale = np.inf, None, 0
+        for _ in range(MAX_EPOCHS):
+            model.partial_fit(X_fit, y_fit) # One shuffled pass of mini-batches
+            probs = model.predict_proba(X_val)
+            loss = -np.mean(np.log(np.maximum(probs[np.arange(n_val), val_codes], 1e-12)))
+            if loss < best_loss - TOLERANCE:
+                best_loss, stale = loss, 0
+                best = ([c.copy() for c in model.coefs_], [i.copy() for i in model.intercepts_])
+            else:
+                stale += 1
+                if stale >= PATIENCE:
+                    break
+        model.coefs_, model.intercepts_ = best
+        return model, dataset_hash(gestures, labels), len(gestures), "incremental"
+
+    def _fit_model(self, gestures, labels, views=None, full=False):
+        if self.incremental and not full:
+            fitted = self._fit_incremental(gestures, labels, views)
+            if fitted is not None:
+                return fitted
+        return self._fit(gestures, labels, views)
 
-    def train(self):
-        if not self.gestures:
+    def _swap(self, model, data_hash, rows=0, mode="full"):
+        # Single attribute assignment: predict() sees either the old or the new model, never a mix
+        self.model = model
+        self.forward = make_forward(model)
+        self.trained_hash = data_hash
+        self.trained_rows = rows
+        self.incremental_updates = self.incremental_updates + 1 if mode == "incremental" else 0
+        self.last_fit_mode = mode
+        self.is_trained = True
+
+    def train(self, full=False):
+        gestures, labels, views = self.store.training_snapshot()
+        if not len(gestures):
             self.is_trained = False
             return False
-        
-        # Data Augmentation: Mirroring
-        # For every gesture, create a mirrored version (flip X axis)
-        # X is at index 0, 3, 6, ..., 60 in the 63-element landmark array
-        X_orig = np.array(self.gestures)
-        X_mirrored = X_orig.copy()
-        for i in range(0, 63, 3):
-            X_mirrored[:, i] *= -1
-            
-        X = np.vstack([X_orig, X_mirrored])
-        y = np.hstack([self.labels, self.labels]) # Duplicate labels for mirrored samples
-        
-        self.model.fit(X, y)
-        self.X_train_cache = X_orig # Cache original gestures as numpy array
-        self.is_trained = True
+
+        self._swap(*self._fit_model(gestures, labels, views, full))
         self.save_model()
         return True
 
+    def train_async(self):
+        """Schedules a background retrain on a snapshot of the current samples.
+
+        Returns a concurrent.futures.Future resolving to True/False, or None if
+        there is no data. Requests arriving while a fit is running are coalesced
+        into a single follow-up run on the newest data.
+        """
+        with self.train_lock:
+            if not len(self.store):
+                return None
+            if self.train_future is not None and not self.train_future.done():
+                # A queued job has not taken its snapshot yet and will see the new data anyway
+                if self.training_status["state"] != "queued":
+                    self.train_requested = True
+                return self.train_future
+            self.train_requested = False
+            self.training_status.update(state="queued", error=None)
+            self.train_future = self.train_executor.submit(self._train_job)
+            return self.train_future
+
+    def _train_job(self):
+        while True:
+            gestures, labels, views = self.store.training_snapshot()
+            if not len(gestures):
+                self._set_status(state="idle")
+                return False
+
+            start = time.perf_counter()
+            self._set_status(state="training", samples=len(gestures), started_at=time.time())
+            try:
+                self._swap(*self._fit_model(gestures, labels, views))
+                self.save_model()
+            except Exception as e:
+                print(f"Training error: {e}")
+                self._set_status(state="failed", error=str(e), duration=time.perf_counter() - start)
+                return False
+
+            duration = time.perf_counter() - start
+            # Progress estimates come from full fits; warm starts finish well inside them
+            if self.last_fit_mode == "full":
+                self.last_fit_rate = duration / len(gestures)
+            self._set_status(state="idle", duration=duration, completed_at=time.time(),
+                             version=self.training_status["version"] + 1, mode=self.last_fit_mode)
+            print(f"Background training finished ({self.last_fit_mode}): {len(gestures)} samples in {duration:.2f}s")
+
+            with self.train_lock:
+                if not self.train_requested:
+                    return True
+                self.train_requested = False
+
+    def select_model_async(self, latency_budget=None, folds=5):
+        """Cross-validates the candidate models on the current samples and promotes
+        the best one under the latency budget (see model_selection). Runs on the
+        training worker; returns a Future resolving to the report, or None if
+        there is no data."""
+        if not len(self.store):
+            return None
+        budget = self.latency_budget if latency_budget is None else latency_budget
+        return self.train_executor.submit(self._select_job, budget, folds)
+
+    def _select_job(self, latency_budget, folds):
+        from .model_selection import select_model
+        gestures, labels, views = self.store.training_snapshot()
+        start = time.perf_counter()
+        self._set_status(state="selecting", samples=len(gestures), started_at=time.time(), error=None)
+        try:
+            model, report = select_model(gestures, labels, views, latency_budget, folds)
+        except Exception as e:
+            print(f"Model selection error: {e}")
+            self._set_status(state="failed", error=str(e), duration=time.perf_counter() - start)
+            raise
+        # The winner also becomes the template for later retrains (clone keeps its type/params)
+        self._swap(model, dataset_hash(gestures, labels), len(gestures), "selected")
+        self.selection = report
+        self.save_model()
+        duration = time.perf_counter() - start
+        self._set_status(state="idle", duration=duration, completed_at=time.time(),
+                         version=self.training_status["version"] + 1, mode="selected")
+        print(f"Model selection: {report['selected']} promoted ({len(report['candidates'])} candidates, "
+              f"{report['folds']}-fold CV, {duration:.1f}s)")
+        return report
+
+    def _set_status(self, **changes):
+        with self.train_lock:
+            self.training_status.update(changes)
+        for listener in list(self.status_listeners):
+            try:
+                listener()
+            except Exception as e:
+                print(f"Training status listener error: {e}")
+
+    def get_training_status(self):
+        with self.train_lock:
+            status = dict(self.training_status)
+        status["is_trained"] = self.is_trained
+        # Fits scale roughly linearly with sample count: estimate progress from the last run
+        if status["state"] == "training" and self.last_fit_rate:
+            elapsed = time.time() - status["started_at"]
+            expected = self.last_fit_rate * status["samples"]
+            status["progress"] = min(0.99, elapsed / expected) if expected > 0 else 0.0
+        elif status["state"] == "idle" and status["version"] > 0:
+            status["progress"] = 1.0
+        else:
+            status["progress"] = 0.0
+        return status
+
     def save_model(self):
+        # Samples persist through the store; the pickle only holds the model + metadata
+        self.store.flush()
         with open(self.model_path, 'wb') as f:
             pickle.dump({
                 'model': self.model if self.is_trained else None, 
-                'labels': self.labels, 
-                'gestures': self.gestures,
-                'is_trained': self.is_trained
+                'is_trained': self.is_trained,
+                'format_version': MODEL_FORMAT_VERSION,
+                'augmentation_version': AUGMENTATION_VERSION,
+                'data_hash': self.trained_hash if self.is_trained else None,
+                'trained_rows': self.trained_rows if self.is_trained else 0,
+                'selection': self.selection
             }, f)
 
     def load_model(self):
-        if os.path.exists(self.model_path):
+        try:
+            return self._load_model()
+        finally:
+            self.loaded = True
+
+    def _load_model(self):
+        self.index.reset(*self._snapshot())
+        path = self.model_path if os.path.exists(self.model_path) else self.seed_path
+        if os.path.exists(path):
             try:
-                with open(self.model_path, 'rb') as f:
+                with open(path, 'rb') as f:
                     data = pickle.load(f)
-                    self.gestures = data.get('gestures', [])
-                    self.labels = data.get('labels', [])
+                    # Legacy pickles carried the samples as Python lists: migrate them once
+                    if data.get('gestures') and not len(self.store):
+                        self.store.append_many(data['gestures'], data['labels'])
+                        self.store.flush()
+                        print(f"Migrated {len(self.store)} samples into the sample store")
+                        self.index.reset(*self._snapshot())
+                    gestures, labels = self._snapshot()
                     self.is_trained = data.get('is_trained', False)
                     if self.is_trained and data.get('model'):
                         self.model = data['model']
-                        self.X_train_cache = np.array(self.gestures) if self.gestures else None
-                        # FORCE re-training to ensure data augmentation is applied to old models
-                        if self.gestures:
-                            print("Auto-retraining on load to apply hand-agnostic augmentation...")
-                            self.train()
+                        self.forward = make_forward(self.model)
+                        self.trained_hash = data.get('data_hash')
+                        self.trained_rows = data.get('trained_rows', 0)
+                        self.selection = data.get('selection')
+                        # Reuse the fitted model only if it was trained by the current
+                        # augmentation pipeline on exactly the stored samples
+                        up_to_date = (
+                            data.get('format_version') == MODEL_FORMAT_VERSION
+                            and data.get('augmentation_version') == AUGMENTATION_VERSION
+                            and self.trained_hash == dataset_hash(gestures, labels)
+                        )
+                        if len(gestures) and not up_to_date:
+                            print("Saved model is outdated (format/augmentation/data changed), retraining...")
+                            # Only new samples can be fine-tuned in; a changed pipeline needs a full fit
+                            self.train(full=data.get('format_version') != MODEL_FORMAT_VERSION
+                                       or data.get('augmentation_version') != AUGMENTATION_VERSION)
                 return True
             except Exception as e:
                 print(f"Error loading model: {e}")
                 return False
         return False
 
-    def predict(self, landmarks):
-        if not self.is_trained or not self.gestures:
-            return None
-        
-        unique_labels = list(set(self.labels))
-        if len(unique_labels) < 1:
-            return None
+    def warmup(self):
+        # Classifies one stored sample (index query + forward pass) so the first real
+        # frame doesn't pay first-call costs such as BLAS thread start-up
+        X, _ = self._snapshot()
+        if not self.is_trained or not len(X):
+            return False
+        return self.classify_batch([X[0]])[0] is not None
 
-        try:
-            # 1. Similarity Check (Reality Check)
-            # Find the distance to the closest training sample.
-            # Use cached X_train if available to avoid conversion overhead
-            if self.X_train_cache is not None:
-                X_train = self.X_train_cache
-            else:
-                X_train = np.array(self.gestures)
-                self.X_train_cache = X_train
-            
-            # Mirrored input
-            mirrored_landmarks = np.array(landmarks).copy()
-            for i in range(0, 63, 3):
-                mirrored_landmarks[i] *= -1
-            
-            dist_orig = np.linalg.norm(X_train - landmarks, axis=1)
-            dist_mirrored = np.linalg.norm(X_train - mirrored_landmarks, axis=1)
-            
-            min_dist = min(np.min(dist_orig), np.min(dist_mirrored))
-            is_mirrored_match = np.min(dist_mirrored) < np.min(dist_orig)
-            
-            # LOOSE threshold for better hand invariance. 1.5 is very generous.
-            if min_dist > 1.5:
-                return None
+    def classify(self, landmarks):
+        """Returns (classes, probs) for one hand, or None when untrained or when
+        the reality check rejects it. probs is a fresh float32 vector aligned
+        with classes, taken from whichever of original / mirrored input the
+        network is more confident about."""
+        return self.classify_batch([landmarks])[0]
 
-            # 2. DNN Prediction
-            # Predict for both original and mirrored and take the best confidence
-            probs_orig = self.model.predict_proba([landmarks])[0]
-            probs_mirrored = self.model.predict_proba([mirrored_landmarks])[0]
-            
-            # Predict with both original and mirrored inputs
-            pred_idx_orig = np.argmax(probs_orig)
-            pred_idx_mirrored = np.argmax(probs_mirrored)
-            
-            # We favor the one with higher confidence
-            if np.max(probs_orig) >= np.max(probs_mirrored):
-                probs = probs_orig
-                final_pred = self.model.classes_[pred_idx_orig]
-            else:
-                probs = probs_mirrored
-                final_pred = self.model.classes_[pred_idx_mirrored]
+    def classify_batch(self, hands):
+        # classify() for every detected hand with one MLP call over all hands + mirrors
+        n = len(hands)
+        if not n or not self.is_trained or len(self.index) == 0:
+            return [None] * n
 
-            max_prob = np.max(probs)
-            
-            # Enhanced logging
-            if max_prob > 0.4:
-                match_type = "MIRRORED" if is_mirrored_match else "ORIGINAL"
-                print(f"Prediction: {final_pred} | Match: {match_type} | Conf: {max_prob:.2f} | Sim: {min_dist:.2f}")
+        try:
+            with self.predict_lock:
+                if len(self.predict_batch) < 2 * n:
+                    self.predict_batch = np.empty((2 * n, 63), dtype=np.float32)
+                batch = self.predict_batch[:2 * n]
+                for i, landmarks in enumerate(hands):
+                    batch[i] = landmarks
+                np.multiply(batch[:n], MIRROR_SIGN, out=batch[n:])
 
-            # Confidence threshold: 0.5 is the minimum for a binary choice, safe for Multi-class
-            if max_prob < 0.5:
-                return None
-                
-            return final_pred
+                # 1. Similarity Check (Reality Check)
+                # Distance to the closest training sample; the index also holds the
+                # mirrored samples, so one query covers both hands.
+                min_dist, is_mirrored_match = self.index.query_batch(batch[:n])
+                metrics.set_gauge("prediction_similarity", float(min_dist[0]))
+                metrics.set_gauge("prediction_mirrored", int(is_mirrored_match[0]))
+                # LOOSE threshold for better hand invariance. 1.5 is very generous.
+                accepted = min_dist <= 1.5
+                if not accepted.any():
+                    return [None] * n
+
+                # 2. DNN Prediction
+                # Predict for all originals and mirrors in one batch and take the best confidence per hand
+                forward = self.forward
+                probs_all = forward.predict_proba(batch)
+                n_classes = len(forward.classes_)
+                results = []
+                for i in range(n):
+                    if not accepted[i]:
+                        results.append(None)
+                        continue
+                    probs_orig, probs_mirrored = probs_all[i], probs_all[n + i]
+                    # We favor the one with higher confidence
+                    probs = probs_orig if probs_orig.max() >= probs_mirrored.max() else probs_mirrored
+                    # Single-class models report sklearn's two-column binary layout: keep the known class
+                    results.append((forward.classes_, probs[:n_classes].copy()))
+                return results
         except Exception as e:
             print(f"Prediction error: {e}")
+            return [None] * n
+
+    def predict(self, landmarks):
+        classified = self.classify(landmarks)
+        if classified is None:
             return None
+        classes, probs = classified
+        best = int(np.argmax(probs))
+        max_prob = float(probs[best])
+        
+        # Exposed through /metrics instead of a per-frame print
+        metrics.set_gauge("prediction_confidence", max_prob)
+
+        # Confidence threshold: 0.5 is the minimum for a binary choice, safe for Multi-class
+        if max_prob < 0.5:
+            return None
+            
+        return classes[best]
@@ -0,0 +1,89 @@
+"""Custom command latency: Popen(shell=True) from the server process vs. CommandRunner.
+
+The server process is emulated by importing the recognition stack (numpy,
+sklearn, cv2) and allocating a large heap before spawning. Reports
+trigger-to-exit latency percentiles for a trivial command, plus the zombies
+left behind by fire-and-forget Popen (the old ActionExecutor behaviour).
+
+Run from the backend directory:  python -m benchmarks.bench_commands
+"""
+import os
+import subprocess
+import time
+
+import numpy as np
+
+from app.command_runner import CommandRunner
+
+COMMAND = "exit 0"
+
+
+def percentiles(times):
+    return {"p50_ms": float(np.percentile(times, 50) * 1e3), "p99_ms": float(np.percentile(times, 99) * 1e3)}
+
+
+def direct(n):
+    times = []
+    for _ in range(n):
+        start = time.perf_counter()
+        subprocess.Popen(COMMAND, shell=True).wait()
+        times.append(time.perf_counter() - start)
+    return percentiles(times)
+
+
+def pooled(n):
+    runner = CommandRunner()
+    runner.start()
+    runner.submit(COMMAND)  # Warm-up
+    _wait_idle(runner)
+    times = []
+    try:
+        for _ in range(n):
+            start = time.perf_counter()
+            runner.submit(COMMAND)
+            _wait_idle(runner)
+            times.append(time.perf_counter() - start)
+    finally:
+        runner.stop()
+    return percentiles(times)
+
+
+def _wait_idle(runner):
+    while runner.in_flight:
+        time.sleep(0.0002)
+
+
+def zombies_left(n):
+    # Fire-and-forget, as ActionExecutor used to do; count unreaped children
+    processes = [subprocess.Popen(COMMAND, shell=True) for _ in range(n)]
+    time.sleep(0.5)
+    if os.name == "nt":
+        return None
+    zombies = sum(1 for p in processes if _state(p.pid) == "Z")
+    for p in processes:
+        p.wait()
+    return zombies
+
+
+def _state(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split(")")[-1].split()[0]
+    except OSError:
+        return None
+
+
+def run(n=200):
+    import cv2  # noqa: F401  (server-sized process)
+    import sklearn.neural_network  # noqa: F401
+    heap = np.ones((256, 1024, 1024), dtype=np.uint8)  # ~256 MB resident, like a loaded server
+    results = {"direct": direct(n), "pooled": pooled(n), "zombies": zombies_left(20)}
+    for name in ("direct", "pooled"):
+        print(f"{name:8s} p50 {results[name]['p50_ms']:6.2f} ms   p99 {results[name]['p99_ms']:6.2f} ms")
+    print(f"Fire-and-forget Popen: {results['zombies']} of 20 children left as zombies")
+    del heap
+    return results
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,103 @@
+"""Per-frame image work: old allocate-per-call path vs. FrameBuffers.
+
+Covers everything the server does to pixels per camera frame except
+MediaPipe itself: detection preprocessing (resize + BGR->RGB), the landmark
+overlay, and, when someone watches /video_feed, the 480x360 rendition
+(resize, status text, JPEG, multipart part). Frames are 320x240 like
+ThreadedCamera's, with one hand in view.
+
+Reports bytes allocated per frame (tracemalloc peak above the steady state;
+numpy and OpenCV outputs are traced) and p50/p99 frame latency.
+
+Run from the backend directory:  python -m benchmarks.bench_frames
+"""
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from app.frames import FrameBuffers, draw_hands
+from app.gesture_engine import DETECT_SIZE
+from app.streaming import DEFAULT_PROFILE, FramePublisher
+
+
+def make_frame(rng, width=320, height=240):
+    # Smooth synthetic image: noise compresses unrealistically badly
+    gradient = np.linspace(0, 255, width)[None, :, None]
+    return np.clip(gradient + rng.normal(scale=8, size=(height, width, 3)), 0, 255).astype(np.uint8)
+
+
+def make_points(rng):
+    return [(0.5 + rng.normal(scale=0.08, size=(21, 3))).astype(np.float32)]
+
+
+def old_frame(frame, points, viewer, profile=DEFAULT_PROFILE):
+    # Verbatim shape of the previous process_frame + encode + generate_frames path
+    small = cv2.resize(frame, DETECT_SIZE)
+    rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+    annotated = draw_hands(frame.copy(), points)  # Drawn whether or not anyone watches
+    if not viewer:
+        return rgb
+    display = cv2.resize(annotated, (profile.width, profile.height))
+    scale = profile.width / 480
+    cv2.putText(display, "Detected: Fist", (int(10 * scale), int(25 * scale)),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.7 * scale, (0, 255, 0), max(1, int(round(2 * scale))))
+    _, buffer = cv2.imencode('.jpg', display, [int(cv2.IMWRITE_JPEG_QUALITY), profile.quality])
+    jpeg = buffer.tobytes()
+    return b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n'
+
+
+def new_frame_fn():
+    detect_buffers, view_buffers = FrameBuffers(), FrameBuffers()
+
+    def step(frame, points, viewer, profile=DEFAULT_PROFILE):
+        small = detect_buffers.resize(frame, DETECT_SIZE, "small")
+        rgb = detect_buffers.convert(small, cv2.COLOR_BGR2RGB, "rgb")
+        if not viewer:
+            return rgb
+        result = SimpleNamespace(frame=frame, points=points, status_text="Detected: Fist", source=None)
+        return FramePublisher.encode(result, profile, view_buffers)
+    return step
+
+
+def measure(step, frames, points, viewer, n):
+    for i in range(20):
+        step(frames[i % len(frames)], points, viewer)  # Warm-up: buffers allocated here
+
+    times = np.empty(n)
+    for i in range(n):
+        start = time.perf_counter()
+        step(frames[i % len(frames)], points, viewer)
+        times[i] = time.perf_counter() - start
+
+    tracemalloc.start()
+    allocated = np.empty(n)
+    for i in range(n):
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        out = step(frames[i % len(frames)], points, viewer)
+        allocated[i] = tracemalloc.get_traced_memory()[1] - base
+        del out
+    tracemalloc.stop()
+    return {"alloc_kb": float(np.mean(allocated) / 1024), "p50_ms": float(np.percentile(times, 50) * 1e3),
+            "p99_ms": float(np.percentile(times, 99) * 1e3)}
+
+
+def run(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = [make_frame(rng) for _ in range(4)]  # Like the camera's ring of slots
+    points = make_points(rng)
+    results = {}
+    print(f"{'path':6s} {'viewer':>6s} {'alloc KB/frame':>15s} {'p50 ms':>8s} {'p99 ms':>8s}")
+    for viewer in (False, True):
+        for name, step in (("old", old_frame), ("new", new_frame_fn())):
+            row = results[f"{name}/{'viewer' if viewer else 'headless'}"] = measure(step, frames, points, viewer, n)
+            print(f"{name:6s} {'yes' if viewer else 'no':>6s} {row['alloc_kb']:15.1f} "
+                  f"{row['p50_ms']:8.3f} {row['p99_ms']:8.3f}")
+    return results
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,102 @@
+"""Hand tracking in the pipeline thread vs. in a shared-memory worker process.
+
+1. Transport: per-frame roundtrip of ProcessGestureEngine with a detector
+   that returns immediately, i.e. the cost of moving a frame to the worker
+   and the landmarks back.
+2. Event-loop lag: an asyncio loop sleeping 5 ms at a time, measured while a
+   pipeline-like thread pushes frames through a detector that holds the GIL
+   for `busy_ms` per frame (standing in for MediaPipe), in the same thread
+   or in a worker process.
+
+Run from the backend directory:  python -m benchmarks.bench_hand_workers
+"""
+import asyncio
+import threading
+import time
+
+import numpy as np
+
+from app.hand_workers import ProcessGestureEngine, _make_detector
+
+
+class ThreadEngine:
+    # The detector in the calling thread, as GestureEngine runs it
+    def __init__(self, kind):
+        self.detector = _make_detector(kind, 1)
+
+    def process_frame(self, frame):
+        results, _, features = self.detector.detect(frame)
+        return frame, results, features
+
+    def close(self):
+        pass
+
+
+def transport(sizes=((320, 240), (640, 480)), frames=300):
+    engine = ProcessGestureEngine(detector="null")
+    results = {}
+    try:
+        for width, height in sizes:
+            frame = np.zeros((height, width, 3), dtype=np.uint8)
+            engine.process_frame(frame)  # Worker start + shared-memory setup
+            times = []
+            for _ in range(frames):
+                start = time.perf_counter()
+                engine.process_frame(frame)
+                times.append(time.perf_counter() - start)
+            key = f"{width}x{height}"
+            results[key] = {"p50_ms": float(np.percentile(times, 50) * 1e3),
+                            "p99_ms": float(np.percentile(times, 99) * 1e3)}
+            print(f"transport {key:9s} p50 {results[key]['p50_ms']:6.3f} ms   p99 {results[key]['p99_ms']:6.3f} ms")
+    finally:
+        engine.close()
+    return results
+
+
+async def measure_lag(seconds, interval=0.005):
+    lags = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+    return lags
+
+
+def loop_lag(engine, seconds=3.0, fps=30):
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    engine.process_frame(frame)
+    running = True
+
+    def drive():
+        # Camera-paced pipeline loop
+        while running:
+            due = time.perf_counter() + 1.0 / fps
+            engine.process_frame(frame)
+            time.sleep(max(due - time.perf_counter(), 0))
+
+    driver = threading.Thread(target=drive, daemon=True)
+    driver.start()
+    try:
+        lags = asyncio.run(measure_lag(seconds))
+    finally:
+        running = False
+        driver.join()
+        engine.close()
+    return {"p50_ms": float(np.percentile(lags, 50) * 1e3), "p99_ms": float(np.percentile(lags, 99) * 1e3),
+            "max_ms": float(np.max(lags) * 1e3)}
+
+
+def run(busy_ms=20):
+    results = {"transport": transport(), "loop_lag": {}}
+    kind = f"busy:{busy_ms}"
+    for name, engine in (("thread", ThreadEngine(kind)), ("process", ProcessGestureEngine(detector=kind))):
+        lag = loop_lag(engine)
+        results["loop_lag"][name] = lag
+        print(f"loop lag ({busy_ms} ms detector in {name:7s}) p50 {lag['p50_ms']:6.2f} ms   "
+              f"p99 {lag['p99_ms']:6.2f} ms   max {lag['max_ms']:6.2f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    run()
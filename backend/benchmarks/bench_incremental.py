@@ -0,0 +1,86 @@
+"""Adding one gesture to a trained library: full refit vs. incremental warm start.
+
+A model is fully trained on `n_gestures - 1` synthetic gestures, then one new
+50-frame gesture is recorded and the model is retrained both ways on the same
+snapshot. Reports fit time and held-out accuracy (overall, and on the new
+gesture), then repeats for a deletion.
+
+Run from the backend directory:  python -m benchmarks.bench_incremental
+"""
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from app.features import normalize_landmarks
+from app.trainer import ModelTrainer
+
+
+def make_gestures(rng, n_gestures, per_gesture, noise=0.05):
+    # Hand-shaped point clouds with enough jitter that classes overlap a little
+    shapes = rng.normal(scale=0.08, size=(n_gestures, 21, 3)).astype(np.float32)
+
+    def sample(gesture, n):
+        points = shapes[gesture] + 0.5 + rng.normal(scale=noise, size=(n, 21, 3)).astype(np.float32)
+        return normalize_landmarks(points, 4 / 3)
+    return sample
+
+
+def accuracy(model, X, y):
+    return float(np.mean(model.predict(X) == y))
+
+
+def compare(trainer, X_test, y_test, new_label=None):
+    gestures, labels = trainer.store.snapshot()
+    results = {}
+    for mode in ("full", "incremental"):
+        start = time.perf_counter()
+        model, _, _, used = trainer._fit(gestures, labels) if mode == "full" else trainer._fit_model(gestures, labels)
+        elapsed = time.perf_counter() - start
+        row = {"seconds": elapsed, "mode": used, "accuracy": accuracy(model, X_test, y_test)}
+        if new_label is not None:
+            mask = y_test == new_label
+            row["new_accuracy"] = accuracy(model, X_test[mask], y_test[mask])
+        results[mode] = row
+        print(f"  {mode:12s} {elapsed:7.2f}s   accuracy {row['accuracy']:6.1%}" +
+              (f"   new gesture {row['new_accuracy']:6.1%}" if new_label is not None else "") +
+              ("" if used == mode else f"   (fell back to {used})"))
+    return results
+
+
+def run(n_gestures=30, per_gesture=50, seed=0):
+    rng = np.random.default_rng(seed)
+    sample = make_gestures(rng, n_gestures, per_gesture)
+    names = [f"G{i}" for i in range(n_gestures)]
+    X_test = np.vstack([sample(g, 40) for g in range(n_gestures)])
+    y_test = np.repeat(names, 40)
+
+    workdir = tempfile.mkdtemp()
+    trainer = ModelTrainer(os.path.join(workdir, "model.pkl"))
+    try:
+        for g in range(n_gestures - 1):
+            trainer.store.append_many(sample(g, per_gesture), [names[g]] * per_gesture)
+        start = time.perf_counter()
+        trainer.train(full=True)
+        print(f"Library: {n_gestures - 1} gestures x {per_gesture} frames, full fit {time.perf_counter() - start:.2f}s")
+
+        results = {}
+        print(f"Add {names[-1]} ({per_gesture} frames)")
+        trainer.store.append_many(sample(n_gestures - 1, per_gesture), [names[-1]] * per_gesture)
+        results["add"] = compare(trainer, X_test, y_test, names[-1])
+
+        trainer.train()
+        print(f"Delete {names[0]}")
+        trainer.store.remove_label(names[0])
+        keep = y_test != names[0]
+        results["delete"] = compare(trainer, X_test[keep], y_test[keep])
+        return results
+    finally:
+        trainer.train_executor.shutdown(wait=True)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    run()
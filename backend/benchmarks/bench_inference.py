@@ -0,0 +1,44 @@
+"""Per-frame MLP inference: two sklearn predict_proba calls vs. one MLPForward batch.
+
+Run from the backend directory:  python -m benchmarks.bench_inference
+"""
+import timeit
+
+import numpy as np
+from sklearn.neural_network import MLPClassifier
+
+from app.features import mirror_landmarks
+from app.inference import MLPForward
+
+
+def fit_model(rng, n_gestures, samples_per_gesture=50):
+    centers = rng.normal(size=(n_gestures, 63))
+    X = np.repeat(centers, samples_per_gesture, axis=0) + 0.05 * rng.normal(size=(n_gestures * samples_per_gesture, 63))
+    y = np.repeat([f"G{i}" for i in range(n_gestures)], samples_per_gesture)
+    model = MLPClassifier(hidden_layer_sizes=(64, 32), max_iter=300, random_state=42)
+    model.fit(X, y)
+    return model, X.astype(np.float32)
+
+
+def run(number=5000):
+    rng = np.random.default_rng(0)
+    results = {}
+    for n_gestures in (1, 2, 10, 30):
+        model, X = fit_model(rng, n_gestures)
+        forward = MLPForward(model)
+        landmarks = X[0]
+        mirrored = mirror_landmarks(landmarks)
+        batch = np.vstack([landmarks, mirrored])
+
+        expected = np.vstack([model.predict_proba([landmarks])[0], model.predict_proba([mirrored])[0]])
+        assert np.allclose(forward.predict_proba(batch), expected, atol=1e-4), "MLPForward diverges from sklearn"
+
+        sklearn_t = min(timeit.repeat(lambda: (model.predict_proba([landmarks]), model.predict_proba([mirrored])), number=number, repeat=3)) / number
+        forward_t = min(timeit.repeat(lambda: forward.predict_proba(batch), number=number, repeat=3)) / number
+        results[n_gestures] = {"sklearn_us": sklearn_t * 1e6, "forward_us": forward_t * 1e6}
+        print(f"{n_gestures:3d} gestures  sklearn x2 {sklearn_t * 1e6:7.1f} us   MLPForward (2,63) {forward_t * 1e6:6.1f} us")
+    return results
+
+
+if __name__ == "__main__":
+    run()
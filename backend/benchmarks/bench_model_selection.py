@@ -0,0 +1,32 @@
+"""Model selection on a synthetic gesture library: CV accuracy vs. per-frame
+latency vs. size for every candidate, and which one gets promoted.
+
+Run from the backend directory:  python -m benchmarks.bench_model_selection
+"""
+import numpy as np
+
+from app.augmentation import AugmentationPipeline, DEFAULT_AUGMENTATIONS
+from app.model_selection import select_model
+from benchmarks.bench_incremental import make_gestures
+
+
+def run(n_gestures=20, per_gesture=50, latency_budget=0.001, folds=5, seed=0):
+    rng = np.random.default_rng(seed)
+    sample = make_gestures(rng, n_gestures, per_gesture)
+    gestures = np.vstack([sample(g, per_gesture) for g in range(n_gestures)])
+    labels = np.repeat([f"G{g}" for g in range(n_gestures)], per_gesture)
+    views = AugmentationPipeline(DEFAULT_AUGMENTATIONS).apply(gestures)
+
+    _, report = select_model(gestures, labels, views, latency_budget, folds)
+    print(f"{n_gestures} gestures x {per_gesture} samples, {report['folds']}-fold CV in {report['seconds']:.1f}s, "
+          f"budget {report['latency_budget_ms']:.2f} ms/frame")
+    print(f"{'candidate':12s} {'accuracy':>9s} {'std':>6s} {'latency ms':>11s} {'size KB':>8s} {'fit s':>7s}")
+    for row in report["candidates"]:
+        print(f"{row['name']:12s} {row['accuracy']:9.2%} {row['accuracy_std']:6.3f} {row['latency_ms']:11.3f} "
+              f"{row['size_bytes'] / 1024:8.1f} {row['fit_seconds']:7.2f}")
+    print(f"Promoted: {report['selected']}" + ("" if report["within_budget"] else " (nothing fit the budget)"))
+    return report
+
+
+if __name__ == "__main__":
+    run()
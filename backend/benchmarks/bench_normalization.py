@@ -0,0 +1,90 @@
+"""Per-frame landmark normalization: legacy Python loops vs. vectorized NumPy.
+
+Both paths start from the MediaPipe landmark list. The vectorized one reads
+the 21 landmarks into the array in one np.fromiter pass and normalizes with
+a handful of whole-array ops (the aspect scale vector is cached); the
+"+mirror" rows add what prediction needs on top (list -> ndarray round trip
+and looped mirroring on the legacy side).
+
+Run from the backend directory:  python -m benchmarks.bench_normalization
+"""
+import timeit
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.features import landmarks_to_array, mirror_landmarks, normalize_landmarks
+
+
+def make_hand(rng):
+    # Stand-in for a MediaPipe NormalizedLandmarkList
+    coords = rng.random((21, 3)).tolist()  # Python floats, like the protobuf fields
+    return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in coords])
+
+
+def legacy_normalize(hand_landmarks, w, h):
+    # Verbatim copy of the original GestureEngine.process_frame loops
+    wrist = hand_landmarks.landmark[0]
+    temp_coords = []
+    max_dist = 0
+    for lm in hand_landmarks.landmark:
+        dx = (lm.x - wrist.x) * (w / h)
+        dy = (lm.y - wrist.y)
+        dz = (lm.z - wrist.z) * (w / h)
+        temp_coords.append((dx, dy, dz))
+        dist = (dx**2 + dy**2 + dz**2)**0.5
+        if dist > max_dist:
+            max_dist = dist
+    current_hand_landmarks = []
+    if max_dist > 0:
+        for dx, dy, dz in temp_coords:
+            current_hand_landmarks.extend([dx/max_dist, dy/max_dist, dz/max_dist])
+    else:
+        for dx, dy, dz in temp_coords:
+            current_hand_landmarks.extend([dx, dy, dz])
+    return current_hand_landmarks
+
+
+def legacy_to_model_input(hand_landmarks, w, h):
+    # Legacy path also paid for list -> ndarray conversion + looped mirroring in predict
+    features = np.array(legacy_normalize(hand_landmarks, w, h))
+    mirrored = features.copy()
+    for i in range(0, 63, 3):
+        mirrored[i] *= -1
+    return features, mirrored
+
+
+def vectorized_to_model_input(hand_landmarks, w, h, buffer):
+    features = normalize_landmarks(landmarks_to_array(hand_landmarks, buffer), w / h)
+    return features, mirror_landmarks(features)
+
+
+def run(number=20000):
+    rng = np.random.default_rng(0)
+    hand = make_hand(rng)
+    w, h = 320, 240
+    buffer = np.empty((21, 3), dtype=np.float32)
+
+    # Both implementations must agree before we compare their speed
+    expected = np.array(legacy_normalize(hand, w, h))
+    actual = normalize_landmarks(landmarks_to_array(hand, buffer), w / h)
+    assert np.allclose(expected, actual, atol=1e-5), "vectorized normalization diverges from legacy"
+
+    cases = {
+        "legacy normalize": lambda: legacy_normalize(hand, w, h),
+        "vectorized normalize": lambda: normalize_landmarks(landmarks_to_array(hand, buffer), w / h),
+        "legacy normalize+mirror": lambda: legacy_to_model_input(hand, w, h),
+        "vectorized normalize+mirror": lambda: vectorized_to_model_input(hand, w, h, buffer),
+    }
+    results = {}
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=number, repeat=7)) / number
+        results[name] = best
+        legacy = results.get(name.replace("vectorized", "legacy"))
+        speedup = f"  {legacy / best:.2f}x legacy" if name.startswith("vectorized") else ""
+        print(f"{name:30s} {best * 1e6:8.2f} us/frame{speedup}")
+    return results
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,70 @@
+"""Sample persistence: legacy pickled Python lists vs. the memory-mapped SampleStore.
+
+Run from the backend directory:  python -m benchmarks.bench_sample_store
+"""
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from app.sample_store import SampleStore
+
+
+def list_bytes(gestures):
+    # Boxed floats: list object + one float object per value
+    return sum(sys.getsizeof(g) + sum(sys.getsizeof(v) for v in g) for g in gestures[:100]) * len(gestures) / 100
+
+
+def run(sizes=(1000, 10000, 100000), n_labels=30):
+    rng = np.random.default_rng(0)
+    results = {}
+    print(f"{'samples':>8s} {'list MB':>8s} {'store MB':>8s} {'pickle save':>12s} {'pickle load':>12s} {'store save':>11s} {'store load':>11s} {'remove':>9s}")
+    for n in sizes:
+        X = rng.normal(size=(n, 63)).astype(np.float32)
+        labels = [f"G{i % n_labels}" for i in range(n)]
+        gestures = X.astype(np.float64).tolist()
+        workdir = tempfile.mkdtemp()
+        try:
+            pkl = os.path.join(workdir, "legacy.pkl")
+            start = time.perf_counter()
+            with open(pkl, 'wb') as f:
+                pickle.dump({'labels': labels, 'gestures': gestures}, f)
+            pickle_save = time.perf_counter() - start
+            start = time.perf_counter()
+            with open(pkl, 'rb') as f:
+                pickle.load(f)
+            pickle_load = time.perf_counter() - start
+
+            store = SampleStore(os.path.join(workdir, "store"))
+            store.append_many(X, labels)
+            start = time.perf_counter()
+            store.flush()
+            store_save = time.perf_counter() - start
+            del store
+            start = time.perf_counter()
+            store = SampleStore(os.path.join(workdir, "store"))
+            store.snapshot()
+            store_load = time.perf_counter() - start
+            start = time.perf_counter()
+            store.remove_label("G0")
+            remove = time.perf_counter() - start
+            del store
+
+            row = {
+                "list_mb": list_bytes(gestures) / 1e6, "store_mb": X.nbytes / 1e6,
+                "pickle_save_s": pickle_save, "pickle_load_s": pickle_load,
+                "store_save_s": store_save, "store_load_s": store_load, "remove_s": remove,
+            }
+            results[n] = row
+            print(f"{n:8d} {row['list_mb']:8.1f} {row['store_mb']:8.1f} {pickle_save:12.4f} {pickle_load:12.4f} {store_save:11.4f} {store_load:11.4f} {remove:9.4f}")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,100 @@
+"""Reality-check nearest-sample query: legacy brute force vs. SimilarityIndex.
+
+Synthetic clustered landmarks (30 gestures) at 1k-100k stored samples, plus
+how long queries stall while a background rebuild runs and what deleting
+a gesture costs the caller.
+Run from the backend directory:  python -m benchmarks.bench_similarity
+"""
+import time
+
+import numpy as np
+
+from app.features import mirror_landmarks
+from app.similarity import SimilarityIndex
+
+
+def make_library(rng, n_samples, n_gestures=30, spread=0.05):
+    centers = rng.normal(size=(n_gestures, 63)).astype(np.float32)
+    labels = rng.integers(0, n_gestures, n_samples)
+    X = centers[labels] + spread * rng.normal(size=(n_samples, 63)).astype(np.float32)
+    return centers, X.astype(np.float32)
+
+
+def legacy_min_distance(X_train, landmarks):
+    # Verbatim logic of the original ModelTrainer.predict reality check
+    mirrored_landmarks = mirror_landmarks(landmarks)
+    dist_orig = np.linalg.norm(X_train - landmarks, axis=1)
+    dist_mirrored = np.linalg.norm(X_train - mirrored_landmarks, axis=1)
+    return min(np.min(dist_orig), np.min(dist_mirrored))
+
+
+def time_per_call(fn, queries):
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def run(sizes=(1000, 5000, 10000, 50000, 100000), n_queries=200):
+    rng = np.random.default_rng(0)
+    results = {}
+    print(f"{'samples':>8s} {'legacy us':>10s} {'index us':>10s} {'build s':>8s} {'speedup':>8s}")
+    for n in sizes:
+        centers, X = make_library(rng, n)
+        picks = rng.integers(0, len(centers), n_queries)
+        queries = centers[picks] + 0.05 * rng.normal(size=(n_queries, 63)).astype(np.float32)
+        # Half of the queries come from the "other hand"
+        queries[::2] = mirror_landmarks(queries[::2])
+
+        start = time.perf_counter()
+        index = SimilarityIndex()
+        index.reset(X)
+        build = time.perf_counter() - start
+
+        for q in queries[:10]:
+            assert abs(index.query(q)[0] - legacy_min_distance(X, q)) < 1e-3
+
+        legacy = time_per_call(lambda q: legacy_min_distance(X, q), queries[:max(10, n_queries * 1000 // n)])
+        indexed = time_per_call(index.query, queries)
+        results[n] = {"legacy_us": legacy * 1e6, "index_us": indexed * 1e6, "build_s": build}
+        print(f"{n:8d} {legacy * 1e6:10.1f} {indexed * 1e6:10.1f} {build:8.3f} {legacy / indexed:7.1f}x")
+    return results
+
+
+def rebuild_stalls(n=100000, duration=None):
+    # Queries from one thread while another adds enough samples to force a tree rebuild
+    rng = np.random.default_rng(1)
+    centers, X = make_library(rng, n)
+    labels = np.array([f"G{i}" for i in np.argmin(((X[:, None] - centers[None]) ** 2).sum(-1), axis=1)])
+    index = SimilarityIndex()
+    index.reset(X, labels)
+    query = centers[0] + 0.05 * rng.normal(size=63).astype(np.float32)
+
+    start = time.perf_counter()
+    index.add_many(make_library(rng, n // 5)[1], "G0")  # Past rebuild_ratio: rebuild starts in the background
+    add_seconds = time.perf_counter() - start
+    worst = 0.0
+    while index.rebuilding:
+        t = time.perf_counter()
+        index.query(query)
+        worst = max(worst, time.perf_counter() - t)
+    rebuild_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.remove_label("G1")
+    remove_seconds = time.perf_counter() - start
+    t = time.perf_counter()
+    index.query(query)  # Tombstones still in the tree until the rebuild it scheduled lands
+    stale_query = time.perf_counter() - t
+    index.wait_for_rebuild(30)
+    results = {"add_ms": add_seconds * 1e3, "rebuild_s": rebuild_seconds, "worst_query_during_rebuild_ms": worst * 1e3,
+               "remove_label_ms": remove_seconds * 1e3, "query_with_tombstones_ms": stale_query * 1e3}
+    print(f"{n} samples: add_many {results['add_ms']:.1f} ms, background rebuild {rebuild_seconds:.2f}s, "
+          f"worst query meanwhile {results['worst_query_during_rebuild_ms']:.2f} ms; "
+          f"remove_label {results['remove_label_ms']:.2f} ms, next query {results['query_with_tombstones_ms']:.2f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    run()
+    rebuild_stalls()
@@ -0,0 +1,115 @@
+"""Server startup: import time of app.main and launch-to-ready time, against the budget.
+
+1. Imports app.main in fresh interpreters and lists which heavy libraries
+   that pulled in (none of sklearn / mediapipe / pyautogui should be).
+2. Launches uvicorn, polls /ready, and reports when the first request was
+   answered and when every component was warm, plus the per-component
+   warmup times from the /ready report.
+
+The server uses the normal models/ directory and AIGCS_* settings, exactly
+like a real launch. Exits with status 1 under --check when over budget.
+
+Run from the backend directory:  python -m benchmarks.bench_startup [--check]
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+HEAVY = ("sklearn", "scipy", "joblib", "mediapipe", "pyautogui")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = (
+    "import json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "import app.main\n"
+    "seconds = time.perf_counter() - start\n"
+    f"print(json.dumps({{'seconds': seconds, 'heavy': [m for m in {HEAVY!r} if m in sys.modules]}}))\n"
+)
+
+
+def import_time(repeat=5):
+    times, heavy = [], set()
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=BACKEND_DIR, capture_output=True,
+                                text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        times.append(result["seconds"])
+        heavy.update(result["heavy"])
+    return {"median_s": float(np.median(times)), "max_s": float(np.max(times)), "heavy_imports": sorted(heavy)}
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get_ready(port):
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=1) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def startup(timeout=60.0):
+    port = _free_port()
+    launched = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+                              cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    first_response = report = None
+    try:
+        while time.perf_counter() - launched < timeout:
+            try:
+                status, report = _get_ready(port)
+            except OSError:
+                time.sleep(0.02) # Not listening yet
+                continue
+            if first_response is None:
+                first_response = time.perf_counter() - launched
+            if status == 200:
+                break
+            time.sleep(0.02)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    ready = report is not None and report["ready"]
+    return {"first_response_s": first_response, "ready_s": time.perf_counter() - launched if ready else None,
+            "report": report}
+
+
+def run(repeat=5):
+    imports = import_time(repeat)
+    print(f"import app.main: median {imports['median_s'] * 1000:.0f} ms, max {imports['max_s'] * 1000:.0f} ms, "
+          f"heavy modules: {', '.join(imports['heavy_imports']) or 'none'}")
+    result = startup()
+    report = result["report"] or {}
+    budget = report.get("budget", {})
+    print(f"first response {result['first_response_s'] or float('nan'):.2f}s after launch, "
+          f"ready {result['ready_s'] or float('nan'):.2f}s (server-side: import {report.get('import_seconds') or 0:.2f}s, "
+          f"ready {report.get('ready_seconds') or float('nan'):.2f}s; budget {budget.get('import_seconds')}s / "
+          f"{budget.get('ready_seconds')}s)")
+    for name, component in report.get("components", {}).items():
+        seconds = component["seconds"]
+        print(f"  {name:12s} {component['state']:9s} {'' if seconds is None else f'{seconds:.2f}s'}"
+              f"{' ' + component['error'] if component['error'] else ''}")
+    return {"imports": imports, **result}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="exit 1 if over the import/ready budget")
+    args = parser.parse_args()
+    results = run(args.repeat)
+    report = results["report"] or {}
+    if args.check and (results["imports"]["heavy_imports"] or not report.get("within_budget")):
+        sys.exit(1)
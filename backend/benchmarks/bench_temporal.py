@@ -0,0 +1,96 @@
+"""Replay a synthetic landmark trace through raw per-frame prediction and GestureTracker.
+
+Compares classifier calls, per-frame accuracy and triggers (frames where a
+new gesture starts, i.e. potential actions) on held poses with sensor jitter,
+slow drift and single-frame flickers to a wrong gesture.
+
+Run from the backend directory:  python -m benchmarks.bench_temporal
+"""
+import time
+
+import numpy as np
+from sklearn.neural_network import MLPClassifier
+
+from app.inference import MLPForward
+from app.temporal import GestureTracker
+
+
+def fit_classifier(rng, centers, samples_per_gesture=60):
+    n_gestures = len(centers)
+    X = np.repeat(centers, samples_per_gesture, axis=0) + 0.05 * rng.normal(size=(n_gestures * samples_per_gesture, 63))
+    y = np.repeat([f"G{i}" for i in range(n_gestures)], samples_per_gesture)
+    model = MLPClassifier(hidden_layer_sizes=(64, 32), max_iter=300, random_state=42)
+    model.fit(X, y)
+    forward = MLPForward(model, max_batch=1)
+    batch = np.empty((1, 63), dtype=np.float32)
+
+    def classify(landmarks):
+        # Same contract as ModelTrainer.classify (minus the reality check)
+        batch[0] = landmarks
+        probs = forward.predict_proba(batch)[0]
+        return forward.classes_, probs[:len(forward.classes_)].copy()
+
+    return classify
+
+
+def make_trace(rng, centers, segments=40, hold=(20, 60), jitter=0.004, drift=0.002, flicker_rate=0.05):
+    # Returns (frames, truth): per-frame landmarks and the gesture actually held
+    frames, truth = [], []
+    for _ in range(segments):
+        g = int(rng.integers(len(centers)))
+        pose = centers[g].copy()
+        for _ in range(int(rng.integers(*hold))):
+            pose += drift * rng.normal(size=63)
+            if rng.random() < flicker_rate:
+                # A misdetected frame that looks like another gesture
+                other = (g + 1 + int(rng.integers(len(centers) - 1))) % len(centers)
+                frames.append(centers[other] + jitter * rng.normal(size=63))
+            else:
+                frames.append(pose + jitter * rng.normal(size=63))
+            truth.append(f"G{g}")
+    return np.asarray(frames, dtype=np.float32), truth
+
+
+def count_triggers(labels):
+    # A trigger is a switch to a different, non-empty label
+    return sum(1 for a, b in zip([None] + labels, labels) if b is not None and a != b)
+
+
+def replay_raw(classify, frames):
+    labels = []
+    for landmarks in frames:
+        classes, probs = classify(landmarks)
+        best = int(np.argmax(probs))
+        labels.append(classes[best] if probs[best] >= 0.5 else None)
+    return labels, len(frames)
+
+
+def replay_tracker(classify, frames):
+    tracker = GestureTracker(classify)
+    labels = [tracker.update(landmarks) for landmarks in frames]
+    return labels, tracker.stats["classified"]
+
+
+def run(n_gestures=5, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = 0.3 * rng.normal(size=(n_gestures, 63))
+    classify = fit_classifier(rng, centers)
+    frames, truth = make_trace(rng, centers)
+
+    results = {}
+    print(f"{len(frames)} frames, {count_triggers(truth)} true gesture starts")
+    for name, replay in (("raw", replay_raw), ("tracker", replay_tracker)):
+        start = time.perf_counter()
+        labels, calls = replay(classify, frames)
+        elapsed = time.perf_counter() - start
+        accuracy = float(np.mean([a == b for a, b in zip(labels, truth)]))
+        triggers = count_triggers(labels)
+        results[name] = {"classifier_calls": calls, "accuracy": accuracy, "triggers": triggers,
+                         "us_per_frame": elapsed / len(frames) * 1e6}
+        print(f"{name:8s} calls {calls:5d}   accuracy {accuracy:6.1%}   triggers {triggers:4d}   "
+              f"{elapsed / len(frames) * 1e6:6.1f} us/frame")
+    return results
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,309 @@
+"""Recognition hot-path benchmark suite with JSON results and regression checks.
+
+Every case runs on synthetic landmark data (no camera, GPU or display), is
+auto-calibrated to ~`target` seconds per repeat and reports per-call timings.
+
+Run from the backend directory:
+    python -m benchmarks.suite                          # writes benchmarks/results/<commit>.json
+    python -m benchmarks.suite --quick -k predict       # subset, smaller sizes
+    python -m benchmarks.suite --compare benchmarks/results/abc1234.json
+
+--compare exits with status 1 when any case's best (min) time is more than
+--threshold times slower than in the baseline file; min is the least noisy
+statistic on a shared machine.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# name -> (function, full params, quick params); function(param) returns a zero-arg callable to time,
+# optionally paired with a cleanup callable
+CASES = {}
+
+
+def benchmark(name, params=(None,), quick=None):
+    def register(fn):
+        CASES[name] = (fn, tuple(params), tuple(quick if quick is not None else params))
+        return fn
+    return register
+
+
+# --- Synthetic data ---
+
+def make_samples(n_samples, n_gestures=10, seed=0):
+    from app.features import normalize_landmarks
+    rng = np.random.default_rng(seed)
+    # Hand-shaped point clouds: each gesture is a fixed offset pattern around the wrist
+    shapes = rng.normal(scale=0.08, size=(n_gestures, 21, 3)).astype(np.float32)
+    labels = rng.integers(0, n_gestures, n_samples)
+    points = shapes[labels] + 0.5 + rng.normal(scale=0.005, size=(n_samples, 21, 3)).astype(np.float32)
+    return normalize_landmarks(points, 4 / 3), [f"G{i}" for i in labels]
+
+
+def make_trainer(workdir, n_samples, train=True):
+    from app.trainer import ModelTrainer
+    trainer = ModelTrainer(os.path.join(workdir, "model.pkl"))
+    X, labels = make_samples(n_samples)
+    trainer.store.append_many(X, labels)
+    trainer.index.reset(*trainer.store.snapshot())
+    if train:
+        trainer.train()
+    return trainer, X
+
+
+# --- Cases ---
+
+@benchmark("normalize")
+def bench_normalize(_):
+    # GestureEngine per-hand work: MediaPipe landmark list -> (21, 3) -> normalized (63,)
+    from app.features import landmarks_to_array, normalize_landmarks
+    rng = np.random.default_rng(0)
+    hand = SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in rng.random((21, 3))])
+    buffer = np.empty((21, 3), dtype=np.float32)
+    return lambda: normalize_landmarks(landmarks_to_array(hand, buffer), 4 / 3)
+
+
+@benchmark("predict", params=(100, 1000, 10000, 50000), quick=(100, 1000))
+def bench_predict(n_samples):
+    workdir = tempfile.mkdtemp()
+    trainer, X = make_trainer(workdir, n_samples)
+    query = X[len(X) // 2] + 0.001
+    return (lambda: trainer.predict(query)), lambda: _close(trainer, workdir)
+
+
+@benchmark("classify_hands", params=(1, 2, 4), quick=(2,))
+def bench_classify_hands(n_hands):
+    # Multi-hand frame: every hand (+ mirror) through one batched similarity + MLP call
+    workdir = tempfile.mkdtemp()
+    trainer, X = make_trainer(workdir, 1000)
+    hands = [X[i * 97] + 0.001 for i in range(n_hands)]
+    return (lambda: trainer.classify_batch(hands)), lambda: _close(trainer, workdir)
+
+
+@benchmark("classify_hands_looped", params=(1, 2, 4), quick=(2,))
+def bench_classify_looped(n_hands):
+    # Reference: the same hands classified one call at a time
+    workdir = tempfile.mkdtemp()
+    trainer, X = make_trainer(workdir, 1000)
+    hands = [X[i * 97] + 0.001 for i in range(n_hands)]
+    return (lambda: [trainer.classify(h) for h in hands]), lambda: _close(trainer, workdir)
+
+
+@benchmark("train", params=(100, 500, 2000), quick=(100,))
+def bench_train(n_samples):
+    workdir = tempfile.mkdtemp()
+    trainer, _ = make_trainer(workdir, n_samples, train=False)
+    return trainer.train, lambda: _close(trainer, workdir)
+
+
+@benchmark("augment", params=(1000, 10000, 50000), quick=(1000,))
+def bench_augment(n_samples):
+    # What a train would pay to re-augment everything with mirror + jitter + rotation
+    from app.augmentation import AugmentationPipeline, Jitter, Mirror, Rotate
+    X, _ = make_samples(n_samples)
+    pipeline = AugmentationPipeline([Mirror(), Jitter(), Rotate()])
+    return lambda: pipeline.apply(X)
+
+
+@benchmark("training_snapshot", params=(1000, 10000, 50000), quick=(1000,))
+def bench_training_snapshot(n_samples):
+    # What it pays instead: samples + cached views copied out of the store
+    workdir = tempfile.mkdtemp()
+    trainer, _ = make_trainer(workdir, n_samples, train=False)
+    trainer.store.training_snapshot()
+    return trainer.store.training_snapshot, lambda: _close(trainer, workdir)
+
+
+@benchmark("save_model", params=(1000, 10000, 50000), quick=(1000,))
+def bench_save(n_samples):
+    workdir = tempfile.mkdtemp()
+    trainer, _ = make_trainer(workdir, n_samples)
+    return trainer.save_model, lambda: _close(trainer, workdir)
+
+
+@benchmark("load_model", params=(1000, 10000, 50000), quick=(1000,))
+def bench_load(n_samples):
+    from app.trainer import ModelTrainer
+    workdir = tempfile.mkdtemp()
+    trainer, _ = make_trainer(workdir, n_samples)
+    _close(trainer, None)
+    loaded = []
+
+    def load():
+        # Cold start: a fresh trainer opening the saved model + sample store
+        loaded.append(ModelTrainer(os.path.join(workdir, "model.pkl")))
+        _close(loaded.pop(), None)
+    return load, lambda: shutil.rmtree(workdir, ignore_errors=True)
+
+
+@benchmark("jpeg_encode", params=("480x360@60", "640x480@80", "1280x720@80"), quick=("480x360@60",))
+def bench_jpeg(profile_spec):
+    # What generate_frames pays per new frame per profile (cache miss)
+    from app.frames import FrameBuffers
+    from app.pipeline import FrameResult
+    from app.streaming import FramePublisher, StreamProfile
+    size, quality = profile_spec.split("@")
+    width, height = (int(v) for v in size.split("x"))
+    rng = np.random.default_rng(0)
+    # Smooth synthetic image: noise compresses unrealistically badly
+    frame = np.clip(np.linspace(0, 255, 320)[None, :, None] + rng.normal(scale=8, size=(240, 320, 3)), 0, 255).astype(np.uint8)
+    result = FrameResult(1, 0.0, frame, None, None, "Detected: Fist")
+    profile = StreamProfile(width, height, int(quality))
+    buffers = FrameBuffers()  # The rendition's canvas, reused like FramePublisher does
+    return lambda: FramePublisher.encode(result, profile, buffers)
+
+
+@benchmark("ws_fanout", params=(1, 10, 100), quick=(1, 10))
+def bench_fanout(n_clients):
+    # One changed state message: dedupe check, JSON encode once, enqueue to every client
+    from app.broadcaster import Broadcaster
+    loop = asyncio.new_event_loop()
+    broadcaster = Broadcaster()
+    broadcaster.bind(loop)
+    queues = [loop.run_until_complete(_subscribe(broadcaster)) for _ in range(n_clients)]
+    counter = [0]
+    message = {"prediction": "Fist", "is_recording": False, "recording_progress": 0,
+               "training": {"state": "idle", "samples": 500, "progress": 1.0, "version": 0}}
+
+    def publish():
+        counter[0] += 1
+        message["training"]["version"] = counter[0]
+        broadcaster.publish(dict(message))
+        loop.run_until_complete(_drain(queues))
+    return publish, loop.close
+
+
+async def _subscribe(broadcaster):
+    return broadcaster.subscribe()
+
+
+async def _drain(queues):
+    for queue in queues:
+        while not queue.empty():
+            queue.get_nowait()
+
+
+def _close(trainer, workdir):
+    trainer.train_executor.shutdown(wait=True)
+    if workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# --- Runner ---
+
+def time_case(fn, target=0.2, repeat=5):
+    # Calibrate the inner loop so one repeat takes ~target seconds, then keep per-call times
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= target or number >= 1 << 20:
+            break
+        number = max(number * 2, int(number * target / max(elapsed, 1e-9)))
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return {"number": number, "repeat": repeat, "min_s": min(times),
+            "median_s": float(np.median(times)), "mean_s": float(np.mean(times))}
+
+
+def case_key(name, param):
+    return name if param is None else f"{name}[{param}]"
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(select=None, quick=False, target=0.2, repeat=5):
+    import sklearn
+    results = {}
+    for name, (fn, params, quick_params) in CASES.items():
+        if select and not any(s in name for s in select):
+            continue
+        for param in (quick_params if quick else params):
+            prepared = fn(param)
+            call, cleanup = prepared if isinstance(prepared, tuple) else (prepared, None)
+            try:
+                stats = time_case(call, target, repeat)
+            finally:
+                if cleanup is not None:
+                    cleanup()
+            key = case_key(name, param)
+            results[key] = stats
+            print(f"{key:28s} {stats['median_s'] * 1e6:12.1f} us  (min {stats['min_s'] * 1e6:.1f}, n={stats['number']}x{stats['repeat']})")
+    return {
+        "meta": {
+            "commit": git_commit(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "quick": quick,
+            "python": platform.python_version(), "numpy": np.__version__, "sklearn": sklearn.__version__,
+            "machine": platform.machine(), "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=1.25):
+    """Prints per-case ratios against a baseline run; returns the keys that regressed."""
+    regressions = []
+    print(f"\nvs. {baseline['meta'].get('commit')} ({baseline['meta'].get('created')}), threshold {threshold:.2f}x")
+    for key, stats in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            print(f"{key:28s} {'new':>10s}")
+            continue
+        ratio = stats["min_s"] / base["min_s"]
+        flag = "REGRESSION" if ratio > threshold else ("faster" if ratio < 1 / threshold else "")
+        print(f"{key:28s} {ratio:9.2f}x  {flag}")
+        if ratio > threshold:
+            regressions.append(key)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", dest="select", action="append", help="Only run cases whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="Smaller parameter sets")
+    parser.add_argument("--target", type=float, default=0.2, help="Seconds per timing repeat")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Baseline results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    current = run(args.select, args.quick, args.target, args.repeat)
+    output = args.output or os.path.join(RESULTS_DIR, f"{current['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(current, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(current, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import { Activity, Hand, Radio, Clock, Info } from 'lucide-react';
+import { Activity, Hand, Radio, Clock, Info, Gauge } from 'lucide-react';
 import { useEffect, useState, useRef } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import { API_URL, WS_URL } from '../config/api';
@@ -41,8 +41,28 @@ export default function Dashboard() {
     const [isRecording, setIsRecording] = useState(false);
     const [history, setHistory] = useState<{ id: string, label: string, time: string }[]>([]);
     const [wsStatus, setWsStatus] = useState<'connecting' | 'connected' | 'error'>('connecting');
+    const [perf, setPerf] = useState<{ fps: number, p99: number | null } | null>(null);
     const lastPredictionRef = useRef("");
 
+    useEffect(() => {
+        // Pipeline performance summary (frames/s and p99 capture-to-publish latency)
+        const poll = async () => {
+            try {
+                const res = await fetch(`${API_URL}/metrics/summary`);
+                const data = await res.json();
+                setPerf({
+                    fps: data.rates?.frames ?? 0,
+                    p99: data.stages?.frame_total?.p99_ms ?? null
+                });
+            } catch (e) {
+                setPerf(null);
+            }
+        };
+        poll();
+        const interval = setInterval(poll, 2000);
+        return () => clearInterval(interval);
+    }, []);
+
     useEffect(() => {
         let ws: WebSocket;
         let reconnectTimeout: any;
@@ -126,7 +146,7 @@ export default function Dashboard() {
                         </p>
                     </motion.div>
 
-                    <div className="grid grid-cols-1 md:grid-cols-2 gap-6">
+                    <div className="grid grid-cols-1 md:grid-cols-3 gap-6">
                         <StatCard
                             title="Gesture Engine"
                             value={prediction}
@@ -143,6 +163,14 @@ export default function Dashboard() {
                             delay={0.2}
                             tooltip="Status of the engine. 'Monitoring' means it's ready, 'Capturing' means it's recording data."
                         />
+                        <StatCard
+                            title="Pipeline"
+                            value={perf ? `${perf.fps.toFixed(0)} FPS` : "--"}
+                            icon={Gauge}
+                            color="purple"
+                            delay={0.3}
+                            tooltip={perf && perf.p99 !== null ? `p99 frame latency: ${perf.p99.toFixed(1)} ms` : "Frame rate of the recognition pipeline."}
+                        />
                     </div>
 
                     <motion.div